@@ -0,0 +1,455 @@
+# benchmark.py
+"""
+성능 기준선(baseline) 측정 스크립트
+
+각 항목마다 다음을 기록합니다.
+- wall_time [s]: repeat회 실행 중 최소 시간 (wall_time_median: 중앙값)
+- rhs_calls: 1회 실행 동안의 RHS(동역학 함수) 호출 수 (해당 없는 항목은 null)
+- peak_memory_bytes: tracemalloc으로 측정한 최대 메모리 할당량 (별도 1회 실행)
+- error: 엄격한 허용 오차(rtol = atol = 1e-12 등)로 계산한 기준 해 대비 최대 오차
+         (상태별 크기로 정규화, _max_error 참고)
+
+사용 예)
+    python benchmark.py                                  # results/benchmark.json 저장
+    python benchmark.py --only rhs --repeat 5
+    python benchmark.py --output new.json --compare results/benchmark.json
+      (기준선 대비 시간/메모리/RHS 호출/오차가 허용 범위를 넘으면 REGRESSION 표시, 종료 코드 1)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import scipy
+from scipy.integrate import odeint
+
+import main as vsg_main
+import models.avm_system as avm_system
+import models.batch_simulator as batch_simulator
+import models.hybrid_system as hybrid_system
+import models.optimizer as optimizer
+import models.vsg_model as vsg_model
+import step12_detailed_vsg as step12
+from config import Config
+from models.eigen_analysis import compute_root_locus, get_linearized_matrix
+from models.initializer import clear_cache, initial_state
+from models.metrics import frequency_metrics
+from models.pareto_analysis import compute_pareto_front
+from models.scenario import run_segmented
+from models.solver_stats import CountingRHS
+
+DEFAULT_OUTPUT = os.path.join("results", "benchmark.json")
+
+# 기준 해 계산용 허용 오차 (stiff한 상세 모델은 1e-10)
+TIGHT_TOL = 1e-12
+TIGHT_TOL_DETAILED = 1e-10
+
+# 비교 모드 기본 허용 범위
+TIME_TOLERANCE = 0.25  # 25% 이상 느려지면 회귀
+TIME_FLOOR = 0.005  # 5 ms 미만의 시간 차이는 측정 잡음으로 간주
+MEMORY_TOLERANCE = 0.25
+CALLS_TOLERANCE = 0.10
+ERROR_FACTOR = 10.0  # 오차가 10배 이상 커지면 회귀
+ERROR_FLOOR = 1e-9  # 이보다 작은 오차 변화는 무시
+
+
+# ==========================================
+# 1. 측정 도구
+# ==========================================
+@contextlib.contextmanager
+def _count_calls(targets):
+    """targets: [(모듈, 함수 이름), ...] - 실행 동안 모듈 속성을 호출 카운터로 교체"""
+    counters = []
+    originals = []
+    for module, name in targets:
+        original = getattr(module, name)
+        counter = CountingRHS(original, timed=False)
+        originals.append((module, name, original))
+        counters.append(counter)
+        setattr(module, name, counter)
+    try:
+        yield counters
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+def _run_quietly(func):
+    # 각 실행 함수의 진행 로그와 그래프는 측정에 포함하되 화면에는 남기지 않음
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return func()
+        finally:
+            plt.close("all")
+
+
+def _max_error(result, reference):
+    """
+    기준 해 대비 최대 오차 (상태별 최대 크기로 나눈 상대값, 크기가 1 미만이면 절대 오차)
+    궤적 (T, n) / (N, T, n)은 마지막 축(상태)별로 정규화
+    """
+    result = np.asarray(result)
+    reference = np.asarray(reference)
+    axis = tuple(range(reference.ndim - 1)) if reference.ndim > 1 else None
+    scale = np.maximum(np.nanmax(np.abs(reference), axis=axis), 1.0)
+    return float(np.nanmax(np.nanmax(np.abs(result - reference), axis=axis) / scale))
+
+
+def measure(case, repeat=3):
+    """
+    case: {"run": 실행 함수, "reference": 기준 해 함수 (선택),
+           "error": f(결과, 기준 해) -> 오차 (선택, 기본은 최대 절대 오차),
+           "count": RHS 호출 수를 셀 [(모듈, 함수 이름), ...] (선택)}
+    반환: 결과 딕셔너리 (JSON 저장용)
+    """
+    times = []
+    result = None
+    rhs_calls = None
+    for _ in range(repeat):
+        # 평형점 캐시를 비워 매 반복이 같은 작업을 하도록 함
+        clear_cache()
+        with _count_calls(case.get("count", ())) as counters:
+            start = time.perf_counter()
+            result = _run_quietly(case["run"])
+            times.append(time.perf_counter() - start)
+        if counters:
+            rhs_calls = sum(counter.calls for counter in counters)
+
+    clear_cache()
+    tracemalloc.start()
+    try:
+        _run_quietly(case["run"])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    error = None
+    if "reference" in case or "error" in case:
+        reference = case["reference"]() if "reference" in case else None
+        error = case.get("error", _max_error)(result, reference)
+
+    return {
+        "wall_time": min(times),
+        "wall_time_median": float(np.median(times)),
+        "repeat": repeat,
+        "rhs_calls": rhs_calls,
+        "peak_memory_bytes": int(peak),
+        "error": error,
+    }
+
+
+# ==========================================
+# 2. 벤치마크 항목
+# ==========================================
+def _rhs_case(module, name, config, y0, t, tight_tol=TIGHT_TOL, n_calls=2000):
+    """RHS 단독 항목: 1회 호출 시간 + 기본 허용 오차 odeint 전체 실행 (Jacobian은 유한차분)"""
+    y0 = np.asarray(y0, dtype=float)
+
+    # 외란 시각을 솔버에 알려 불연속점을 건너뛰지 않도록 함
+    tcrit = [config.event_time]
+
+    def run():
+        return odeint(getattr(module, name), y0, t, args=(config,), tcrit=tcrit)
+
+    def reference():
+        return odeint(
+            getattr(module, name),
+            y0,
+            t,
+            args=(config,),
+            tcrit=tcrit,
+            rtol=tight_tol,
+            atol=tight_tol,
+        )
+
+    def call_time():
+        func = getattr(module, name)
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            func(y0, t[-1], config)
+        return (time.perf_counter() - start) / n_calls * 1e6
+
+    return {
+        "run": run,
+        "reference": reference,
+        "count": [(module, name)],
+        "extra": {"rhs_call_us": call_time},
+    }
+
+
+def _main_simulation_case():
+    cfg = Config(X_line=1.2, use_proposed_control=True)
+
+    def run():
+        # 결과 캐시를 우회해야 실제 적분 시간이 측정됨
+        enabled, vsg_main.CACHE.enabled = vsg_main.CACHE.enabled, False
+        try:
+            return vsg_main.run_simulation(cfg, "benchmark")[1]
+        finally:
+            vsg_main.CACHE.enabled = enabled
+
+    def reference():
+        y0 = [0.0, cfg.Omega_0, 1.0]
+        t = np.linspace(cfg.t_start, cfg.t_end, cfg.steps)
+        return run_segmented(
+            avm_system.voltage_dynamics,
+            y0,
+            t,
+            cfg,
+            rtol=TIGHT_TOL,
+            atol=TIGHT_TOL,
+        )
+
+    return {
+        "run": run,
+        "reference": reference,
+        "count": [(vsg_main, "voltage_dynamics")],
+    }
+
+
+def _step12_case():
+    cfg = step12.DetailedConfig()
+
+    def run():
+        return step12.main()
+
+    def error(result, _):
+        # step12.main이 반환한 (적응) 시간 격자에서 엄격한 허용 오차의 해와 비교
+        t, sol = result
+        y0 = initial_state("detailed", cfg)
+        reference = run_segmented(
+            step12.detailed_dynamics,
+            y0,
+            t,
+            cfg,
+            Dfun=step12.detailed_jacobian,
+            rtol=TIGHT_TOL_DETAILED,
+            atol=TIGHT_TOL_DETAILED,
+        )
+        return _max_error(sol, reference)
+
+    return {
+        "run": run,
+        "error": error,
+        "count": [(step12, "detailed_dynamics")],
+    }
+
+
+def _optimizer_case(early_exit):
+    cfg = Config(X_line=0.5, P_solar_initial=0.3, P_solar_drop=0.2)
+    log = []
+
+    def run():
+        log.clear()
+        optimal_h = optimizer.find_optimal_inertia(
+            cfg, early_exit=early_exit, run_log=log
+        )
+        return optimal_h, [run["nadir"] for run in log], [run["H"] for run in log]
+
+    def error(result, _):
+        # 탐색 중 판정에 사용된 nadir를 엄격한 허용 오차의 nadir와 비교
+        _, nadirs, h_values = result
+        t, sol = batch_simulator.simulate_hybrid_batch(
+            cfg, H=np.asarray(h_values), rtol=TIGHT_TOL, atol=TIGHT_TOL
+        )
+        nadir_ref = frequency_metrics(t, sol[:, :, 1], cfg)["nadir"]
+        return _max_error(nadirs, nadir_ref)
+
+    return {
+        "run": run,
+        "error": error,
+        "count": [(optimizer, "system_dynamics")],
+    }
+
+
+def _pareto_case():
+    cfg = Config(X_line=0.5, P_solar_initial=0.3, P_solar_drop=0.2)
+    h_values = np.linspace(0.5, 10.0, 40)
+    d_values = np.linspace(5.0, 30.0, 5)
+
+    def run():
+        front = compute_pareto_front(cfg, h_values, d_values, workers=1)
+        return front["nadir"]
+
+    def reference():
+        H, D = np.meshgrid(h_values, d_values, indexing="ij")
+        t, sol = batch_simulator.simulate_hybrid_batch(
+            cfg, H=H.ravel(), D=D.ravel(), rtol=TIGHT_TOL, atol=TIGHT_TOL
+        )
+        return frequency_metrics(t, sol[:, :, 1], cfg)["nadir"].reshape(H.shape)
+
+    return {
+        "run": run,
+        "reference": reference,
+        "count": [(batch_simulator, "system_dynamics_batch")],
+    }
+
+
+def _root_locus_case():
+    cfg = Config()
+    x_values = np.linspace(0.2, 1.2, 2000)
+
+    def run():
+        return np.sort_complex(compute_root_locus(cfg, x_values)["eigs"])
+
+    def reference():
+        # 점별 고유값 계산 (np.linalg.eigvals)
+        return np.array(
+            [
+                np.sort_complex(np.linalg.eigvals(get_linearized_matrix(cfg, x)))
+                for x in x_values
+            ]
+        )
+
+    return {"run": run, "reference": reference}
+
+
+def build_cases():
+    """항목 이름 -> case 딕셔너리"""
+    # 모든 모델에 외란이 걸리도록 설정
+    # (X_line = 1.2 (기본값)에서는 AVM 모델의 외란 이전 평형점이 없으므로 0.5 사용)
+    cfg = Config(
+        X_line=0.5,
+        P_load_step=0.1,
+        P_solar_initial=0.3,
+        P_solar_drop=0.2,
+        V_grid_fault=0.9,
+        use_proposed_control=True,
+    )
+    dcfg = step12.DetailedConfig()
+    t10 = np.linspace(0.0, 10.0, 1000)
+    t_detailed = np.linspace(dcfg.event_time - 0.05, 1.5, 2000)
+    return {
+        "rhs_swing": _rhs_case(
+            vsg_model, "swing_equation", cfg, initial_state("swing", cfg), t10
+        ),
+        "rhs_hybrid": _rhs_case(
+            hybrid_system, "system_dynamics", cfg, initial_state("hybrid", cfg), t10
+        ),
+        "rhs_avm": _rhs_case(
+            avm_system, "voltage_dynamics", cfg, initial_state("avm", cfg), t10
+        ),
+        "rhs_detailed": _rhs_case(
+            step12,
+            "detailed_dynamics",
+            dcfg,
+            initial_state("detailed", dcfg),
+            t_detailed,
+            tight_tol=TIGHT_TOL_DETAILED,
+        ),
+        "main_run_simulation": _main_simulation_case(),
+        "step12_main": _step12_case(),
+        "optimizer_full": _optimizer_case(early_exit=False),
+        "optimizer_early_exit": _optimizer_case(early_exit=True),
+        "pareto_sweep": _pareto_case(),
+        "root_locus_sweep": _root_locus_case(),
+    }
+
+
+# ==========================================
+# 3. 실행 / 저장 / 비교
+# ==========================================
+def run_benchmarks(only=None, repeat=3):
+    """only: 이름에 이 문자열들 중 하나가 포함된 항목만 실행"""
+    cases = build_cases()
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {},
+    }
+    for name, case in cases.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        entry = measure(case, repeat)
+        for key, func in case.get("extra", {}).items():
+            entry[key] = func()
+        report["results"][name] = entry
+        calls = "-" if entry["rhs_calls"] is None else entry["rhs_calls"]
+        error = "-" if entry["error"] is None else f"{entry['error']:.2e}"
+        print(
+            f"{name:>22}: {entry['wall_time'] * 1e3:9.1f} ms, calls={calls:>7}, "
+            f"peak={entry['peak_memory_bytes'] / 1024**2:7.2f} MB, error={error}"
+        )
+    return report
+
+
+def compare(report, baseline, time_tolerance=TIME_TOLERANCE):
+    """
+    기준선 대비 회귀 항목 목록을 반환
+    반환: [(항목 이름, 지표 이름, 기준값, 현재값), ...]
+    """
+    limits = {
+        "wall_time": lambda old: old * (1 + time_tolerance) + TIME_FLOOR,
+        "peak_memory_bytes": lambda old: old * (1 + MEMORY_TOLERANCE),
+        "rhs_calls": lambda old: old * (1 + CALLS_TOLERANCE),
+        "error": lambda old: max(old * ERROR_FACTOR, ERROR_FLOOR),
+    }
+    regressions = []
+    for name, current in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for metric, limit in limits.items():
+            if current.get(metric) is None or old.get(metric) is None:
+                continue
+            if current[metric] > limit(old[metric]):
+                regressions.append((name, metric, old[metric], current[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VSG simulation benchmark suite")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--only", nargs="*", help="이름에 포함된 문자열로 항목 선택")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=TIME_TOLERANCE,
+        help="실행 시간 회귀 판정 비율 (기본 0.25 = 25%%)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only, args.repeat)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.time_tolerance)
+        if not regressions:
+            print(f"No regressions against {args.compare}")
+            return 0
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name}.{metric}: {old:.4g} -> {new:.4g}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,57 @@
 # config.py (기존 내용 유지하되, 아래 내용 추가/수정)
 import numpy as np
 
+# 설정 항목 (숫자 항목의 순서가 곧 as_array()의 기본 배열 순서)
+FIELDS = (
+    "t_start",
+    "t_end",
+    "steps",
+    "F_base",
+    "V_grid",
+    "X_line",
+    "V_vsg",
+    "H",
+    "D",
+    "P_ref",
+    "P_load_step",
+    "P_load_total",
+    "P_solar_initial",
+    "P_solar_drop",
+    "V_grid_normal",
+    "V_grid_fault",
+    "event_time",
+    "V_ref_base",
+    "K_q",
+    "T_v",
+    "use_proposed_control",
+    "K_nvr",
+)
+
+# 숫자가 아닌 항목 (as_array 기본 배열에서 제외)
+OBJECT_FIELDS = ("solar_profile",)
+FIELDS = FIELDS + OBJECT_FIELDS
+NUMERIC_FIELDS = tuple(name for name in FIELDS if name not in OBJECT_FIELDS)
+
 
 class Config:
-    def __init__(self):
+    """
+    시뮬레이션 설정 (생성 후 변경 불가)
+    - 값을 바꾸려면 replace(**overrides)로 새 객체를 만듭니다.
+      예) cfg = Config(X_line=0.5); weak = cfg.replace(X_line=1.2)
+    - 같은 값이면 같은 해시를 가지므로 딕셔너리/캐시 키로 사용할 수 있고,
+      여러 스레드/프로세스에서 복사 없이 공유해도 안전합니다.
+    - Omega_0는 F_base로부터 계산되는 값입니다.
+    """
+
+    __slots__ = FIELDS + ("_frozen", "_hash")
+
+    def __init__(self, **overrides):
         # ... (기존 설정들: t_start, Grid, VSG 등등) ...
         self.t_start = 0.0
         self.t_end = 10.0
         self.steps = 1000
 
-        self.F_base = 60.0
-        self.Omega_0 = 2 * np.pi * self.F_base
+        self.F_base = 60.0  # Omega_0 = 2 * pi * F_base (속성으로 계산)
 
         # [테스트 조건] 매우 약한 전력망 (X=1.2)
         # 일반 제어로는 불안정한 조건입니다.
@@ -21,11 +62,14 @@ class Config:
         self.H = 3.0  # 관성도 낮춤 (불안정 유발)
         self.D = 5.0
         self.P_ref = 0.8  # 높은 부하
+        self.P_load_step = 0.0  # swing_equation의 이벤트 부하 증가량
 
         # ... (태양광 설정 등은 생략 가능) ...
         self.P_load_total = 0.8
         self.P_solar_initial = 0.0  # Solar 없이 테스트
         self.P_solar_drop = 0.0
+        # 측정 태양광 출력 시계열 (gfl_model.SolarProfile). 지정하면 Step Drop 대신 사용
+        self.solar_profile = None
 
         self.V_grid_normal = 1.0
         self.V_grid_fault = 1.0  # 전압 사고 없음 (자체 진동 관찰)
@@ -38,3 +82,78 @@ class Config:
         # --- [Step 11 신규 추가] 제안 기법 파라미터 ---
         self.use_proposed_control = False  # True면 논문 기법 적용
         self.K_nvr = 0.05  # 음의 가상 저항 게인 (Damping Gain)
+
+        self._apply(overrides)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_frozen", True)
+
+    def _apply(self, overrides):
+        for name, value in overrides.items():
+            if name not in FIELDS:
+                raise TypeError(f"Unknown Config field: '{name}'")
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(
+                f"Config is immutable; use config.replace({name}=...) instead."
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError("Config is immutable.")
+
+    @property
+    def Omega_0(self):
+        return 2 * np.pi * self.F_base
+
+    def replace(self, **overrides):
+        """일부 값만 바꾼 새 Config를 반환 (원본은 그대로)"""
+        new = object.__new__(type(self))
+        for name in FIELDS:
+            object.__setattr__(new, name, getattr(self, name))
+        new._apply(overrides)
+        object.__setattr__(new, "_hash", None)
+        object.__setattr__(new, "_frozen", True)
+        return new
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def as_array(self, names=NUMERIC_FIELDS):
+        """
+        지정한 항목(기본값: 숫자 항목 전체)을 순서대로 담은 1차원 float 배열
+        (컴파일 커널 등 속성 조회 없이 인덱스로 접근하는 코드용, "Omega_0"도 사용 가능)
+        """
+        return np.array([float(getattr(self, name)) for name in names])
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in FIELDS)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        # 숫자/불리언 값으로 계산하므로 프로세스가 달라도 같은 값이면 같은 해시
+        # (solar_profile은 객체 식별자 기준)
+        if self._hash is None:
+            profile = self.solar_profile
+            numeric = tuple(getattr(self, name) for name in NUMERIC_FIELDS)
+            extra = 0 if profile is None else hash(profile)
+            object.__setattr__(self, "_hash", hash((numeric, extra)))
+        return self._hash
+
+    def __repr__(self):
+        items = ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS)
+        return f"Config({items})"
+
+    # pickle / copy 지원 (프로세스 풀로 전달 시 사용)
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._apply(state)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_frozen", True)
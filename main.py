@@ -1,10 +1,18 @@
 # main.py
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
 import os
 from config import Config
 from models.avm_system import voltage_dynamics
+from models.metrics import compute_metrics, power_outputs
+from models.solver_stats import SolverLog, format_record, run_instrumented
+from utils.result_cache import ResultCache
+
+# 입력(모델 함수, Config 값, 시간 격자, 초기값)이 같으면 디스크에 저장된 결과를 재사용
+CACHE = ResultCache()
+
+# 실행별 솔버 통계 (nfev, njev, 스텝 크기, 실행 시간 등)
+SOLVER_LOG = SolverLog()
 
 
 def ensure_dir(directory):
@@ -12,13 +20,25 @@ def ensure_dir(directory):
         os.makedirs(directory)
 
 
-def run_simulation(cfg, label):
+def run_simulation(cfg, label, schedule=None):
     # 초기 상태
     y0 = [0.0, cfg.Omega_0, 1.0]  # delta, omega, V_vsg
     t = np.linspace(cfg.t_start, cfg.t_end, cfg.steps)
 
-    # 솔버 실행
-    sol = odeint(voltage_dynamics, y0, t, args=(cfg,))
+    # 솔버 실행 (이벤트 시각 및 schedule의 추가 외란을 경계로 구간 적분)
+    # 솔버 통계는 SOLVER_LOG에 기록
+    sol, record = run_instrumented(
+        voltage_dynamics,
+        y0,
+        t,
+        cfg,
+        schedule,
+        label=label,
+        count_calls=True,
+        cache=CACHE,
+        log=SOLVER_LOG,
+    )
+    print(f"  > Solver        : {format_record(record)}")
     return t, sol
 
 
@@ -27,16 +47,12 @@ def analyze_and_log(t, sol, cfg, label):
     시뮬레이션 결과를 분석하여 로그를 남기고,
     제어기 내부 신호(NVR 등)를 역산하여 반환함
     """
-    delta = sol[:, 0]
     omega = sol[:, 1]
-    V_vsg = sol[:, 2]
 
-    # 1. 물리량 역산 (P, Q)
-    # 시뮬레이션 중 V_grid는 이벤트 시간에 따라 변함
-    V_grid_arr = np.where(t >= cfg.event_time, cfg.V_grid_fault, cfg.V_grid_normal)
-
-    P = (V_vsg * V_grid_arr / cfg.X_line) * np.sin(delta)
-    Q = (V_vsg**2 / cfg.X_line) - (V_vsg * V_grid_arr / cfg.X_line) * np.cos(delta)
+    # 1. 물리량 역산 (P, Q) 및 지표
+    # 시뮬레이션 중 V_grid는 이벤트 시간에 따라 변함 (metrics.power_outputs에서 반영)
+    P, Q, V_vsg = power_outputs("avm", t, sol, cfg)
+    metrics = compute_metrics(t, sol, cfg, model="avm")
 
     # 2. 제어 신호 역산 (NVR Signal 확인용)
     # NVR 신호 = K_nvr * (omega - Omega_0)
@@ -49,9 +65,14 @@ def analyze_and_log(t, sol, cfg, label):
 
     # 3. 로그 출력 (터미널)
     print(f"\n[DEBUG LOG] --- {label} ---")
-    print(f"  > Voltage Range : Min {np.min(V_vsg):.4f} ~ Max {np.max(V_vsg):.4f} p.u.")
-    print(f"  > Active Power  : Min {np.min(P):.4f} ~ Max {np.max(P):.4f} p.u.")
-    print(f"  > Freq Deviat.  : Max Abs {np.max(np.abs(freq_deviation)):.4f} rad/s")
+    max_freq_dev = 2 * np.pi * max(metrics["overshoot"], cfg.F_base - metrics["nadir"])
+    print(
+        f"  > Voltage Range : Min {metrics['V_min']:.4f} ~ Max {metrics['V_max']:.4f} p.u."
+    )
+    print(
+        f"  > Active Power  : Min {metrics['P_min']:.4f} ~ Max {metrics['P_max']:.4f} p.u."
+    )
+    print(f"  > Freq Deviat.  : Max Abs {max_freq_dev:.4f} rad/s")
 
     if cfg.use_proposed_control:
         print(
@@ -71,22 +92,20 @@ def main():
     # 결과 저장 폴더 생성
     ensure_dir("results")
 
-    cfg = Config()
-
     # [디버깅 포인트 1] X_line이 너무 크면 기본 제어도 발산할 수 있음
-    cfg.X_line = 1.2
+    cfg = Config(X_line=1.2)
 
     # --- Case 1: 기존 제어 ---
     print("\nRunning Case 1: Conventional...")
-    cfg.use_proposed_control = False
-    t1, sol1 = run_simulation(cfg, "Conventional")
-    P1, Q1, V1, NVR1 = analyze_and_log(t1, sol1, cfg, "Conventional")
+    cfg1 = cfg.replace(use_proposed_control=False)
+    t1, sol1 = run_simulation(cfg1, "Conventional")
+    P1, Q1, V1, NVR1 = analyze_and_log(t1, sol1, cfg1, "Conventional")
 
     # --- Case 2: 제안 제어 ---
     print("\nRunning Case 2: Proposed NVR...")
-    cfg.use_proposed_control = True
-    t2, sol2 = run_simulation(cfg, "Proposed")
-    P2, Q2, V2, NVR2 = analyze_and_log(t2, sol2, cfg, "Proposed")
+    cfg2 = cfg.replace(use_proposed_control=True)
+    t2, sol2 = run_simulation(cfg2, "Proposed")
+    P2, Q2, V2, NVR2 = analyze_and_log(t2, sol2, cfg2, "Proposed")
 
     # --- 그래프 그리기 ---
     plt.figure(figsize=(12, 12))
@@ -126,6 +145,8 @@ def main():
     save_path = "results/debug_result.png"
     plt.savefig(save_path, dpi=300)
     print(f"\n[INFO] Graph saved to: {save_path}")
+    print(f"[INFO] Result cache: {CACHE.stats()}")
+    SOLVER_LOG.print_summary()
 
     plt.show()
 
@@ -56,3 +56,55 @@ def voltage_dynamics(y, t, config):
     d_v_dt = (V_target - V_vsg) / config.T_v
 
     return [d_delta_dt, d_omega_dt, d_v_dt]
+
+
+def voltage_dynamics_batch(y, t, params):
+    """
+    voltage_dynamics의 배치(벡터화) 버전
+    y: 시나리오 N개의 상태를 교차 배치한 1차원 배열 [delta_0, omega_0, V_0, delta_1, ...]
+    params: 길이 N 배열로 구성된 파라미터 딕셔너리 (batch_simulator.make_batch_params 참고)
+    """
+    delta = y[0::3]
+    omega = y[1::3]
+    V_vsg = y[2::3]
+
+    V_grid = np.where(
+        t >= params["event_time"], params["V_grid_fault"], params["V_grid_normal"]
+    )
+
+    X_line = params["X_line"]
+    P_out = (V_vsg * V_grid / X_line) * np.sin(delta)
+    Q_out = (V_vsg**2 / X_line) - (V_vsg * V_grid / X_line) * np.cos(delta)
+
+    dydt = np.empty_like(y)
+    dydt[0::3], dydt[1::3], dydt[2::3] = swing_avr_rates(
+        omega, V_vsg, P_out, Q_out, params
+    )
+    return dydt
+
+
+def swing_avr_rates(omega, V_vsg, P_out, Q_out, params):
+    """
+    VSG 한 대(또는 배열) 단위의 Swing Equation + AVR(Q-V Droop, NVR) 미분값
+    P_out, Q_out: 단자에서 내보내는 유효/무효 전력 (무한모선 모델 또는 network_model의 조류 계산)
+    params: H, D, P_ref, Omega_0, V_ref_base, K_q, T_v, K_nvr, use_proposed_control
+            (스칼라 또는 배열)
+    반환: (d_delta_dt, d_omega_dt, d_v_dt)
+    """
+    Omega_0 = params["Omega_0"]
+    d_delta_dt = omega - Omega_0
+    d_omega_dt = (
+        (1 / (2 * params["H"]))
+        * (params["P_ref"] - P_out - params["D"] * (omega - Omega_0) / Omega_0)
+        * Omega_0
+    )
+
+    # Q-V Droop + (유닛별) NVR 제어 신호
+    V_target = params["V_ref_base"] - params["K_q"] * Q_out
+    stabilizing_signal = np.clip(params["K_nvr"] * (omega - Omega_0), -0.1, 0.1)
+    V_target = V_target + np.where(
+        params["use_proposed_control"] != 0.0, stabilizing_signal, 0.0
+    )
+
+    d_v_dt = (V_target - V_vsg) / params["T_v"]
+    return d_delta_dt, d_omega_dt, d_v_dt
@@ -0,0 +1,216 @@
+# models/batch_simulator.py
+import numpy as np
+from scipy.integrate import odeint
+from models.hybrid_system import system_dynamics_batch
+from models.avm_system import voltage_dynamics_batch
+from models.initializer import equilibrium_angle
+
+# 배치 동역학에서 시나리오별로 달라질 수 있는 파라미터 목록
+HYBRID_BATCH_FIELDS = (
+    "H",
+    "D",
+    "X_line",
+    "P_solar_drop",
+    "event_time",
+    "P_load_total",
+    "P_solar_initial",
+    "V_vsg",
+    "V_grid",
+    "Omega_0",
+)
+
+AVM_BATCH_FIELDS = (
+    "H",
+    "D",
+    "X_line",
+    "P_ref",
+    "event_time",
+    "V_grid_normal",
+    "V_grid_fault",
+    "V_ref_base",
+    "K_q",
+    "T_v",
+    "K_nvr",
+    "use_proposed_control",
+    "Omega_0",
+)
+
+
+def make_batch_params(config, fields=HYBRID_BATCH_FIELDS, **overrides):
+    """
+    config를 기준값으로 하여 시나리오 N개의 파라미터 배열을 만듭니다.
+    overrides로 넘긴 값(스칼라 또는 배열)은 모두 같은 길이 N으로 브로드캐스트됩니다.
+    fields: 모델별 파라미터 목록 (HYBRID_BATCH_FIELDS / AVM_BATCH_FIELDS)
+    예) make_batch_params(cfg, H=np.linspace(1, 10, 20))
+    """
+    unknown = set(overrides) - set(fields)
+    if unknown:
+        raise ValueError(f"Unsupported batch parameter(s): {sorted(unknown)}")
+
+    values = {
+        name: np.asarray(overrides.get(name, getattr(config, name)), dtype=float)
+        for name in fields
+    }
+    shape = np.broadcast_shapes(*(v.shape for v in values.values()))
+    if len(shape) > 1:
+        raise ValueError("Batch parameters must be scalars or 1-D arrays.")
+    n = shape[0] if shape else 1
+
+    return {
+        name: np.ascontiguousarray(np.broadcast_to(v, (n,)))
+        for name, v in values.items()
+    }
+
+
+def get_initial_delta_batch(params):
+    """
+    시나리오별 초기 평형 위상각 delta_0 = arcsin(P_vsg / P_max)
+    P_vsg가 P_max를 넘는 시나리오(평형점 없음)는 NaN을 반환합니다.
+    """
+    P_vsg_initial = params["P_load_total"] - params["P_solar_initial"]
+    return equilibrium_angle(
+        P_vsg_initial, params["X_line"], params["V_vsg"], params["V_grid"]
+    )
+
+
+def get_initial_state_avm_batch(params, tol=1e-12, max_iter=50):
+    """
+    시나리오별 AVM 외란 이전 평형점 [delta, omega, V] (N, 3) - 벡터화 Newton 반복
+    omega = Omega_0 (NVR 신호 0)에서 나머지 두 식을 동시에 풉니다.
+      P(delta, V) = P_ref,   V = V_ref_base - K_q * Q(delta, V)   (V_grid = V_grid_normal)
+    수렴하지 않은 시나리오(평형점 없음)는 NaN을 반환합니다.
+    """
+    X = params["X_line"]
+    V_grid = params["V_grid_normal"]
+    P_ref, V_ref, K_q = params["P_ref"], params["V_ref_base"], params["K_q"]
+
+    # 무효전력 droop을 무시한 근사 (V = V_ref_base)에서 출발 (initializer와 동일)
+    delta = np.nan_to_num(equilibrium_angle(P_ref, X, V_ref, V_grid))
+    V = np.array(V_ref, dtype=float)
+    for _ in range(max_iter):
+        k = V_grid / X
+        s, c = np.sin(delta), np.cos(delta)
+        f1 = V * k * s - P_ref
+        f2 = V - V_ref + K_q * (V**2 / X - V * k * c)
+        j11, j12 = V * k * c, k * s
+        j21, j22 = K_q * V * k * s, 1.0 + K_q * (2 * V / X - k * c)
+        det = j11 * j22 - j12 * j21
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = delta - (j22 * f1 - j12 * f2) / det
+            V = V - (j11 * f2 - j21 * f1) / det
+        if np.all(~np.isfinite(f1) | (np.maximum(abs(f1), abs(f2)) < tol)):
+            break
+
+    # 안정 평형점 (|delta| < pi/2, V > 0)이면서 잔차가 충분히 작은 점만 사용
+    k = V_grid / X
+    residual = np.maximum(
+        abs(V * k * np.sin(delta) - P_ref),
+        abs(V - V_ref + K_q * (V**2 / X - V * k * np.cos(delta))),
+    )
+    valid = (residual < 1e-9) & (abs(delta) < np.pi / 2) & (V > 0)
+    y0 = np.column_stack((delta, params["Omega_0"] * np.ones_like(delta), V))
+    y0[~valid] = np.nan
+    return y0
+
+
+def _slice_params(params, index):
+    return {name: v[index] for name, v in params.items()}
+
+
+def _integrate_interleaved(rhs, y0, t, params, rtol, atol):
+    """
+    y0: (N, n_states) 초기 상태. 상태를 시나리오별로 교차 배치하여 한 번에 적분
+    반환: (N, len(t), n_states)
+    """
+    n, n_states = y0.shape
+
+    # 시나리오별 이벤트 시각을 솔버에 알려 불연속점을 건너뛰지 않도록 함
+    event_times = np.unique(params["event_time"])
+    tcrit = event_times[(event_times > t[0]) & (event_times <= t[-1])]
+
+    # 상태를 시나리오 단위로 교차 배치했으므로 Jacobian은 띠 폭 (n_states - 1)의 밴드 행렬
+    # (stiff 모드로 전환되더라도 O(N) 비용 유지)
+    sol = odeint(
+        rhs,
+        y0.ravel(),
+        t,
+        args=(params,),
+        tcrit=tcrit if tcrit.size else None,
+        ml=n_states - 1,
+        mu=n_states - 1,
+        rtol=rtol,
+        atol=atol,
+    )
+    return sol.reshape(len(t), n, n_states).transpose(1, 0, 2)
+
+
+def simulate_hybrid_batch(
+    config, t=None, chunk_size=512, rtol=None, atol=None, **overrides
+):
+    """
+    hybrid_system.system_dynamics 시나리오 N개를 한 번에 적분합니다.
+    overrides: H, D, X_line, P_solar_drop, event_time 등 시나리오별 값 (make_batch_params 참고)
+    반환: (t, sol) - sol의 shape은 (N, len(t), 2) [delta, omega]
+    평형점이 없는 시나리오는 NaN으로 채워집니다.
+    배치 RHS는 계단형 태양광 출력만 지원하므로 config.solar_profile이 있으면 ValueError
+    """
+    if getattr(config, "solar_profile", None) is not None:
+        raise ValueError(
+            "simulate_hybrid_batch does not support config.solar_profile "
+            "(only the step-drop solar scenario); use hybrid_system.system_dynamics."
+        )
+    if t is None:
+        t = np.linspace(config.t_start, config.t_end, config.steps)
+    t = np.asarray(t, dtype=float)
+
+    params = make_batch_params(config, **overrides)
+    n = params["H"].size
+
+    sol = np.full((n, len(t), 2), np.nan)
+    valid = np.flatnonzero(~np.isnan(get_initial_delta_batch(params)))
+
+    # 한 번에 너무 많은 시나리오를 묶으면 가장 까다로운 시나리오가 전체 스텝 크기를 결정하므로
+    # chunk_size 단위로 나누어 적분
+    for start in range(0, valid.size, chunk_size):
+        index = valid[start : start + chunk_size]
+        chunk = _slice_params(params, index)
+        y0 = np.column_stack((get_initial_delta_batch(chunk), chunk["Omega_0"]))
+        sol[index] = _integrate_interleaved(
+            system_dynamics_batch, y0, t, chunk, rtol, atol
+        )
+
+    return t, sol
+
+
+def simulate_avm_batch(
+    config, t=None, y0=None, chunk_size=512, rtol=None, atol=None, **overrides
+):
+    """
+    avm_system.voltage_dynamics 시나리오 N개를 한 번에 적분합니다.
+    overrides: H, D, X_line, P_ref, K_q, T_v, K_nvr 등 시나리오별 값 (AVM_BATCH_FIELDS)
+    y0: 공통 초기 상태 [delta, omega, V]
+        (기본값: 시나리오별 외란 이전 평형점, get_initial_state_avm_batch)
+    반환: (t, sol) - sol의 shape은 (N, len(t), 3) [delta, omega, V_vsg]
+    평형점이 없는 시나리오는 NaN으로 채워집니다.
+    """
+    if t is None:
+        t = np.linspace(config.t_start, config.t_end, config.steps)
+    t = np.asarray(t, dtype=float)
+
+    params = make_batch_params(config, AVM_BATCH_FIELDS, **overrides)
+    n = params["H"].size
+    if y0 is None:
+        initial = get_initial_state_avm_batch(params)
+    else:
+        initial = np.tile(np.asarray(y0, dtype=float), (n, 1))
+
+    sol = np.full((n, len(t), 3), np.nan)
+    valid = np.flatnonzero(np.isfinite(initial).all(axis=1))
+    for start in range(0, valid.size, chunk_size):
+        index = valid[start : start + chunk_size]
+        chunk = _slice_params(params, index)
+        sol[index] = _integrate_interleaved(
+            voltage_dynamics_batch, initial[index], t, chunk, rtol, atol
+        )
+
+    return t, sol
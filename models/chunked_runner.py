@@ -0,0 +1,210 @@
+# models/chunked_runner.py
+"""
+장시간(예: 1시간, 1 ms 간격) 시뮬레이션용 구간 분할 실행기
+
+전체 궤적을 메모리에 만들지 않고, window_steps개 샘플 단위로 적분한 결과를
+디스크의 .npy 메모리 맵 파일에 바로 기록합니다. 유도량(P, Q 등)도 구간마다 계산하여
+함께 저장하므로 최대 메모리 사용량은 구간 크기에만 비례합니다.
+
+사용 예)
+    result = run_chunked(
+        detailed_dynamics, y0, cfg, "results/long_run",
+        dt=1e-3, t_start=0.0, t_end=3600.0, derived=POWER_OUTPUTS["detailed"],
+    )
+    P = result["P"]          # np.memmap (필요한 부분만 디스크에서 읽음)
+    P[1000:2000].max()
+"""
+
+import os
+import numpy as np
+from models.scenario import run_segmented, with_overrides
+from models.metrics import power_outputs
+
+
+# ==========================================
+# 1. 모델별 유도량 (t, sol, config) -> 1차원 배열
+# ==========================================
+def _power_columns(model):
+    # P, Q가 같은 함수를 공유하므로 run_chunked는 구간마다 power_outputs를 한 번만 계산
+    def outputs(t, sol, config):
+        return power_outputs(model, t, sol, config)
+
+    return {"P": (outputs, 0), "Q": (outputs, 1)}
+
+
+POWER_OUTPUTS = {
+    model: _power_columns(model) for model in ("hybrid", "avm", "detailed")
+}
+
+
+# ==========================================
+# 2. 결과 (지연 로딩)
+# ==========================================
+class ChunkedResult:
+    """
+    run_chunked 결과 폴더 접근용 객체
+    result["t"], result["states"], result["P"] ... 는 읽기 전용 np.memmap으로 열립니다.
+    """
+
+    def __init__(self, directory, names):
+        self.directory = directory
+        self.names = tuple(names)
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        return np.load(self.path(name), mmap_mode="r")
+
+    def __len__(self):
+        return len(self["t"])
+
+
+# ==========================================
+# 3. 구간 분할 실행기
+# ==========================================
+def run_chunked(
+    rhs,
+    y0,
+    config,
+    out_dir,
+    dt,
+    t_start=None,
+    t_end=None,
+    window_steps=100_000,
+    derived=None,
+    schedule=None,
+    **odeint_kwargs,
+):
+    """
+    [t_start, t_end]를 dt 간격으로 적분하여 out_dir에 저장합니다.
+    - t.npy: (N,) 시간, states.npy: (N, n_states) 상태, <이름>.npy: 유도량 (N,)
+    - 한 번에 window_steps개 샘플씩 적분하고, 구간 끝 상태에서 다음 구간을 이어서 적분
+    - 각 구간은 scenario.run_segmented로 적분하므로 모델 이벤트와 schedule의 외란이 반영됨
+    derived: {이름: f(t, sol, config) 또는 (f, 인덱스)} (예: POWER_OUTPUTS["avm"])
+             (f, 인덱스) 항목은 f(t, sol, config)[인덱스]이며, 같은 f는 구간마다 한 번만 호출
+             schedule이 있으면 config는 각 시각의 schedule 값이 반영된 복사본
+    t_start / t_end 생략 시 config.t_start / config.t_end 사용
+    반환: ChunkedResult
+    """
+    t_start = config.t_start if t_start is None else t_start
+    t_end = config.t_end if t_end is None else t_end
+    derived = derived or {}
+    n_samples = int(round((t_end - t_start) / dt)) + 1
+    y = np.asarray(y0, dtype=float)
+
+    os.makedirs(out_dir, exist_ok=True)
+    result = ChunkedResult(out_dir, ("t", "states") + tuple(derived))
+    open_memmap = np.lib.format.open_memmap
+    files = {"t": open_memmap(result.path("t"), "w+", np.float64, (n_samples,))}
+    files["states"] = open_memmap(
+        result.path("states"), "w+", np.float64, (n_samples, y.size)
+    )
+    for name in derived:
+        files[name] = open_memmap(result.path(name), "w+", np.float64, (n_samples,))
+
+    def derive(t, sol, seg_config, out):
+        outputs = {}
+        for name, entry in derived.items():
+            if callable(entry):
+                out[name] = entry(t, sol, seg_config)
+                continue
+            func, k = entry
+            if func not in outputs:
+                outputs[func] = func(t, sol, seg_config)
+            out[name] = outputs[func][k]
+
+    def write(index, t, sol):
+        files["t"][index] = t
+        files["states"][index] = sol
+        if not derived:
+            return
+        if schedule is None:
+            values = {}
+            derive(t, sol, config, values)
+        else:
+            # 유도량도 schedule 구간별 config (X_line, V_grid 등이 바뀐 값)로 계산
+            values = {name: np.empty(t.size) for name in derived}
+            points = schedule.breakpoints(t[0], t[-1])
+            segment = np.searchsorted(points, t, side="right") - 1
+            for k in np.unique(segment):
+                mask = segment == k
+                seg_config = with_overrides(
+                    config, **schedule.values_at(config, points[k])
+                )
+                part = {}
+                derive(t[mask], sol[mask], seg_config, part)
+                for name in derived:
+                    values[name][mask] = part[name]
+        for name in derived:
+            files[name][index] = values[name]
+
+    # 시간은 누적 덧셈 오차가 없도록 인덱스로부터 계산
+    write(slice(0, 1), np.array([t_start]), y[None, :])
+
+    start = 0
+    while start < n_samples - 1:
+        stop = min(start + window_steps, n_samples - 1)
+        t = t_start + dt * np.arange(start, stop + 1)
+        sol = run_segmented(rhs, y, t, config, schedule, **odeint_kwargs)
+
+        # 첫 샘플은 이전 구간의 마지막 샘플과 같으므로 제외하고 기록
+        write(slice(start + 1, stop + 1), t[1:], sol[1:])
+        y = sol[-1]
+        start = stop
+
+    for array in files.values():
+        array.flush()
+    del files
+    return result
+
+
+# ==========================================
+# 4. 검증
+# ==========================================
+def check_schedule_outputs(window_steps=700):
+    """
+    schedule(X_line Ramp)이 있을 때 run_chunked가 기록한 P/Q가
+    전체 구간을 한 번에 나눈 schedule 구간별 config로 계산한 metrics.power_outputs와
+    일치하는지 확인 (다르면 AssertionError)
+    """
+    import tempfile
+    from config import Config
+    from models.avm_system import voltage_dynamics
+    from models.initializer import initial_state
+    from models.scenario import DisturbanceSchedule
+
+    cfg = Config(X_line=0.5, V_grid_fault=0.9, use_proposed_control=True)
+    schedule = DisturbanceSchedule().add_ramp(3.0, 4.0, "X_line", 0.7)
+    with tempfile.TemporaryDirectory() as out_dir:
+        result = run_chunked(
+            voltage_dynamics,
+            initial_state("avm", cfg),
+            cfg,
+            out_dir,
+            dt=1e-3,
+            t_end=6.0,
+            window_steps=window_steps,
+            derived=POWER_OUTPUTS["avm"],
+            schedule=schedule,
+        )
+        t, sol = np.array(result["t"]), np.array(result["states"])
+        # 기준: 구간(window) 분할과 무관하게 전체 시간 구간의 schedule 경계로 나눈 config
+        P = np.full(t.size, np.nan)
+        Q = np.full(t.size, np.nan)
+        points = schedule.breakpoints(t[0], t[-1])
+        for seg_start, seg_end in zip(points[:-1], points[1:]):
+            last = seg_end == points[-1]
+            mask = (t >= seg_start) & ((t <= seg_end) if last else (t < seg_end))
+            seg_config = with_overrides(cfg, **schedule.values_at(cfg, seg_start))
+            P[mask], Q[mask], _ = power_outputs("avm", t[mask], sol[mask], seg_config)
+        np.testing.assert_allclose(result["P"], P, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(result["Q"], Q, rtol=1e-12, atol=1e-12)
+        del result
+    print("run_chunked P/Q match the scheduled config under an X_line ramp.")
+
+
+if __name__ == "__main__":
+    check_schedule_outputs()
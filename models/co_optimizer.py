@@ -0,0 +1,405 @@
+# models/co_optimizer.py
+"""
+H, D, K_nvr 동시 최적화 (대리 모델 기반 배치 탐색)
+
+optimizer.find_optimal_inertia는 H 한 개만 이진 탐색하며 매 반복마다 전체 시뮬레이션을 합니다.
+여기서는 여러 파라미터(기본: H, D, K_nvr)를 함께 정하며,
+- 비용: 파라미터의 선형 가중합 (예: 배터리 관성/감쇠 용량) - 시뮬레이션 없이 계산
+- 제약: 주파수 Nadir, RoCoF, 전압 최저값 등 compute_metrics 지표의 상/하한
+제약 지표만 시뮬레이션이 필요하므로 다음 순서로 탐색합니다.
+1. 초기 배치: 탐색 범위 전체의 라틴 하이퍼큐브 표본
+2. 현재 최적점 주변(신뢰 영역)의 평가점으로 지표별 2차 응답 표면(response surface)을 적합
+3. 응답 표면상 제약을 만족(적합 잔차만큼 여유)하는 후보 중 비용이 낮은 점을 batch_size개 선택
+4. 선택한 후보를 batch_simulator로 한 번에 적분하여 실제 지표 확인 -> 최적점 / 신뢰 영역 갱신
+신뢰 영역이 tol (범위 대비 비율) 아래로 줄어들면 종료합니다.
+compare_grid=True이면 격자를 2배씩 세분하는 격자 탐색(grid_search)을 같은 비용에
+도달할 때까지 실행하여 실제로 필요한 시뮬레이션 수와 비교합니다.
+(tol 해상도의 전체 격자 크기 grid_sims는 격자 탐색 비용의 상한일 뿐입니다.)
+
+사용 예)
+    cfg = Config(X_line=0.5, V_grid_fault=0.9, use_proposed_control=True)
+    result = co_optimize(cfg)
+    print_report(result)
+"""
+
+import time
+import numpy as np
+from models.batch_simulator import (
+    AVM_BATCH_FIELDS,
+    HYBRID_BATCH_FIELDS,
+    simulate_avm_batch,
+    simulate_hybrid_batch,
+)
+from models.metrics import compute_metrics
+
+MODEL_FIELDS = {"avm": AVM_BATCH_FIELDS, "hybrid": HYBRID_BATCH_FIELDS}
+
+# 모델별 탐색 범위 (하한, 상한) - hybrid 모델에는 전압 제어(K_nvr)가 없음
+DEFAULT_BOUNDS = {
+    "avm": {"H": (1.0, 10.0), "D": (1.0, 30.0), "K_nvr": (0.0, 5.0)},
+    "hybrid": {"H": (1.0, 10.0), "D": (1.0, 30.0)},
+}
+
+# 비용 가중치 (K_nvr은 제어 게인이므로 비용 없음)
+DEFAULT_WEIGHTS = {"H": 1.0, "D": 0.1, "K_nvr": 0.0}
+
+# 모델별 제약 (하한, 상한) - None은 제한 없음
+# avm: 전력망 전압 강하(V_grid_fault) 시나리오, hybrid: 태양광 출력 감소(P_solar_drop) 시나리오
+# (hybrid 모델의 전압은 상수 V_vsg이므로 전압 제약 없음)
+DEFAULT_LIMITS = {
+    "avm": {
+        "nadir": (59.99, None),  # [Hz]
+        "rocof": (None, 0.5),  # [Hz/s]
+        "V_min": (0.88, None),  # [p.u.]
+    },
+    "hybrid": {
+        "nadir": (59.9, None),  # [Hz]
+        "rocof": (None, 1.0),  # [Hz/s]
+    },
+}
+
+
+def evaluate_batch(config, points, model="avm", t=None):
+    """
+    파라미터 조합 N개를 배치 적분하여 지표를 계산
+    points: {이름: (N,) 배열}
+    반환: compute_metrics 지표 표 {이름: (N,) 배열} (발산/평형점 없음은 NaN)
+    """
+    if model == "avm":
+        # 초기 상태는 후보별 외란 이전 평형점 (X_line, K_q 등을 탐색해도 정확)
+        t, sol = simulate_avm_batch(config, t=t, **points)
+    elif model == "hybrid":
+        t, sol = simulate_hybrid_batch(config, t=t, **points)
+    else:
+        raise ValueError(f"Unknown model '{model}' (expected 'avm' or 'hybrid')")
+    with np.errstate(invalid="ignore"):
+        return compute_metrics(t, sol, config, model)
+
+
+def _features(x):
+    """정규화 좌표 x (N, d)의 2차 다항식 특징 [1, x_i, x_i * x_j (i <= j)]"""
+    n, d = x.shape
+    i, j = np.triu_indices(d)
+    return np.hstack((np.ones((n, 1)), x, x[:, i] * x[:, j]))
+
+
+def fit_response_surface(x, y, ridge=1e-8):
+    """
+    2차 응답 표면 y ~ f(x) 최소제곱 적합 (NaN인 점은 제외)
+    반환: (계수, 잔차 RMS) - 적합할 점이 부족하면 (None, inf)
+    """
+    valid = np.isfinite(y)
+    X = _features(x[valid])
+    if valid.sum() < X.shape[1]:
+        return None, np.inf
+    # 작은 ridge 항으로 점이 한쪽에 몰린 경우의 불량 조건을 완화
+    A = X.T @ X + ridge * np.eye(X.shape[1])
+    coef = np.linalg.solve(A, X.T @ y[valid])
+    residual = y[valid] - X @ coef
+    return coef, float(np.sqrt(np.mean(residual**2)))
+
+
+def predict_response_surface(coef, x):
+    return _features(x) @ coef
+
+
+def _feasible(metrics, limits, margin=None):
+    """지표 표가 모든 제약을 만족하는지 (margin: 지표별 여유값)"""
+    ok = None
+    for name, (lower, upper) in limits.items():
+        values = np.asarray(metrics[name], dtype=float)
+        slack = 0.0 if margin is None else margin[name]
+        passed = np.isfinite(values)
+        if lower is not None:
+            passed &= values - slack >= lower
+        if upper is not None:
+            passed &= values + slack <= upper
+        ok = passed if ok is None else ok & passed
+    return ok
+
+
+def _spread(candidates, order, n, min_distance):
+    """비용 순서(order)대로 서로 min_distance 이상 떨어진 후보를 최대 n개 선택"""
+    chosen = []
+    for k in order:
+        if len(chosen) == n:
+            break
+        if all(
+            np.max(np.abs(candidates[k] - candidates[c])) >= min_distance
+            for c in chosen
+        ):
+            chosen.append(k)
+    return chosen
+
+
+def _resolve(model, bounds, limits, weights):
+    """모델별 기본값 적용 및 탐색 파라미터 검증"""
+    if model not in MODEL_FIELDS:
+        raise ValueError(f"Unknown model '{model}' (expected 'avm' or 'hybrid')")
+    bounds = dict(DEFAULT_BOUNDS[model] if bounds is None else bounds)
+    limits = dict(DEFAULT_LIMITS[model] if limits is None else limits)
+    weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+    unknown = set(bounds) - set(MODEL_FIELDS[model])
+    if unknown:
+        raise ValueError(
+            f"Parameter(s) {sorted(unknown)} cannot be varied in the '{model}' model."
+        )
+    return bounds, limits, weights
+
+
+def grid_search(
+    config,
+    bounds=None,
+    limits=None,
+    weights=None,
+    model="avm",
+    target_cost=None,
+    max_sims=20000,
+    chunk_size=2048,
+):
+    """
+    기준 비교용 격자 탐색: 축당 3, 5, 9, 17, ... 점으로 격자를 2배씩 세분하며
+    (이전 격자의 점은 다시 적분하지 않음) 제약을 만족하는 최소 비용 점을 찾습니다.
+    target_cost 이하의 비용을 찾거나 다음 격자가 max_sims를 넘으면 종료
+    반환: {"best" {이름: 값} 또는 None, "cost", "n_sims", "points_per_axis", "reached"}
+    """
+    bounds, limits, weights = _resolve(model, bounds, limits, weights)
+    names = list(bounds)
+    lo = np.array([bounds[k][0] for k in names], dtype=float)
+    hi = np.array([bounds[k][1] for k in names], dtype=float)
+    w = np.array([weights.get(k, 0.0) for k in names], dtype=float)
+    d = len(names)
+
+    best_x = None
+    best_cost = np.inf
+    n_sims = 0
+    points = 0
+    level = 1
+    while (2**level + 1) ** d <= max_sims:
+        m = 2**level + 1
+        index = np.indices((m,) * d).reshape(d, -1).T
+        if level > 1:
+            # 모든 축의 인덱스가 짝수인 점은 이전 격자에서 이미 평가함
+            index = index[np.any(index % 2 == 1, axis=1)]
+        x = lo + index / (m - 1) * (hi - lo)
+        for start in range(0, len(x), chunk_size):
+            chunk = x[start : start + chunk_size]
+            metrics = evaluate_batch(
+                config, {k: chunk[:, i] for i, k in enumerate(names)}, model
+            )
+            feasible = np.flatnonzero(_feasible(metrics, limits))
+            if feasible.size:
+                cost = chunk[feasible] @ w
+                if cost.min() < best_cost:
+                    best_cost = float(cost.min())
+                    best_x = chunk[feasible[np.argmin(cost)]]
+        n_sims += len(x)
+        points = m
+        if target_cost is not None and best_cost <= target_cost:
+            break
+        level += 1
+
+    return {
+        "best": None if best_x is None else dict(zip(names, map(float, best_x))),
+        "cost": None if best_x is None else best_cost,
+        "n_sims": n_sims,
+        "points_per_axis": points,
+        "reached": target_cost is None or best_cost <= target_cost,
+    }
+
+
+def co_optimize(
+    config,
+    bounds=None,
+    limits=None,
+    weights=None,
+    model="avm",
+    batch_size=8,
+    n_init=None,
+    max_evals=200,
+    tol=0.01,
+    n_candidates=4000,
+    seed=0,
+    verbose=True,
+    compare_grid=False,
+    max_grid_sims=20000,
+):
+    """
+    제약을 만족하면서 비용 sum(weights[k] * x_k)가 최소인 파라미터 조합을 탐색
+    bounds: {이름: (하한, 상한)} (AVM/HYBRID_BATCH_FIELDS 중 선택, 기본 DEFAULT_BOUNDS[model])
+    limits: {지표 이름: (하한, 상한)} (compute_metrics 지표, 기본 DEFAULT_LIMITS[model])
+    weights: {이름: 비용 가중치} (기본 DEFAULT_WEIGHTS, 없는 이름은 0)
+    tol: 종료 시 신뢰 영역 크기 (각 파라미터 범위 대비 비율) = 결과의 해상도
+    compare_grid: True이면 grid_search로 같은 비용(tol 해상도만큼의 비용 차이 허용)에
+                  도달하는 데 필요한 시뮬레이션 수를 실제로 측정 (최대 max_grid_sims)
+    반환: {"best" {이름: 값} 또는 None, "cost", "metrics", "n_sims", "n_batches",
+           "grid_sims", "grid", "history", "wall_time"}
+      grid_sims: tol 해상도의 전체 격자 크기 (격자 탐색 비용의 상한, 실제 필요량이 아님)
+      grid: grid_search 결과 (compare_grid=False이면 None)
+    """
+    start = time.perf_counter()
+    bounds, limits, weights = _resolve(model, bounds, limits, weights)
+    names = list(bounds)
+    lo = np.array([bounds[k][0] for k in names], dtype=float)
+    hi = np.array([bounds[k][1] for k in names], dtype=float)
+    w = np.array([weights.get(k, 0.0) for k in names], dtype=float)
+    d = len(names)
+    n_features = 1 + d + d * (d + 1) // 2
+    if n_init is None:
+        n_init = max(2 * n_features, batch_size)
+    rng = np.random.default_rng(seed)
+
+    # 내부 계산은 정규화 좌표 u in [0, 1]^d
+    def to_params(u):
+        x = lo + u * (hi - lo)
+        return {k: x[:, i] for i, k in enumerate(names)}
+
+    def cost(u):
+        return (lo + u * (hi - lo)) @ w
+
+    evaluated = np.empty((0, d))
+    table = {name: np.empty(0) for name in limits}
+    history = []
+    best = None
+    radius = 0.5
+
+    def run(u):
+        nonlocal evaluated, best
+        metrics = evaluate_batch(config, to_params(u), model)
+        for name in limits:
+            table[name] = np.concatenate((table[name], metrics[name]))
+        evaluated = np.vstack((evaluated, u))
+        feasible = _feasible(metrics, limits)
+        improved = False
+        for k in np.flatnonzero(feasible):
+            if best is None or cost(u[k]) < cost(evaluated[best]):
+                best = len(evaluated) - len(u) + k
+                improved = True
+        history.append(
+            {
+                "batch": len(history),
+                "n_sims": len(evaluated),
+                "n_feasible": int(feasible.sum()),
+                "radius": radius,
+                "best_cost": None if best is None else float(cost(evaluated[best])),
+            }
+        )
+        return improved
+
+    # 1. 초기 배치: 라틴 하이퍼큐브
+    u0 = (
+        np.column_stack([rng.permutation(n_init) for _ in range(d)])
+        + rng.random((n_init, d))
+    ) / n_init
+    run(u0)
+
+    while radius > tol and len(evaluated) < max_evals:
+        # 2. 신뢰 영역 (최적점이 없으면 전체 범위) 안의 점 + 가까운 점으로 지표별 응답 표면 적합
+        center = evaluated[best] if best is not None else np.full(d, 0.5)
+        box_lo = np.clip(center - radius, 0.0, 1.0)
+        box_hi = np.clip(center + radius, 0.0, 1.0)
+        distance = np.max(np.abs(evaluated - center), axis=1)
+        n_fit = max(2 * n_features, int(np.sum(distance <= 2 * radius)))
+        nearest = np.argsort(distance)[:n_fit]
+
+        surfaces = {}
+        margin = {}
+        for name in limits:
+            surfaces[name], margin[name] = fit_response_surface(
+                evaluated[nearest], table[name][nearest]
+            )
+
+        # 3. 후보 생성 -> 응답 표면으로 제약 예측 -> 비용 순으로 서로 떨어진 점 선택
+        candidates = box_lo + rng.random((n_candidates, d)) * (box_hi - box_lo)
+        if all(coef is not None for coef in surfaces.values()):
+            predicted = {
+                name: predict_response_surface(coef, candidates)
+                for name, coef in surfaces.items()
+            }
+            feasible = np.flatnonzero(_feasible(predicted, limits, margin))
+        else:
+            feasible = np.empty(0, dtype=int)
+        order = feasible[np.argsort(cost(candidates[feasible]))]
+        chosen = _spread(candidates, order, batch_size, radius / 4)
+        if len(chosen) < batch_size:
+            # 예측상 가능한 후보가 부족하면 신뢰 영역을 고르게 탐색
+            rest = rng.permutation(np.setdiff1d(np.arange(n_candidates), chosen))
+            chosen += _spread(candidates, rest, batch_size - len(chosen), radius / 4)
+        batch = candidates[chosen[: max_evals - len(evaluated)]]
+
+        # 4. 실제 시뮬레이션으로 확인, 개선이 없으면 신뢰 영역 축소
+        improved = run(batch)
+        if verbose:
+            entry = history[-1]
+            best_text = "none" if best is None else f"cost={entry['best_cost']:.4f}"
+            print(
+                f"Batch {entry['batch']}: sims={entry['n_sims']}, "
+                f"feasible={entry['n_feasible']}/{len(batch)}, "
+                f"radius={radius:.4f}, best {best_text}"
+            )
+        if not improved:
+            radius /= 2
+
+    # tol 간격 전체 격자의 크기 (상한): 더 거친 격자로도 비슷한 비용에 도달할 수 있음
+    grid_sims = int(np.prod(np.full(d, int(np.ceil(1.0 / tol)) + 1)))
+    result = {
+        "best": None,
+        "cost": None,
+        "metrics": None,
+        "names": names,
+        "n_sims": len(evaluated),
+        "n_batches": len(history),
+        "grid_sims": grid_sims,
+        "grid": None,
+        "resolution": {k: tol * (hi[i] - lo[i]) for i, k in enumerate(names)},
+        "history": history,
+        "wall_time": time.perf_counter() - start,
+    }
+    if best is not None:
+        x = lo + evaluated[best] * (hi - lo)
+        result["best"] = {k: float(x[i]) for i, k in enumerate(names)}
+        result["cost"] = float(cost(evaluated[best]))
+        result["metrics"] = {name: float(table[name][best]) for name in limits}
+        if compare_grid:
+            # 비용 기준 허용 오차: 각 파라미터를 tol 해상도만큼 움직였을 때의 비용 변화
+            target = result["cost"] + tol * float(np.abs(w) @ (hi - lo))
+            result["grid"] = grid_search(
+                config, bounds, limits, weights, model, target, max_grid_sims
+            )
+    return result
+
+
+def print_report(result):
+    """co_optimize 결과 요약 출력"""
+    print("--- Co-optimization Result ---")
+    if result["best"] is None:
+        print("  No feasible parameter set found within the bounds.")
+    else:
+        params = ", ".join(f"{k}={v:.4f}" for k, v in result["best"].items())
+        metrics = ", ".join(f"{k}={v:.4f}" for k, v in result["metrics"].items())
+        print(f"  Best: {params} (cost={result['cost']:.4f})")
+        print(f"  Metrics: {metrics}")
+    resolution = ", ".join(f"{k}: {v:.3g}" for k, v in result["resolution"].items())
+    print(
+        f"  Simulations: {result['n_sims']} in {result['n_batches']} batches "
+        f"({result['wall_time']:.2f} s)"
+    )
+    print(
+        f"  Full grid at the same resolution ({resolution}): "
+        f"{result['grid_sims']} simulations (upper bound, not a measured comparison)"
+    )
+    grid = result["grid"]
+    if grid is None:
+        return
+    found = "none" if grid["cost"] is None else f"cost={grid['cost']:.4f}"
+    if grid["reached"]:
+        print(
+            f"  Grid search reaching the same cost: {grid['n_sims']} simulations "
+            f"({grid['points_per_axis']} points/axis, {found}) -> "
+            f"{grid['n_sims'] / max(result['n_sims'], 1):.1f}x more than co-optimization"
+        )
+    else:
+        print(
+            f"  Grid search did not reach the same cost within {grid['n_sims']} "
+            f"simulations ({grid['points_per_axis']} points/axis, best {found})"
+        )
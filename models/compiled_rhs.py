@@ -0,0 +1,344 @@
+# models/compiled_rhs.py
+"""
+동역학 함수(RHS)의 컴파일 백엔드
+
+config 객체의 속성 조회 대신 파라미터를 1차원 float 배열로 고정(freeze)하고,
+스칼라 연산은 math 모듈로 처리합니다. numba가 설치되어 있으면 njit으로 컴파일하고,
+없으면 같은 코드를 순수 Python으로 실행합니다. (결과는 원본 함수와 동일)
+
+사용 예)
+    rhs, params = make_rhs("hybrid", cfg)
+    sol = odeint(rhs, y0, t, args=(params,))
+"""
+
+import math
+import time
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:  # numba 미설치 시 순수 Python 실행
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# ==========================================
+# 1. 모델별 파라미터 배열 구성 (순서가 곧 커널의 인덱스)
+# ==========================================
+PARAM_LAYOUTS = {
+    "swing": (
+        "V_vsg",
+        "V_grid",
+        "X_line",
+        "P_ref",
+        "P_load_step",
+        "event_time",
+        "Omega_0",
+        "H",
+        "D",
+    ),
+    "hybrid": (
+        "V_vsg",
+        "V_grid",
+        "X_line",
+        "P_load_total",
+        "P_solar_initial",
+        "P_solar_drop",
+        "event_time",
+        "Omega_0",
+        "H",
+        "D",
+    ),
+    "avm": (
+        "V_grid_normal",
+        "V_grid_fault",
+        "X_line",
+        "P_ref",
+        "event_time",
+        "Omega_0",
+        "H",
+        "D",
+        "V_ref_base",
+        "K_q",
+        "T_v",
+        "use_proposed_control",
+        "K_nvr",
+    ),
+    "detailed": (
+        "w_base",
+        "J",
+        "D",
+        "P_ref",
+        "Q_ref",
+        "K_q",
+        "V_ref",
+        "Kpv",
+        "Kiv",
+        "Kpc",
+        "Kic",
+        "R_f",
+        "L_f",
+        "C_f",
+        "R_g",
+        "L_g",
+        "V_grid_mag",
+        "event_time",
+    ),
+}
+
+
+def freeze_params(model, config):
+    """config에서 모델이 사용하는 값만 뽑아 1차원 float 배열로 반환"""
+    if hasattr(config, "as_array"):
+        return config.as_array(PARAM_LAYOUTS[model])
+    return np.array([float(getattr(config, name)) for name in PARAM_LAYOUTS[model]])
+
+
+# ==========================================
+# 2. 커널 (y, t, p) -> tuple
+# ==========================================
+@njit(cache=True)
+def swing_rhs(y, t, p):
+    delta = y[0]
+    omega = y[1]
+    Omega_0 = p[6]
+
+    P_out = (p[0] * p[1] / p[2]) * math.sin(delta)
+    if t >= p[5]:
+        P_m = p[3] - p[4]
+    else:
+        P_m = p[3]
+
+    d_delta_dt = omega - Omega_0
+    d_omega_dt = (
+        (1 / (2 * p[7])) * (P_m - P_out - p[8] * (omega - Omega_0) / Omega_0) * Omega_0
+    )
+    return d_delta_dt, d_omega_dt
+
+
+@njit(cache=True)
+def hybrid_rhs(y, t, p):
+    delta = y[0]
+    omega = y[1]
+    Omega_0 = p[7]
+
+    if t >= p[6]:
+        P_solar = p[4] - p[5]
+    else:
+        P_solar = p[4]
+
+    P_vsg_elec = (p[0] * p[1] / p[2]) * math.sin(delta)
+    current_load_imbalance = (p[3] - P_solar) - P_vsg_elec
+
+    d_delta_dt = omega - Omega_0
+    d_omega_dt = (
+        (1 / (2 * p[8]))
+        * (current_load_imbalance - p[9] * (omega - Omega_0) / Omega_0)
+        * Omega_0
+    )
+    return d_delta_dt, d_omega_dt
+
+
+@njit(cache=True)
+def avm_rhs(y, t, p):
+    delta = y[0]
+    omega = y[1]
+    V_vsg = y[2]
+    X_line = p[2]
+    Omega_0 = p[5]
+
+    if t >= p[4]:
+        V_grid = p[1]
+    else:
+        V_grid = p[0]
+
+    P_out = (V_vsg * V_grid / X_line) * math.sin(delta)
+    Q_out = (V_vsg**2 / X_line) - (V_vsg * V_grid / X_line) * math.cos(delta)
+
+    d_delta_dt = omega - Omega_0
+    d_omega_dt = (
+        (1 / (2 * p[6])) * (p[3] - P_out - p[7] * (omega - Omega_0) / Omega_0) * Omega_0
+    )
+
+    V_target = p[8] - p[9] * Q_out
+    if p[11] != 0.0:
+        # NVR 제어 신호 (+/- 0.1 p.u. 제한)
+        V_target += min(max(p[12] * (omega - Omega_0), -0.1), 0.1)
+
+    d_v_dt = (V_target - V_vsg) / p[10]
+    return d_delta_dt, d_omega_dt, d_v_dt
+
+
+@njit(cache=True)
+def detailed_rhs(states, t, p):
+    delta, omega = states[0], states[1]
+    int_vd, int_vq, int_id, int_iq = states[2], states[3], states[4], states[5]
+    i_Ld, i_Lq, v_od, v_oq = states[6], states[7], states[8], states[9]
+    i_gd, i_gq = states[10], states[11]
+
+    w_base, J, D = p[0], p[1], p[2]
+    K_q, Kpv, Kiv, Kpc, Kic = p[5], p[7], p[8], p[9], p[10]
+    R_f, L_f, C_f, R_g, L_g = p[11], p[12], p[13], p[14], p[15]
+
+    v_gd = p[16] * math.cos(-delta)
+    v_gq = p[16] * math.sin(-delta)
+
+    P_calc = v_od * i_gd + v_oq * i_gq
+    Q_calc = v_oq * i_gd - v_od * i_gq
+
+    P_m = p[3] if t > p[17] else 0.0
+    d_delta = omega - w_base
+    d_omega = (1 / J) * (P_m - P_calc - D * (omega - w_base))
+
+    err_vd = (p[6] - K_q * (Q_calc - p[4])) - v_od
+    err_vq = 0.0 - v_oq
+    i_Ld_ref = (Kpv * err_vd + int_vd) - (omega * C_f * v_oq)
+    i_Lq_ref = (Kpv * err_vq + int_vq) + (omega * C_f * v_od)
+
+    err_id = i_Ld_ref - i_Ld
+    err_iq = i_Lq_ref - i_Lq
+    v_inv_d = (Kpc * err_id + int_id) - (omega * L_f * i_Lq) + v_od
+    v_inv_q = (Kpc * err_iq + int_iq) + (omega * L_f * i_Ld) + v_oq
+
+    return (
+        d_delta,
+        d_omega,
+        Kiv * err_vd,
+        Kiv * err_vq,
+        Kic * err_id,
+        Kic * err_iq,
+        (1 / L_f) * (v_inv_d - v_od - R_f * i_Ld + omega * L_f * i_Lq),
+        (1 / L_f) * (v_inv_q - v_oq - R_f * i_Lq - omega * L_f * i_Ld),
+        (1 / C_f) * (i_Ld - i_gd + omega * C_f * v_oq),
+        (1 / C_f) * (i_Lq - i_gq - omega * C_f * v_od),
+        (1 / L_g) * (v_od - v_gd - R_g * i_gd + omega * L_g * i_gq),
+        (1 / L_g) * (v_oq - v_gq - R_g * i_gq - omega * L_g * i_gd),
+    )
+
+
+KERNELS = {
+    "swing": swing_rhs,
+    "hybrid": hybrid_rhs,
+    "avm": avm_rhs,
+    "detailed": detailed_rhs,
+}
+
+
+def make_rhs(model, config):
+    """
+    모델 이름("swing", "hybrid", "avm", "detailed")과 config로부터
+    (rhs, params)를 반환합니다. odeint(rhs, y0, t, args=(params,)) 형태로 사용합니다.
+    hybrid 커널은 계단형 태양광 출력만 지원하므로 config.solar_profile이 있으면 ValueError
+    """
+    if model == "hybrid" and getattr(config, "solar_profile", None) is not None:
+        raise ValueError(
+            "The compiled hybrid kernel does not support config.solar_profile "
+            "(only the step-drop solar scenario); use hybrid_system.system_dynamics."
+        )
+    params = freeze_params(model, config)
+    kernel = KERNELS[model]
+    if HAS_NUMBA:
+        return kernel, params
+
+    # 순수 Python 실행 시에는 numpy 스칼라(np.float64)보다 Python float 연산이 빠르므로
+    # 상태와 파라미터를 모두 float 시퀀스로 변환하여 커널에 전달
+    def rhs(y, t, p):
+        return kernel(y.tolist(), t, p)
+
+    return rhs, tuple(params.tolist())
+
+
+# ==========================================
+# 3. 원본 함수 대비 속도 측정
+# ==========================================
+def benchmark_backends(n_calls=20000):
+    """
+    원본 RHS와 컴파일 RHS의 1회 호출 시간 및 odeint 전체 실행 시간을 비교합니다.
+    반환: {모델: {"reference_us", "compiled_us", "call_speedup",
+                  "odeint_reference_s", "odeint_compiled_s", "odeint_speedup"}}
+    """
+    from scipy.integrate import odeint
+    from config import Config
+    from models.vsg_model import swing_equation
+    from models.hybrid_system import system_dynamics
+    from models.avm_system import voltage_dynamics
+    from step12_detailed_vsg import DetailedConfig, detailed_dynamics
+    from models.initializer import initial_state
+
+    cfg = Config(P_load_step=0.1, use_proposed_control=True)
+    dcfg = DetailedConfig()
+
+    # detailed: 0에서 시작하면 (Black Start) 발산하여 odeint가 중간에 멈추므로
+    # 외란 이전 평형점에서 부하 투입 이후까지 적분
+    y_detailed = initial_state("detailed", dcfg)
+    t_detailed = (dcfg.event_time - 0.05, 1.5)
+    cases = {
+        "swing": (swing_equation, cfg, [0.5, cfg.Omega_0], (0.0, 10.0), 1000),
+        "hybrid": (system_dynamics, cfg, [0.5, cfg.Omega_0], (0.0, 10.0), 1000),
+        "avm": (voltage_dynamics, cfg, [0.0, cfg.Omega_0, 1.0], (0.0, 10.0), 1000),
+        "detailed": (detailed_dynamics, dcfg, y_detailed, t_detailed, 3000),
+    }
+
+    report = {}
+    print(f"--- RHS Backend Benchmark (numba: {HAS_NUMBA}) ---")
+    for model, (reference, config, y0, (t0, t1), steps) in cases.items():
+        rhs, params = make_rhs(model, config)
+        y = np.asarray(y0, dtype=float)
+
+        # 결과 일치 확인 및 (numba의 경우) 컴파일 워밍업
+        np.testing.assert_allclose(rhs(y, t1, params), reference(y, t1, config))
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            reference(y, t1, config)
+        reference_us = (time.perf_counter() - start) / n_calls * 1e6
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            rhs(y, t1, params)
+        compiled_us = (time.perf_counter() - start) / n_calls * 1e6
+
+        t = np.linspace(t0, t1, steps)
+        start = time.perf_counter()
+        _, info_reference = odeint(reference, y, t, args=(config,), full_output=True)
+        odeint_reference = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, info_compiled = odeint(rhs, y, t, args=(params,), full_output=True)
+        odeint_compiled = time.perf_counter() - start
+
+        # 중간에 멈춘 적분의 실행 시간은 비교 의미가 없음
+        for backend, info in (
+            ("reference", info_reference),
+            ("compiled", info_compiled),
+        ):
+            if not info["message"].startswith("Integration successful"):
+                raise RuntimeError(
+                    f"{model} ({backend}) odeint run did not finish: {info['message']}"
+                )
+
+        report[model] = {
+            "reference_us": reference_us,
+            "compiled_us": compiled_us,
+            "call_speedup": reference_us / compiled_us,
+            "odeint_reference_s": odeint_reference,
+            "odeint_compiled_s": odeint_compiled,
+            "odeint_speedup": odeint_reference / odeint_compiled,
+        }
+        print(
+            f"{model:>9}: {reference_us:7.2f} us -> {compiled_us:7.2f} us "
+            f"(x{reference_us / compiled_us:.1f}), odeint "
+            f"{odeint_reference * 1e3:7.1f} ms -> {odeint_compiled * 1e3:7.1f} ms "
+            f"(x{odeint_reference / odeint_compiled:.1f})"
+        )
+    return report
+
+
+if __name__ == "__main__":
+    benchmark_backends()
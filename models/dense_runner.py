@@ -0,0 +1,271 @@
+# models/dense_runner.py
+"""
+적응 스텝 + 연속 출력(dense output) 실행기
+
+고정 격자(np.linspace(t_start, t_end, steps))의 모든 점을 솔버에 요구하는 대신,
+솔버가 스스로 고른 스텝과 구간별 보간식만 저장하고 필요한 시각에서 나중에 계산합니다.
+- 솔버 비용은 출력 점 개수가 아니라 동역학의 변화에 따라 결정됨
+- 그래프용 격자: 이벤트/nadir 부근은 촘촘하게, 나머지는 듬성듬성 (sample)
+- 지표용 값: 보간식에서 최저점 등을 정확한 시각으로 계산 (extremum, metrics)
+
+이벤트/schedule 구간 분할은 scenario.run_segmented와 동일하게 처리합니다.
+
+사용 예)
+    dense = run_dense(system_dynamics, y0, cfg)
+    t = dense.sample()                 # 적응 격자
+    sol = dense(t)                     # (len(t), n_states)
+    t_nadir, omega_min = dense.extremum(1, "min")
+"""
+
+import time
+import numpy as np
+import scipy.integrate
+from scipy.integrate import OdeSolution
+from scipy.optimize import brentq, minimize_scalar
+from models.metrics import DEFAULT_SETTLING_BAND, compute_metrics, nominal_omega
+from models.scenario import iter_segments
+
+# odeint 기본 허용 오차 (고정 격자 실행 결과와 비교 가능하게 함)
+_RTOL = 1.49012e-8
+_ATOL = 1.49012e-8
+
+
+class DenseSolution:
+    """
+    run_dense 결과: 구간별 연속 출력 보간식과 솔버 스텝
+    dense(t)로 임의 시각(스칼라 또는 배열)의 상태를 계산합니다.
+    """
+
+    def __init__(self, segments, t_steps, y_steps, stats):
+        self.segments = segments  # [(구간 시작, 구간 끝, OdeSolution), ...]
+        self.t_steps = t_steps  # (n_steps,) 솔버가 실제로 선택한 시각
+        self.y_steps = y_steps  # (n_steps, n_states)
+        self.stats = stats  # {"nfev", "njev", "nsteps", "wall_time", ...}
+        self._starts = np.array([segment[0] for segment in segments])
+
+    @property
+    def t_start(self):
+        return self.segments[0][0]
+
+    @property
+    def t_end(self):
+        return self.segments[-1][1]
+
+    @property
+    def breakpoints(self):
+        """구간 경계 (이벤트 시각) - 양 끝 제외"""
+        return self._starts[1:]
+
+    def __len__(self):
+        return self.t_steps.size
+
+    def __call__(self, t):
+        """시각 t (스칼라 -> (n_states,), 배열 -> (len(t), n_states))"""
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        t = np.atleast_1d(t)
+        # 경계 시각은 이후 구간 (이벤트 이후 값)으로 계산
+        index = np.clip(np.searchsorted(self._starts, t, side="right") - 1, 0, None)
+        out = np.empty((t.size, self.y_steps.shape[1]))
+        for k in np.unique(index):
+            mask = index == k
+            out[mask] = self.segments[k][2](t[mask]).T
+        return out[0] if scalar else out
+
+    def sample(
+        self, coarse_points=200, fine_dt=1e-3, fine_span=0.5, state=1, windows=None
+    ):
+        """
+        그래프/지표용 적응 격자
+        - 전체 구간: coarse_points개 등간격 점
+        - 각 이벤트 이후 fine_span 초와 state 번째 상태의 최저점 전후 fine_span / 2 초:
+          fine_dt 간격
+        windows: [(시작, 끝), ...]를 직접 지정하면 위 기본 구간 대신 사용
+        """
+        if windows is None:
+            windows = [(b, b + fine_span) for b in self.breakpoints]
+            t_min, _ = self.extremum(state, "min")
+            windows.append((t_min - fine_span / 2, t_min + fine_span / 2))
+
+        grids = [np.linspace(self.t_start, self.t_end, coarse_points)]
+        for start, end in windows:
+            start = max(start, self.t_start)
+            end = min(end, self.t_end)
+            if end > start:
+                grids.append(np.arange(start, end, fine_dt))
+        grids.append(self.breakpoints)
+        return np.unique(np.concatenate(grids))
+
+    def extremum(self, state=1, kind="min"):
+        """
+        state 번째 상태의 최솟값/최댓값을 보간식에서 정확히 계산
+        반환: (시각, 값)
+        """
+        sign = 1.0 if kind == "min" else -1.0
+        k = int(np.argmin(sign * self.y_steps[:, state]))
+        lo = self.t_steps[max(k - 1, 0)]
+        hi = self.t_steps[min(k + 1, self.t_steps.size - 1)]
+        if hi <= lo:
+            return float(self.t_steps[k]), float(self.y_steps[k, state])
+
+        result = minimize_scalar(
+            lambda tt: sign * self(tt)[state],
+            bounds=(lo, hi),
+            method="bounded",
+            options={"xatol": 1e-9},
+        )
+        # 스텝 점의 값이 더 극값이면 (경계 등) 그 값을 사용
+        if sign * result.fun > sign * self.y_steps[k, state]:
+            return float(self.t_steps[k]), float(self.y_steps[k, state])
+        return float(result.x), float(sign * result.fun)
+
+    def metrics(
+        self,
+        config,
+        model="hybrid",
+        settling_band=DEFAULT_SETTLING_BAND,
+        **sample_kwargs,
+    ):
+        """
+        metrics.compute_metrics를 적응 격자에서 계산하고,
+        nadir / t_nadir / peak / overshoot는 보간식의 정확한 극값으로,
+        settling_time은 대역 경계를 지나는 정확한 시각으로 대체
+        """
+        t = self.sample(**sample_kwargs)
+        metrics = compute_metrics(t, self(t), config, model, settling_band)
+
+        # 정착 시각: 마지막으로 대역 밖이었던 격자점과 다음 격자점 사이에서 경계 통과 시각 계산
+        settling = metrics["settling_time"]
+        if np.isfinite(settling) and settling > 0:
+            i = int(np.searchsorted(t, config.event_time + settling))
+            if i + 1 < t.size:
+                Omega_0 = nominal_omega(config)
+                band = settling_band * 2 * np.pi
+
+                def outside(tt):
+                    return abs(self(tt)[1] - Omega_0) - band
+
+                if outside(t[i]) > 0 >= outside(t[i + 1]):
+                    metrics["settling_time"] = (
+                        brentq(outside, t[i], t[i + 1], xtol=1e-9) - config.event_time
+                    )
+
+        to_hz = 1 / (2 * np.pi)
+        t_nadir, omega_min = self.extremum(1, "min")
+        _, omega_max = self.extremum(1, "max")
+        peak = omega_max * to_hz
+        metrics["overshoot"] += peak - metrics["peak"]
+        metrics["nadir"] = omega_min * to_hz
+        metrics["t_nadir"] = t_nadir
+        metrics["peak"] = peak
+        return metrics
+
+
+def _integrate_segment(fun, jac, t0, t1, y0, method, max_steps, options):
+    """
+    solve_ivp(dense_output=True)와 같은 방식으로 한 구간을 적분 (스텝 수 상한 포함)
+    반환: (t_steps, y_steps, OdeSolution, solver, 성공 여부, 메시지)
+    """
+    solver_class = getattr(scipy.integrate, method)
+    if jac is not None:
+        options = dict(options, jac=jac)
+    solver = solver_class(fun, t0, y0, t1, **options)
+
+    ts = [t0]
+    ys = [np.array(y0, dtype=float)]
+    interpolants = []
+    message = "The solver successfully reached the end of the integration interval."
+    success = True
+    while solver.status == "running":
+        if len(interpolants) >= max_steps:
+            # odeint의 mxstep과 같은 역할: 발산/과도한 stiff 구간에서 무한히 적분하지 않음
+            success = False
+            message = f"Stopped after max_steps={max_steps} steps at t={solver.t:.6g}."
+            break
+        step_message = solver.step()
+        if solver.status == "failed":
+            success = False
+            message = step_message
+            break
+        interpolants.append(solver.dense_output())
+        ts.append(solver.t)
+        ys.append(solver.y.copy())
+
+    if not interpolants:
+        raise RuntimeError(f"Integration failed at t={t0}: {message}")
+    ts = np.array(ts)
+    return ts, np.array(ys), OdeSolution(ts, interpolants), solver, success, message
+
+
+def run_dense(
+    rhs,
+    y0,
+    config,
+    t_span=None,
+    schedule=None,
+    method="LSODA",
+    jac=None,
+    rtol=_RTOL,
+    atol=_ATOL,
+    max_steps=100_000,
+    event_attr="event_time",
+    **solver_kwargs,
+):
+    """
+    rhs(y, t, config) (odeint 형식)를 적응 스텝으로 적분하여 DenseSolution을 반환
+    t_span: (t_start, t_end), 생략 시 config.t_start / config.t_end
+    jac: jac(y, t, config) 해석적 Jacobian (odeint Dfun 형식, 선택)
+    method: scipy.integrate 솔버 이름 ("LSODA", "BDF", "Radau", "RK45", ...)
+    max_steps: 구간별 최대 스텝 수 (넘으면 그 시각까지의 결과만 반환, stats["success"] = False)
+    """
+    if t_span is None:
+        t_span = (config.t_start, config.t_end)
+
+    start = time.perf_counter()
+    y = np.asarray(y0, dtype=float)
+    segments = []
+    t_steps = []
+    y_steps = []
+    nfev = njev = 0
+    success = True
+    message = ""
+
+    for seg_start, seg_end, _, seg_config in iter_segments(
+        t_span[0], t_span[1], config, schedule, event_attr
+    ):
+        ts, ys, interpolant, solver, success, message = _integrate_segment(
+            lambda tt, yy, c=seg_config: rhs(yy, tt, c),
+            None if jac is None else (lambda tt, yy, c=seg_config: jac(yy, tt, c)),
+            seg_start,
+            seg_end,
+            y,
+            method,
+            max_steps,
+            dict(solver_kwargs, rtol=rtol, atol=atol),
+        )
+        nfev += int(solver.nfev)
+        njev += int(solver.njev)
+        segments.append((seg_start, float(ts[-1]), interpolant))
+        # 구간 경계 점은 이전 구간의 마지막 점과 중복되므로 첫 구간에서만 포함
+        first = 0 if not t_steps else 1
+        t_steps.append(ts[first:])
+        y_steps.append(ys[first:])
+        y = ys[-1]
+        if not success:
+            break
+
+    t_steps = np.concatenate(t_steps)
+    steps = np.diff(t_steps)
+    stats = {
+        "nfev": nfev,
+        "njev": njev,
+        "nsteps": int(steps.size),
+        "step_min": float(steps.min()) if steps.size else np.nan,
+        "step_max": float(steps.max()) if steps.size else np.nan,
+        "segments": len(segments),
+        "t_reached": float(t_steps[-1]),
+        "success": success,
+        "message": message,
+        "wall_time": time.perf_counter() - start,
+    }
+    return DenseSolution(segments, t_steps, np.concatenate(y_steps), stats)
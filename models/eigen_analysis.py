@@ -1,8 +1,21 @@
 # models/eigen_analysis.py
+from itertools import permutations
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+def get_synchronizing_coefficient(p_op, x_line_val, v_vsg=1.0, v_grid=1.0):
+    """
+    동기화 토크 계수 K_s = dP/d_delta 를 운전점 p_op에서 계산 (배열 입력 지원)
+    P_max = V1*V2/X, delta_0 = arcsin(p_op / P_max), K_s = P_max * cos(delta_0)
+    평형점이 없는 경우(p_op > P_max)는 NaN
+    """
+    P_max = (v_vsg * v_grid) / np.asarray(x_line_val, dtype=float)
+    ratio = np.asarray(p_op, dtype=float) / P_max
+    with np.errstate(invalid="ignore"):
+        return P_max * np.sqrt(1.0 - ratio**2)
+
+
 def get_linearized_matrix(config, x_line_val):
     """
     주어진 조건에서 시스템을 선형화하여 상태 행렬 A를 반환
@@ -18,11 +31,9 @@ def get_linearized_matrix(config, x_line_val):
     if config.P_ref > P_max:
         return None  # 불안정 (해 없음)
 
-    delta_0 = np.arcsin(config.P_ref / P_max)
-
     # 2. 선형화 계수 (Jacobian 요소)
     # 동기화 토크 계수 K_s = dP/d_delta
-    K_s = (v_vsg * v_grid / x_line_val) * np.cos(delta_0)
+    K_s = get_synchronizing_coefficient(config.P_ref, x_line_val, v_vsg, v_grid)
 
     # 3. 상태 행렬 A 구성
     # d_delta = 0*delta + 1*omega
@@ -33,34 +44,133 @@ def get_linearized_matrix(config, x_line_val):
     return A
 
 
-def plot_root_locus(config):
+def _broadcast_sweep(config, x_line_values, H, D):
+    """X_line, H, D (None이면 config 값)를 같은 길이의 1차원 배열로 브로드캐스트"""
+    x, h, d = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(x_line_values, dtype=float)),
+        np.asarray(config.H if H is None else H, dtype=float),
+        np.asarray(config.D if D is None else D, dtype=float),
+    )
+    return x.ravel(), h.ravel(), d.ravel()
+
+
+def get_linearized_matrix_batch(config, x_line_values, H=None, D=None):
+    """
+    get_linearized_matrix의 배치 버전
+    x_line_values, H, D (스칼라 또는 배열)를 브로드캐스트하여 (N, 2, 2) 상태 행렬을 반환
+    평형점이 없는 점(P_ref > P_max)의 행렬은 NaN으로 채워집니다.
+    """
+    v_vsg = getattr(config, "V_vsg", 1.0)
+    v_grid = getattr(config, "V_grid", 1.0)
+    x, h, d = _broadcast_sweep(config, x_line_values, H, D)
+
+    K_s = get_synchronizing_coefficient(config.P_ref, x, v_vsg, v_grid)
+
+    A = np.zeros((x.size, 2, 2))
+    A[:, 0, 1] = 1.0
+    A[:, 1, 0] = -K_s / (2 * h)
+    A[:, 1, 1] = -d / (2 * h)
+    A[np.isnan(K_s)] = np.nan
+    return A
+
+
+def eigvals_batch(A):
+    """
+    (N, n, n) 행렬들의 고유값 (N, n)
+    - 2x2: 특성방정식 근의 공식으로 계산 (lambda = tr/2 +/- sqrt((tr/2)^2 - det))
+      실수부가 같으면 허수부가 큰 근(위쪽 가지)이 항상 0번 열이므로 sweep 방향으로 연속
+    - 그 외: 유한한 행렬만 모아 np.linalg.eigvals로 한 번에 계산
+    NaN이 포함된 행렬의 고유값은 NaN
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[-1]
+
+    if n == 2:
+        half_trace = 0.5 * (A[:, 0, 0] + A[:, 1, 1])
+        det = A[:, 0, 0] * A[:, 1, 1] - A[:, 0, 1] * A[:, 1, 0]
+        root = np.sqrt((half_trace**2 - det).astype(complex))
+        return np.column_stack((half_trace + root, half_trace - root))
+
+    eigs = np.full(A.shape[:2], np.nan, dtype=complex)
+    finite = np.isfinite(A).all(axis=(1, 2))
+    if finite.any():
+        eigs[finite] = np.linalg.eigvals(A[finite])
+    return eigs
+
+
+def track_branches(eigs):
+    """
+    sweep 순서대로 나열된 고유값 (N, n)의 열 순서를 바꾸어 각 열이 하나의 가지(branch)를
+    따라가도록 정렬합니다. 인접한 두 점 사이에서 거리 합이 최소가 되는 순열을 선택합니다.
+    (순열 후보는 n!개이므로 소규모 시스템용, NaN 행은 건너뜀)
+    """
+    eigs = np.asarray(eigs, dtype=complex)
+    n_points, n = eigs.shape
+    valid = np.flatnonzero(np.isfinite(eigs).all(axis=1))
+    if n == 1 or valid.size < 2:
+        return eigs.copy()
+
+    perms = np.array(list(permutations(range(n))))  # (P, n)
+
+    # 1) 인접한 유효 점 사이의 상대 순열 (벡터화)
+    prev, curr = eigs[valid[:-1]], eigs[valid[1:]]
+    cost = np.abs(curr[:, perms] - prev[:, None, :]).sum(axis=2)  # (M, P)
+    relative = np.argmin(cost, axis=1)
+
+    # 2) 상대 순열을 누적 합성 (합성표를 미리 만들어 정수 조회만 반복)
+    index = {tuple(p): k for k, p in enumerate(perms)}
+    compose = np.array(
+        [[index[tuple(p[q])] for q in perms] for p in perms]
+    )  # compose[a, b] = perms[a][perms[b]]
+    absolute = np.empty(valid.size, dtype=np.intp)
+    absolute[0] = index[tuple(range(n))]
+    for k, r in enumerate(relative.tolist()):
+        absolute[k + 1] = compose[absolute[k], r]
+
+    tracked = eigs.copy()
+    tracked[valid] = np.take_along_axis(eigs[valid], perms[absolute], axis=1)
+    return tracked
+
+
+def compute_root_locus(config, x_values, H=None, D=None):
+    """
+    X_line (및 선택적으로 H, D) sweep에 대한 고유값 궤적
+    반환: {"X_line", "H", "D": (N,) 파라미터, "eigs": (N, 2) 가지별로 정렬된 고유값}
+    """
+    A = get_linearized_matrix_batch(config, x_values, H, D)
+    x, h, d = _broadcast_sweep(config, x_values, H, D)
+    return {
+        "X_line": x,
+        "H": h,
+        "D": d,
+        "eigs": track_branches(eigvals_batch(A)),
+    }
+
+
+def plot_root_locus(config, x_values=None, save_path=None, show=True):
     print("--- Generating Root Locus Plot ---")
 
     # 임피던스(X)를 0.2(강함)에서 1.2(약함)까지 변화시킴
-    x_values = np.linspace(0.2, 1.2, 50)
-
-    plt.figure(figsize=(10, 8))
-
-    for x in x_values:
-        A = get_linearized_matrix(config, x)
-        if A is not None:
-            eigs = np.linalg.eigvals(A)
-
-            # [수정된 부분]
-            # 고유값 개수만큼 색상 값(x)을 리스트로 복제하여 개수를 맞춤
-            # vmin, vmax를 설정하여 루프 전체에서 색상 스케일 통일
-            colors = [x] * len(eigs)
-
-            plt.scatter(
-                eigs.real,
-                eigs.imag,
-                c=colors,
-                cmap="viridis",
-                vmin=x_values.min(),
-                vmax=x_values.max(),
-                s=30,
-                alpha=0.8,
-            )
+    if x_values is None:
+        x_values = np.linspace(0.2, 1.2, 2000)
+    x_values = np.asarray(x_values, dtype=float)
+
+    locus = compute_root_locus(config, x_values)
+    eigs = locus["eigs"]
+
+    fig = plt.figure(figsize=(10, 8))
+
+    # 모든 점을 한 번의 scatter 호출로 그림 (색상 = 해당 점의 X 값)
+    plt.scatter(
+        eigs.real.ravel(),
+        eigs.imag.ravel(),
+        c=np.repeat(locus["X_line"], eigs.shape[1]),
+        cmap="viridis",
+        vmin=x_values.min(),
+        vmax=x_values.max(),
+        s=10,
+        alpha=0.8,
+    )
 
     # 허수축(안정도 경계) 표시
     plt.axvline(x=0, color="k", linestyle="--", label="Stability Boundary")
@@ -82,4 +192,10 @@ def plot_root_locus(config):
     )
 
     print("--- Root Locus Generated ---")
-    plt.show()
+    if save_path is not None:
+        fig.savefig(save_path)
+    if show:
+        plt.show()
+    elif save_path is not None:
+        plt.close(fig)
+    return fig
@@ -1,14 +1,133 @@
 # models/gfl_model.py
+import bisect
+import numpy as np
+
+
+class SolarProfile:
+    """
+    측정된 일사량/태양광 출력 시계열 (시간 [s], 출력 [p.u.])
+    - 선형 보간, 범위 밖은 양 끝 값 유지
+    - 보간표(구간별 시작값과 기울기)를 생성 시 한 번만 계산
+    - 스칼라 조회(profile(t)): 등간격 데이터는 인덱스 계산으로 O(1),
+      비등간격 데이터는 이진 탐색 O(log N)
+    - 배열 조회(profile.evaluate(t_array)): searchsorted 기반 벡터화 계산
+
+    사용 예)
+        profile = SolarProfile.from_file("data/pv_day.csv", scale=1 / 1000.0)  # kW -> p.u.
+        cfg = profile.apply_to(Config(t_start=0.0, t_end=86400.0, steps=86401))
+    """
+
+    def __init__(self, times, values):
+        times = np.asarray(times, dtype=float).ravel()
+        values = np.asarray(values, dtype=float).ravel()
+        if times.size != values.size or times.size < 2:
+            raise ValueError("A solar profile needs at least two (time, value) pairs.")
+
+        order = np.argsort(times, kind="stable")
+        self.times = times[order]
+        self.values = values[order]
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("Solar profile times must be strictly increasing.")
+
+        # 보간표: 구간 k에서 P(t) = values[k] + slopes[k] * (t - times[k])
+        self.slopes = np.diff(self.values) / np.diff(self.times)
+
+        steps = np.diff(self.times)
+        self.uniform = bool(np.allclose(steps, steps[0], rtol=1e-9, atol=0.0))
+        self.t0 = float(self.times[0])
+        self.dt = float(steps[0])
+
+        # 스칼라 조회는 RHS 안에서 매번 호출되므로 numpy 인덱싱 대신 Python 리스트 사용
+        self._times = self.times.tolist()
+        self._values = self.values.tolist()
+        self._slopes = self.slopes.tolist()
+        self._last = len(self._times) - 1
+
+    @classmethod
+    def from_file(cls, path, time_column=0, value_column=1, dt=None, scale=1.0):
+        """
+        CSV 또는 .npy 파일에서 읽기
+        - 2열 이상: time_column, value_column 사용 (CSV 첫 줄의 머리글은 자동으로 건너뜀)
+        - 1열: dt [s] 간격의 등간격 출력값으로 간주 (dt 필수)
+        scale: 출력값에 곱할 배율 (예: kW -> p.u.)
+        """
+        if str(path).endswith(".npy"):
+            data = np.load(path)
+        else:
+            try:
+                data = np.loadtxt(path, delimiter=",")
+            except ValueError:
+                data = np.loadtxt(path, delimiter=",", skiprows=1)
+
+        if data.ndim == 1:
+            if dt is None:
+                raise ValueError("dt is required for a single-column solar profile.")
+            times = np.arange(data.size) * dt
+            values = data
+        else:
+            times = data[:, time_column]
+            values = data[:, value_column]
+        return cls(times, np.asarray(values) * scale)
+
+    def __call__(self, t):
+        """시각 t (스칼라)의 출력"""
+        if t <= self.t0:
+            return self._values[0]
+        if self.uniform:
+            k = int((t - self.t0) / self.dt)
+        else:
+            k = bisect.bisect_right(self._times, t) - 1
+        if k >= self._last:
+            return self._values[-1]
+        return self._values[k] + self._slopes[k] * (t - self._times[k])
+
+    def evaluate(self, t):
+        """시각 배열 t의 출력 (벡터화)"""
+        t = np.asarray(t, dtype=float)
+        k = np.searchsorted(self.times, t, side="right") - 1
+        k = np.clip(k, 0, self.slopes.size - 1)
+        inside = self.values[k] + self.slopes[k] * (t - self.times[k])
+        return np.where(
+            t <= self.times[0],
+            self.values[0],
+            np.where(t >= self.times[-1], self.values[-1], inside),
+        )
+
+    def apply_to(self, config):
+        """
+        이 시계열을 사용하는 설정 복사본을 반환
+        초기 평형점이 시계열의 시작값 기준이 되도록 P_solar_initial도 맞춰 줌
+        """
+        return config.replace(solar_profile=self, P_solar_initial=self(config.t_start))
 
 
 def get_solar_power(t, config):
     """
     시간 t에 따른 태양광(GFL) 출력 전력을 반환
-    5초(event_time)에 출력이 급격히 감소(Step Drop)하는 시나리오
+    config.solar_profile이 있으면 측정 시계열을 사용하고,
+    없으면 5초(event_time)에 출력이 급격히 감소(Step Drop)하는 시나리오
     """
+    profile = getattr(config, "solar_profile", None)
+    if profile is not None:
+        return profile(t)
+
     if t >= config.event_time:
         # 구름이 끼어 발전량이 뚝 떨어짐
         return config.P_solar_initial - config.P_solar_drop
     else:
         # 정상 발전 중
         return config.P_solar_initial
+
+
+def get_solar_power_array(t, config):
+    """get_solar_power의 벡터화 버전 (시각 배열 전체를 한 번에 계산)"""
+    t = np.asarray(t, dtype=float)
+    profile = getattr(config, "solar_profile", None)
+    if profile is not None:
+        return profile.evaluate(t)
+
+    return np.where(
+        t >= config.event_time,
+        config.P_solar_initial - config.P_solar_drop,
+        config.P_solar_initial,
+    )
@@ -58,3 +58,33 @@ def system_dynamics(y, t, config):
     )
 
     return [d_delta_dt, d_omega_dt]
+
+
+def system_dynamics_batch(y, t, params):
+    """
+    하이브리드 시스템 동역학의 배치(벡터화) 버전
+    y: 시나리오 N개의 상태를 교차 배치한 1차원 배열 [delta_0, omega_0, delta_1, omega_1, ...]
+    params: 길이 N 배열로 구성된 파라미터 딕셔너리 (batch_simulator.make_batch_params 참고)
+    """
+    delta = y[0::2]
+    omega = y[1::2]
+
+    # 시나리오별 이벤트 시간에 따른 태양광 출력 (get_solar_power의 벡터화)
+    P_solar = np.where(
+        t >= params["event_time"],
+        params["P_solar_initial"] - params["P_solar_drop"],
+        params["P_solar_initial"],
+    )
+
+    P_vsg_elec = (params["V_vsg"] * params["V_grid"] / params["X_line"]) * np.sin(delta)
+    current_load_imbalance = (params["P_load_total"] - P_solar) - P_vsg_elec
+
+    Omega_0 = params["Omega_0"]
+    dydt = np.empty_like(y)
+    dydt[0::2] = omega - Omega_0
+    dydt[1::2] = (
+        (1 / (2 * params["H"]))
+        * (current_load_imbalance - params["D"] * (omega - Omega_0) / Omega_0)
+        * Omega_0
+    )
+    return dydt
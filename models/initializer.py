@@ -0,0 +1,154 @@
+# models/initializer.py
+"""
+모델별 정상 상태(초기 평형점) 계산기
+
+외란 이전(t < event_time) 조건에서 rhs(y) = 0 을 만족하는 상태를 반환합니다.
+- swing / hybrid: 해석해 delta_0 = arcsin(P / P_max), omega = Omega_0
+- avm / detailed: linearizer.find_equilibrium (Newton 계열) 수치 해
+
+결과는 운전점(평형점에 영향을 주는 파라미터 값)별로 저장해 두고 재사용하므로
+H, D 등 동역학 파라미터만 바꾸는 반복 계산에서는 다시 풀지 않습니다.
+
+사용 예)
+    y0 = initial_state("hybrid", cfg)
+    y0 = initial_state("detailed", DetailedConfig())   # Black Start 과도 구간 생략
+"""
+
+import numpy as np
+from models.compiled_rhs import PARAM_LAYOUTS
+from models.linearizer import find_equilibrium
+from models.vsg_model import swing_equation
+from models.hybrid_system import system_dynamics
+from models.avm_system import voltage_dynamics
+
+# 외란 이전 분기를 선택하기 위한 시각 (t >= event_time 조건이 항상 거짓)
+PRE_EVENT = -np.inf
+
+# 평형점에 영향을 주지 않는 동역학 파라미터 (운전점 키에서 제외)
+# (관성/감쇠, 적분 게인, NVR 게인은 평형 조건(omega = Omega_0, 오차 = 0)에서 사라짐)
+_DYNAMIC_ONLY = {
+    "H",
+    "D",
+    "J",
+    "T_v",
+    "Kpv",
+    "Kiv",
+    "Kpc",
+    "Kic",
+    "K_nvr",
+    "use_proposed_control",
+}
+
+_CACHE = {}
+
+
+def equilibrium_angle(p_op, x_line, v_vsg=1.0, v_grid=1.0):
+    """
+    P = (V1*V2/X) * sin(delta) 의 안정 평형 위상각 delta_0 (배열 입력 지원)
+    평형점이 없는 경우(|P| > P_max)는 NaN
+    """
+    ratio = np.asarray(p_op, dtype=float) * np.asarray(x_line, dtype=float)
+    ratio = ratio / (np.asarray(v_vsg, dtype=float) * np.asarray(v_grid, dtype=float))
+    with np.errstate(invalid="ignore"):
+        return np.where(np.abs(ratio) <= 1.0, np.arcsin(np.clip(ratio, -1, 1)), np.nan)
+
+
+def _swing_state(config):
+    return [
+        float(
+            equilibrium_angle(config.P_ref, config.X_line, config.V_vsg, config.V_grid)
+        ),
+        config.Omega_0,
+    ]
+
+
+def _hybrid_state(config):
+    P_vsg_initial = config.P_load_total - config.P_solar_initial
+    delta_0 = equilibrium_angle(
+        P_vsg_initial, config.X_line, config.V_vsg, config.V_grid
+    )
+    return [float(delta_0), config.Omega_0]
+
+
+def _avm_guess(config):
+    # 무효전력 droop을 무시한 근사 (V = V_ref_base)에서 출발
+    delta = equilibrium_angle(
+        config.P_ref, config.X_line, config.V_ref_base, config.V_grid_normal
+    )
+    return [float(np.nan_to_num(delta)), config.Omega_0, config.V_ref_base]
+
+
+def _detailed_guess(config):
+    # 출력 전압 v_od = V_ref, 나머지 전류/적분기는 0에서 출발
+    y = np.zeros(12)
+    y[1] = config.w_base
+    y[8] = config.V_ref
+    return y
+
+
+def _detailed_rhs():
+    # step12_detailed_vsg는 최상위 스크립트이므로 필요할 때만 import
+    from step12_detailed_vsg import detailed_dynamics
+
+    return detailed_dynamics
+
+
+def _detailed_sparsity():
+    from step12_detailed_vsg import JACOBIAN_SPARSITY
+
+    return JACOBIAN_SPARSITY
+
+
+# 모델 이름 -> (rhs 반환 함수, 해석해 또는 None, 수치해 초기 추정값, Jacobian 희소 구조)
+MODELS = {
+    "swing": (lambda: swing_equation, _swing_state, None, None),
+    "hybrid": (lambda: system_dynamics, _hybrid_state, None, None),
+    "avm": (lambda: voltage_dynamics, None, _avm_guess, None),
+    "detailed": (_detailed_rhs, None, _detailed_guess, _detailed_sparsity),
+}
+
+
+def operating_point_key(model, config):
+    """평형점을 결정하는 파라미터 값만 모은 키 (H, D 등 동역학 파라미터는 제외)"""
+    return (model,) + tuple(
+        float(getattr(config, name))
+        for name in PARAM_LAYOUTS[model]
+        if name not in _DYNAMIC_ONLY and name != "event_time"
+    )
+
+
+def initial_state(model, config):
+    """
+    외란 이전 정상 상태 [상태 벡터]를 반환 (운전점별로 한 번만 계산)
+    model: "swing", "hybrid", "avm", "detailed"
+    평형점이 없으면 ValueError
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}' (expected one of {list(MODELS)})")
+
+    key = operating_point_key(model, config)
+    if key not in _CACHE:
+        get_rhs, closed_form, guess, sparsity = MODELS[model]
+        if closed_form is not None:
+            y = np.asarray(closed_form(config), dtype=float)
+            converged = bool(np.all(np.isfinite(y)))
+        else:
+            y, converged = find_equilibrium(
+                get_rhs(),
+                guess(config),
+                config,
+                PRE_EVENT,
+                sparsity=sparsity() if sparsity else None,
+            )
+        if not converged:
+            raise ValueError(
+                f"No steady state found for the '{model}' model at this operating point "
+                "(the power transfer may exceed P_max)."
+            )
+        _CACHE[key] = y
+
+    return _CACHE[key].copy()
+
+
+def clear_cache():
+    _CACHE.clear()
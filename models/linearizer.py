@@ -0,0 +1,189 @@
+# models/linearizer.py
+"""
+임의의 동역학 함수 rhs(y, t, config)에 대한 수치 선형화 (소신호 해석)
+
+1. find_equilibrium: rhs(y) = 0 을 만족하는 평형점 계산
+2. jacobian: 평형점에서 상태 행렬 A = d(rhs)/dy
+   - "complex": 복소 스텝 미분 (상쇄 오차가 없어 기계 정밀도 수준)
+   - "central": 중앙 차분
+   sparsity(희소 구조)를 주면 서로 겹치지 않는 열을 묶어(coloring) 한 번에 섭동하므로
+   rhs 호출 수가 상태 수보다 적어집니다.
+3. analyze / analyze_batch: 고유값과 참여 계수(participation factor)
+
+사용 예) NVR 게인에 따른 AVM 모델의 고유값
+    result = analyze_batch(
+        voltage_dynamics, cfg, [0.0, cfg.Omega_0, 1.0],
+        use_proposed_control=True, K_nvr=np.linspace(0, 1, 50),
+    )
+"""
+
+import numpy as np
+from scipy.optimize import fsolve
+from models.scenario import with_overrides
+
+# 이벤트가 모두 적용된 이후의 운전점에서 선형화 (t >= event_time 분기)
+POST_EVENT = np.inf
+
+
+def color_columns(sparsity):
+    """
+    Jacobian 희소 구조(n x n bool)에서 같은 행을 공유하지 않는 열끼리 묶음 (greedy coloring)
+    반환: 색상별 열 인덱스 배열의 리스트
+    """
+    sparsity = np.asarray(sparsity, dtype=bool)
+    n = sparsity.shape[1]
+    groups = []
+    rows_used = []
+    for j in range(n):
+        for group, used in zip(groups, rows_used):
+            if not np.any(used & sparsity[:, j]):
+                group.append(j)
+                used |= sparsity[:, j]
+                break
+        else:
+            groups.append([j])
+            rows_used.append(sparsity[:, j].copy())
+    return [np.array(group) for group in groups]
+
+
+def jacobian(rhs, y, config, t=POST_EVENT, method="complex", sparsity=None, eps=None):
+    """
+    상태 y에서 rhs의 Jacobian (n x n)
+    method: "complex" (rhs가 복소수 입력을 지원해야 함) 또는 "central"
+    sparsity: 0이 아닐 수 있는 원소 위치 (생략 시 dense로 간주)
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if sparsity is None:
+        sparsity = np.ones((n, n), dtype=bool)
+    sparsity = np.asarray(sparsity, dtype=bool)
+
+    if method == "complex":
+        # 복소 스텝은 뺄셈이 없으므로 스텝을 매우 작게 잡아도 됨
+        step = np.full(n, 1e-20 if eps is None else eps)
+    elif method == "central":
+        step = (6e-6 if eps is None else eps) * np.maximum(1.0, np.abs(y))
+    else:
+        raise ValueError(f"Unknown method '{method}' (expected 'complex' or 'central')")
+
+    jac = np.zeros((n, n))
+    for group in color_columns(sparsity):
+        perturb = np.zeros(n)
+        perturb[group] = step[group]
+
+        if method == "complex":
+            f = np.asarray(rhs(y + 1j * perturb, t, config), dtype=complex)
+            derivative = f.imag
+        else:
+            f_plus = np.asarray(rhs(y + perturb, t, config), dtype=float)
+            f_minus = np.asarray(rhs(y - perturb, t, config), dtype=float)
+            derivative = (f_plus - f_minus) / 2
+
+        # 같은 색상의 열들은 서로 다른 행에만 영향을 주므로 희소 구조로 분리
+        for j in group:
+            rows = sparsity[:, j]
+            jac[rows, j] = derivative[rows] / step[j]
+    return jac
+
+
+def find_equilibrium(
+    rhs, y_guess, config, t=POST_EVENT, method="complex", sparsity=None, tol=1e-9
+):
+    """
+    rhs(y, t, config) = 0 인 평형점을 y_guess에서 출발하여 계산 (fsolve + 수치 Jacobian)
+    반환: (y_eq, converged)
+    """
+    y_eq, info, ier, _ = fsolve(
+        lambda y: np.asarray(rhs(y, t, config), dtype=float),
+        np.asarray(y_guess, dtype=float),
+        fprime=lambda y: jacobian(rhs, y, config, t, method, sparsity),
+        full_output=True,
+        xtol=1e-12,
+    )
+    converged = ier == 1 and np.max(np.abs(info["fvec"])) < tol
+    return y_eq, bool(converged)
+
+
+def participation_factors(A):
+    """
+    상태 행렬 A (n x n 또는 (N, n, n))의 고유값과 참여 계수
+    p[k, i] = |v_ki * w_ik| / sum_k |v_ki * w_ik|  (v: 우고유벡터, w: 좌고유벡터)
+    반환: (eigs (..., n), participation (..., n_states, n_modes))
+    """
+    eigs, right = np.linalg.eig(A)
+    left = np.linalg.inv(right)
+    p = np.abs(right * np.swapaxes(left, -1, -2))
+    return eigs, p / p.sum(axis=-2, keepdims=True)
+
+
+def analyze(rhs, config, y_guess, t=POST_EVENT, method="complex", sparsity=None):
+    """
+    평형점 계산 -> 선형화 -> 고유값/참여 계수
+    반환: {"y_eq", "converged", "A", "eigs", "participation"}
+    """
+    y_eq, converged = find_equilibrium(rhs, y_guess, config, t, method, sparsity)
+    A = jacobian(rhs, y_eq, config, t, method, sparsity)
+    eigs, participation = participation_factors(A)
+    return {
+        "y_eq": y_eq,
+        "converged": converged,
+        "A": A,
+        "eigs": eigs,
+        "participation": participation,
+    }
+
+
+def analyze_batch(
+    rhs, config, y_guess, t=POST_EVENT, method="complex", sparsity=None, **overrides
+):
+    """
+    파라미터 집합 N개에 대한 소신호 해석
+    overrides: config 속성 이름 -> 스칼라 또는 길이 N 배열 (서로 브로드캐스트)
+    각 점의 평형점은 직전 점의 평형점에서 출발하여 계산(warm start)하고,
+    고유값/참여 계수는 (N, n, n) 행렬을 쌓아 한 번에 계산합니다.
+    수렴하지 않은 점의 결과는 NaN입니다.
+    반환: {overrides 이름: (N,), "y_eq": (N, n), "converged": (N,), "A": (N, n, n),
+           "eigs": (N, n), "participation": (N, n, n)}
+    """
+    names = list(overrides)
+    values = np.broadcast_arrays(*(np.atleast_1d(overrides[k]) for k in names))
+    n_points = values[0].size if values else 1
+    values = [v.ravel() for v in values]
+
+    y_guess = np.asarray(y_guess, dtype=float)
+    n = y_guess.size
+    y_eq = np.full((n_points, n), np.nan)
+    A = np.full((n_points, n, n), np.nan)
+    converged = np.zeros(n_points, dtype=bool)
+
+    guess = y_guess
+    for i in range(n_points):
+        point = with_overrides(
+            config, **{k: v[i].item() for k, v in zip(names, values)}
+        )
+        y, ok = find_equilibrium(rhs, guess, point, t, method, sparsity)
+        if not ok:
+            # warm start가 다른 가지로 빠졌을 수 있으므로 원래 초기값으로 재시도
+            y, ok = find_equilibrium(rhs, y_guess, point, t, method, sparsity)
+        if ok:
+            y_eq[i] = y
+            A[i] = jacobian(rhs, y, point, t, method, sparsity)
+            converged[i] = True
+            guess = y
+
+    eigs = np.full((n_points, n), np.nan, dtype=complex)
+    participation = np.full((n_points, n, n), np.nan)
+    if converged.any():
+        eigs[converged], participation[converged] = participation_factors(A[converged])
+
+    result = dict(zip(names, values))
+    result.update(
+        {
+            "y_eq": y_eq,
+            "converged": converged,
+            "A": A,
+            "eigs": eigs,
+            "participation": participation,
+        }
+    )
+    return result
@@ -0,0 +1,248 @@
+# models/metrics.py
+"""
+시뮬레이션 결과 지표 계산 (단일 궤적 (T, n) 또는 배치 (N, T, n) 모두 지원)
+
+- 주파수: nadir, t_nadir, peak, overshoot, rocof, settling_time
+- 전력/전압: P_min, P_max, Q_min, Q_max, V_min, V_max
+
+모든 지표를 시간 축을 chunk_size개 샘플씩 한 번만 훑으며 함께 계산합니다.
+- 상태 배열은 복사하지 않고 구간 뷰(view)로 읽음 (np.memmap 결과도 그대로 사용 가능)
+- 임시 배열은 (..., chunk_size) 크기의 고정 버퍼뿐이므로 궤적 길이 T와 무관
+- 주파수 배열을 따로 만들지 않고 omega [rad/s] 상태 열에서 바로 계산한 뒤 스칼라 지표만 Hz로 변환
+- hybrid 모델의 전압은 상수 V_vsg이므로 배열을 만들지 않음
+스윕 결과는 궤적 대신 compute_metrics가 반환하는 지표 표(이름 -> (N,) 배열)로 다루면 됩니다.
+
+사용 예)
+    t, sol = simulate_hybrid_batch(cfg, H=h_values)
+    table = compute_metrics(t, sol, cfg, model="hybrid")
+    write_csv("results/sweep.csv", table, H=h_values)
+"""
+
+import numpy as np
+
+# 정착 시간 판정 기본 대역 [Hz]
+DEFAULT_SETTLING_BAND = 0.02
+
+# 한 번에 처리하는 시간 샘플 수 (임시 버퍼 크기)
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def nominal_omega(config):
+    # DetailedConfig는 Omega_0 대신 w_base를 사용
+    return getattr(config, "Omega_0", None) or config.w_base
+
+
+# ==========================================
+# 1. 유효/무효 전력 및 전압 (모델별)
+# ==========================================
+def _avm_grid_voltage(t, config):
+    return np.where(t >= config.event_time, config.V_grid_fault, config.V_grid_normal)
+
+
+def _power(model, t, sol, config):
+    """power_outputs와 같으나 hybrid 모델의 V는 None (상수 V_vsg)"""
+    if model == "hybrid":
+        delta = sol[..., 0]
+        P_max = config.V_vsg * config.V_grid / config.X_line
+        P = P_max * np.sin(delta)
+        Q = config.V_vsg**2 / config.X_line - P_max * np.cos(delta)
+        V = None
+    elif model == "avm":
+        delta, V = sol[..., 0], sol[..., 2]
+        V_grid = _avm_grid_voltage(t, config)
+        P = (V * V_grid / config.X_line) * np.sin(delta)
+        Q = (V**2 / config.X_line) - (V * V_grid / config.X_line) * np.cos(delta)
+    elif model == "detailed":
+        v_od, v_oq, i_gd, i_gq = (sol[..., k] for k in (8, 9, 10, 11))
+        P = v_od * i_gd + v_oq * i_gq
+        Q = v_oq * i_gd - v_od * i_gq
+        V = np.hypot(v_od, v_oq)
+    else:
+        raise ValueError(
+            f"Unknown model '{model}' (expected 'hybrid', 'avm' or 'detailed')"
+        )
+    return P, Q, V
+
+
+def power_outputs(model, t, sol, config):
+    """
+    상태 궤적에서 유효/무효 전력 P, Q와 단자 전압 V를 계산 (sol: (..., T, n))
+    반환: (P, Q, V) - 각 (..., T) 배열 (hybrid 모델의 V는 상수 V_vsg)
+    """
+    P, Q, V = _power(model, t, sol, config)
+    if V is None:
+        V = np.full(P.shape, float(config.V_vsg))
+    return P, Q, V
+
+
+# ==========================================
+# 2. 구간별 누적 (한 번의 시간 축 순회)
+# ==========================================
+def _update_min(best, index, values, offset):
+    """구간 values (..., m)의 최솟값으로 누적 최솟값/위치 갱신 (NaN은 np.argmin처럼 우선)"""
+    i = np.argmin(values, axis=-1)
+    value = np.take_along_axis(values, i[..., None], axis=-1)[..., 0]
+    better = (value < best) | (np.isnan(value) & ~np.isnan(best))
+    return np.where(better, value, best), np.where(better, i + offset, index)
+
+
+def _scan(t, sol, config, model, settling_band, chunk_size):
+    """
+    sol: (..., T, n) 궤적 (omega는 1번 상태)
+    model이 None이 아니면 P/Q/V 최솟값/최댓값도 같은 순회에서 계산
+    반환: 지표 딕셔너리 (각 (...,) 배열)
+    """
+    omega = sol[..., 1]
+    shape = omega.shape[:-1]
+    T = t.size
+    Omega_0 = nominal_omega(config)
+    band = settling_band * 2 * np.pi
+    first = int(np.searchsorted(t, config.event_time, side="left"))
+
+    omega_min = np.full(shape, np.inf)
+    i_min = np.zeros(shape, dtype=np.intp)
+    omega_max = np.full(shape, -np.inf)
+    slope_max = np.full(shape, -np.inf)
+    last_outside = np.full(shape, -1, dtype=np.intp)
+    outside_at_end = np.zeros(shape, dtype=bool)
+    extrema = {}
+    if model is not None:
+        for name in ("P", "Q", "V"):
+            extrema[f"{name}_min"] = np.full(shape, np.inf)
+            extrema[f"{name}_max"] = np.full(shape, -np.inf)
+
+    # 고정 크기 버퍼 (차분 / 정착 판정용)
+    buffer = np.empty(shape + (min(chunk_size, max(T, 1)),))
+    mask = np.empty(buffer.shape, dtype=bool)
+
+    for a in range(0, T, chunk_size):
+        b = min(a + chunk_size, T)
+        part = omega[..., a:b]
+
+        omega_min, i_min = _update_min(omega_min, i_min, part, a)
+        np.maximum(omega_max, np.max(part, axis=-1), out=omega_max)
+
+        # RoCoF: 이전 구간의 마지막 샘플부터 차분
+        lo = max(a - 1, 0)
+        m = b - lo - 1
+        if m > 0:
+            slope = buffer[..., :m]
+            np.subtract(omega[..., lo + 1 : b], omega[..., lo : b - 1], out=slope)
+            slope /= np.diff(t[lo:b])
+            np.abs(slope, out=slope)
+            np.maximum(slope_max, np.max(slope, axis=-1), out=slope_max)
+
+        # 정착 시간: 이벤트 이후 샘플 중 대역 밖인 마지막 위치
+        start = max(a, first)
+        m = b - start
+        if m > 0:
+            deviation = buffer[..., :m]
+            np.subtract(omega[..., start:b], Omega_0, out=deviation)
+            np.abs(deviation, out=deviation)
+            outside = mask[..., :m]
+            np.greater(deviation, band, out=outside)
+            last = m - 1 - np.argmax(outside[..., ::-1], axis=-1)
+            last_outside = np.where(outside.any(axis=-1), start + last, last_outside)
+            if b == T:
+                outside_at_end = outside[..., -1].copy()
+
+        if model is not None:
+            P, Q, V = _power(model, t[a:b], sol[..., a:b, :], config)
+            for name, values in (("P", P), ("Q", Q), ("V", V)):
+                if values is None:
+                    continue
+                np.minimum(
+                    extrema[f"{name}_min"],
+                    np.min(values, axis=-1),
+                    out=extrema[f"{name}_min"],
+                )
+                np.maximum(
+                    extrema[f"{name}_max"],
+                    np.max(values, axis=-1),
+                    out=extrema[f"{name}_max"],
+                )
+
+    to_hz = 1 / (2 * np.pi)
+    if first < T:
+        settling_time = np.where(
+            last_outside >= 0, t[np.maximum(last_outside, 0)] - config.event_time, 0.0
+        )
+        settling_time = np.where(outside_at_end, np.nan, settling_time)
+    else:
+        settling_time = np.zeros(shape)
+
+    metrics = {
+        "nadir": omega_min * to_hz,
+        "t_nadir": t[i_min],
+        "peak": omega_max * to_hz,
+        "overshoot": (omega_max - Omega_0) * to_hz,
+        "rocof": slope_max * to_hz if T > 1 else np.full(shape, np.nan),
+        "settling_time": settling_time,
+    }
+    if model == "hybrid":
+        extrema["V_min"] = np.full(shape, float(config.V_vsg))
+        extrema["V_max"] = np.full(shape, float(config.V_vsg))
+    metrics.update(extrema)
+    # 단일 궤적이면 스칼라로 반환
+    return {name: value[()] for name, value in metrics.items()}
+
+
+# ==========================================
+# 3. 지표
+# ==========================================
+def frequency_metrics(
+    t, omega, config, settling_band=DEFAULT_SETTLING_BAND, chunk_size=None
+):
+    """
+    omega: (..., T) 각속도 [rad/s]
+    반환 (각 (...,) 배열):
+      nadir [Hz], t_nadir [s], peak [Hz], overshoot [Hz] (peak - 정격),
+      rocof [Hz/s] (최대 |df/dt|),
+      settling_time [s] (이벤트 이후 |f - 정격|이 band를 마지막으로 벗어난 시각 - 이벤트 시각,
+                         벗어난 적이 없으면 0, 끝까지 대역 밖이면 NaN)
+    """
+    omega = np.asarray(omega, dtype=float)
+    # (..., T) -> (..., T, 2) 뷰: 1번 상태가 omega가 되도록 (복사 없음)
+    sol = np.lib.stride_tricks.as_strided(
+        omega, shape=omega.shape + (2,), strides=omega.strides + (0,), writeable=False
+    )
+    return _scan(
+        np.asarray(t, dtype=float),
+        sol,
+        config,
+        None,
+        settling_band,
+        chunk_size or DEFAULT_CHUNK_SIZE,
+    )
+
+
+def compute_metrics(
+    t,
+    sol,
+    config,
+    model="hybrid",
+    settling_band=DEFAULT_SETTLING_BAND,
+    chunk_size=None,
+):
+    """
+    sol: (T, n) 또는 (N, T, n) 궤적 (omega는 1번 상태)
+    model: "hybrid", "avm", "detailed" (P/Q/V 계산 방식), None이면 주파수 지표만
+    chunk_size: 한 번에 처리하는 시간 샘플 수 (기본 DEFAULT_CHUNK_SIZE)
+    반환: {지표 이름: 스칼라 또는 (N,) 배열}
+    """
+    return _scan(
+        np.asarray(t, dtype=float),
+        np.asarray(sol),
+        config,
+        model,
+        settling_band,
+        chunk_size or DEFAULT_CHUNK_SIZE,
+    )
+
+
+def write_csv(path, table, **columns):
+    """지표 표(와 스윕 파라미터 columns)를 CSV로 저장"""
+    table = {**columns, **table}
+    names = list(table)
+    data = np.column_stack([np.ravel(table[name]) for name in names])
+    np.savetxt(path, data, delimiter=",", header=",".join(names), comments="")
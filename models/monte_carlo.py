@@ -0,0 +1,279 @@
+# models/monte_carlo.py
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from scipy.stats import norm
+from models.batch_simulator import simulate_hybrid_batch, simulate_avm_batch
+from models.metrics import compute_metrics
+
+# 지표별 기본 히스토그램 범위 (하한, 상한, 구간 수)
+DEFAULT_BINS = {
+    "nadir": (58.0, 62.0, 4000),
+    "peak": (58.0, 62.0, 4000),
+    "rocof": (0.0, 20.0, 4000),
+    "V_min": (0.0, 2.0, 4000),
+    "V_max": (0.0, 2.0, 4000),
+}
+
+# avm_system에는 P_load_total이 없으므로 VSG가 담당하는 부하(P_ref)로 대응
+_AVM_ALIASES = {"P_load_total": "P_ref"}
+
+
+class StreamingStats:
+    """
+    샘플을 저장하지 않고 누적 통계만 유지하는 집계기 (메모리 사용량 일정)
+    - 고정 구간 히스토그램 (범위 밖 값은 underflow / overflow로 계수)
+    - 개수, 평균, 분산, 최소/최대
+    - 임계값 미만 비율 (Exceedance Probability)
+    - NaN(평형점 없음 등 무효 샘플) 개수
+    """
+
+    def __init__(self, low, high, n_bins, thresholds=()):
+        self.edges = np.linspace(low, high, n_bins + 1)
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.n = 0
+        self.n_invalid = 0
+        # 평균과 편차 제곱합 (Welford / Chan 방식으로 누적하여 상쇄 오차 방지)
+        self.running_mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.thresholds = tuple(float(x) for x in thresholds)
+        self.below = np.zeros(len(self.thresholds), dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        invalid = np.isnan(values)
+        self.n_invalid += int(invalid.sum())
+        values = values[~invalid]
+        if values.size == 0:
+            return
+
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+        self._combine(values.size, chunk_mean, chunk_m2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+        self.counts += np.histogram(values, self.edges)[0]
+
+        for i, threshold in enumerate(self.thresholds):
+            self.below[i] += int((values < threshold).sum())
+
+    def _combine(self, n, mean, m2):
+        """(개수, 평균, 편차 제곱합) 묶음을 누적값에 합침 (Chan의 병렬 분산 공식)"""
+        if n == 0:
+            return
+        n_total = self.n + n
+        delta = mean - self.running_mean
+        self.running_mean += delta * n / n_total
+        self.m2 += m2 + delta**2 * self.n * n / n_total
+        self.n = n_total
+
+    def merge(self, other):
+        """같은 설정으로 만든 다른 집계기(병렬 작업 결과)를 합침"""
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self._combine(other.n, other.running_mean, other.m2)
+        self.n_invalid += other.n_invalid
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.below += other.below
+        return self
+
+    @property
+    def mean(self):
+        return self.running_mean if self.n else np.nan
+
+    @property
+    def std(self):
+        if self.n < 2:
+            return np.nan
+        return float(np.sqrt(self.m2 / (self.n - 1)))
+
+    def quantile(self, q):
+        """
+        히스토그램 누적 분포를 선형 보간하여 분위수 계산 (정확도: 구간 폭)
+        범위 밖에 해당하는 분위수는 관측된 최소/최대값으로 대체
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+
+        cdf = (self.underflow + np.concatenate(([0], np.cumsum(self.counts)))) / self.n
+        result = np.interp(q, cdf, self.edges)
+        result[q * self.n <= self.underflow] = self.min
+        result[q * self.n > self.n - self.overflow] = self.max
+        return result
+
+    @property
+    def invalid_fraction(self):
+        """무효 샘플(발산, 평형점 없음) 비율"""
+        n_total = self.n + self.n_invalid
+        return self.n_invalid / n_total if n_total else np.nan
+
+    def exceedance(self, invalid_as_exceeded=True):
+        """
+        {임계값: P(값 < 임계값)} - 분모는 무효 샘플을 포함한 전체 샘플 수
+        invalid_as_exceeded=True: 무효 샘플(가장 나쁜 결과)을 임계값 위반으로 계수 (보수적)
+        """
+        n_total = self.n + self.n_invalid
+        if n_total == 0:
+            return {threshold: np.nan for threshold in self.thresholds}
+        invalid = self.n_invalid if invalid_as_exceeded else 0
+        return {t: (b + invalid) / n_total for t, b in zip(self.thresholds, self.below)}
+
+
+def _sample(distributions, n, method, rng):
+    """
+    distributions: {이름: ("uniform", 하한, 상한) | ("normal", 평균, 표준편차)
+                          | ("lognormal", log-평균, log-표준편차)}
+    method: "lhs" (라틴 하이퍼큐브) 또는 "mc" (단순 무작위)
+    """
+    samples = {}
+    for name, (kind, a, b) in distributions.items():
+        if method == "lhs":
+            # 각 차원을 n개의 등확률 구간으로 나누고 구간마다 하나씩 뽑은 뒤 순서를 섞음
+            u = (rng.permutation(n) + rng.random(n)) / n
+        else:
+            u = rng.random(n)
+
+        if kind == "uniform":
+            samples[name] = a + (b - a) * u
+        elif kind == "normal":
+            samples[name] = norm.ppf(u, loc=a, scale=b)
+        elif kind == "lognormal":
+            samples[name] = np.exp(norm.ppf(u, loc=a, scale=b))
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for {name}")
+    return samples
+
+
+def _chunk_metrics(config, model, samples):
+    """시나리오 묶음 하나를 적분하고 지표 배열만 반환 (궤적은 버림)"""
+    if model == "hybrid":
+        t, sol = simulate_hybrid_batch(config, **samples)
+    elif model == "avm":
+        samples = {_AVM_ALIASES.get(k, k): v for k, v in samples.items()}
+        t, sol = simulate_avm_batch(config, **samples)
+    else:
+        raise ValueError(f"Unknown model '{model}' (expected 'hybrid' or 'avm')")
+
+    metrics = compute_metrics(t, sol, config, model if model == "avm" else None)
+    names = ("nadir", "peak", "rocof") + (("V_min", "V_max") if model == "avm" else ())
+    return {name: metrics[name] for name in names}
+
+
+def _new_stats(metric_names, bins, thresholds):
+    return {
+        name: StreamingStats(
+            *bins.get(name, DEFAULT_BINS[name]), thresholds.get(name, ())
+        )
+        for name in metric_names
+    }
+
+
+def _run_chunk(config, model, distributions, n, method, seed, bins, thresholds):
+    """프로세스 풀 작업 단위: 표본 생성 -> 적분 -> 부분 집계 반환"""
+    rng = np.random.default_rng(seed)
+    samples = _sample(distributions, n, method, rng)
+    metrics = _chunk_metrics(config, model, samples)
+
+    stats = _new_stats(metrics, bins, thresholds)
+    for name, values in metrics.items():
+        stats[name].update(values)
+    return stats
+
+
+def run_monte_carlo(
+    config,
+    distributions,
+    n_samples,
+    model="hybrid",
+    method="lhs",
+    chunk_size=2000,
+    workers=None,
+    seed=0,
+    thresholds=None,
+    bins=None,
+):
+    """
+    파라미터 불확실성에 대한 Monte Carlo / 라틴 하이퍼큐브 해석
+    distributions: {"X_line": ("normal", 0.5, 0.05), "H": ("uniform", 2.0, 6.0), ...}
+    thresholds: {"nadir": [59.2, 59.5]} -> P(nadir < 59.2), P(nadir < 59.5) 계산
+    bins: 지표별 히스토그램 범위 {"nadir": (하한, 상한, 구간 수)} (DEFAULT_BINS 대체)
+
+    표본은 chunk_size 단위로 생성/적분/집계되며, 동시에 처리 중인 묶음 수를 제한하므로
+    전체 메모리 사용량은 n_samples와 무관합니다.
+    (LHS는 묶음 단위로 층화되므로 묶음 내부에서 층화 효과를 가짐)
+    반환: {지표 이름: StreamingStats}
+    """
+    thresholds = thresholds or {}
+    bins = bins or {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = (
+        (config, model, distributions, n, method, s, bins, thresholds)
+        for n, s in zip(sizes, seeds)
+    )
+
+    result = None
+
+    def collect(partial):
+        nonlocal result
+        if result is None:
+            result = partial
+        else:
+            for name, stats in partial.items():
+                result[name].merge(stats)
+
+    if workers == 1:
+        for job in jobs:
+            collect(_run_chunk(*job))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(_run_chunk, *job))
+            # 대기 중인 작업 수를 제한하여 메모리 사용량을 일정하게 유지
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+        for future in pending:
+            collect(future.result())
+
+    return result
+
+
+def print_summary(result, quantiles=(0.001, 0.01, 0.05, 0.5, 0.95, 0.99)):
+    """run_monte_carlo 결과 요약 출력"""
+    print("--- Monte Carlo Summary ---")
+    for name, stats in result.items():
+        q = stats.quantile(quantiles)
+        print(
+            f"[{name}] n={stats.n} (invalid {stats.n_invalid}), "
+            f"mean={stats.mean:.4f}, std={stats.std:.4f}, "
+            f"min={stats.min:.4f}, max={stats.max:.4f}"
+        )
+        print(
+            "   quantiles: "
+            + ", ".join(f"q{p:g}={v:.4f}" for p, v in zip(quantiles, q))
+        )
+        for threshold, p in stats.exceedance().items():
+            print(
+                f"   P({name} < {threshold:g}) = {p:.6f} "
+                f"(invalid samples counted as exceeded: "
+                f"{stats.invalid_fraction:.6f})"
+            )
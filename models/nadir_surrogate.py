@@ -0,0 +1,181 @@
+# models/nadir_surrogate.py
+import numpy as np
+from models.eigen_analysis import get_synchronizing_coefficient
+from models.batch_simulator import simulate_hybrid_batch
+from models.optimizer import find_optimal_inertia
+
+
+def _peak_time_factor(zeta):
+    """
+    2차 시스템 임펄스 응답의 첫 극값까지 걸리는 무차원 시간 phi(zeta) = omega_n * t_peak
+    - 부족 감쇠 (zeta < 1): arccos(zeta) / sqrt(1 - zeta^2)
+    - 과감쇠   (zeta > 1): arccosh(zeta) / sqrt(zeta^2 - 1)
+    - 임계 감쇠 (zeta = 1): 1
+    """
+    zeta = np.asarray(zeta, dtype=float)
+    phi = np.ones_like(zeta)
+
+    under = zeta < 1.0 - 1e-9
+    over = zeta > 1.0 + 1e-9
+    z = zeta[under]
+    phi[under] = np.arccos(z) / np.sqrt(1.0 - z**2)
+    z = zeta[over]
+    phi[over] = np.arccosh(z) / np.sqrt(z**2 - 1.0)
+    return phi
+
+
+def surrogate_nadir(config, H=None, D=None, X_line=None, P_step=None):
+    """
+    하이브리드 모델(hybrid_system)의 선형화 2차 근사로 주파수 Nadir/RoCoF를 계산합니다.
+    H, D, X_line, P_step(= P_solar_drop)은 스칼라 또는 배열 (서로 브로드캐스트)
+    생략한 값은 config에서 가져옵니다.
+
+    이벤트 직전 운전점(delta_0)에서 선형화하면 (x = delta - delta_0, w = omega - Omega_0)
+      x'' + (D/2H) x' + (Omega_0*K_s/2H) x = Omega_0*dP/(2H)
+      omega_n^2 = Omega_0*K_s/(2H),  zeta = D / (4H*omega_n)
+    이고 w(t) = (dP/K_s) * omega_n^2 * h(t) (h: 2차 시스템 임펄스 응답) 입니다.
+
+    * hybrid_system의 부호 규약상 태양광 감소(dP > 0)는 주파수를 먼저 올리므로
+      Nadir는 h(t)의 두 번째 극값(첫 번째 언더슛)이며, 부족 감쇠일 때만 존재합니다.
+        min(w) = -(dP/K_s) * omega_n * exp(-zeta * (arccos(zeta) + pi) / sqrt(1 - zeta^2))
+      dP < 0 이면 첫 번째 극값이 Nadir입니다.
+        min(w) = -(|dP|/K_s) * omega_n * exp(-zeta * phi(zeta))
+    반환: {"nadir" [Hz], "t_nadir" [s, 절대 시각, 언더슛이 없으면 NaN], "rocof" [Hz/s]}
+    """
+    H = np.asarray(config.H if H is None else H, dtype=float)
+    D = np.asarray(config.D if D is None else D, dtype=float)
+    X_line = np.asarray(config.X_line if X_line is None else X_line, dtype=float)
+    P_step = np.asarray(config.P_solar_drop if P_step is None else P_step, dtype=float)
+    H, D, X_line, P_step = np.broadcast_arrays(H, D, X_line, P_step)
+    Omega_0 = config.Omega_0
+
+    # 이벤트 직전 VSG 분담 전력 기준 동기화 계수 (eigen_analysis와 동일한 K_s)
+    P_vsg_initial = config.P_load_total - config.P_solar_initial
+    K_s = get_synchronizing_coefficient(
+        P_vsg_initial, X_line, config.V_vsg, config.V_grid
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        omega_n = np.sqrt(Omega_0 * K_s / (2 * H))
+        zeta = D / (4 * H * omega_n)
+        gain = np.abs(P_step) / K_s * omega_n
+
+        # 첫 번째 극값 (dP < 0 일 때의 Nadir)
+        phi_first = _peak_time_factor(zeta)
+        dw_first = gain * np.exp(-zeta * phi_first)
+
+        # 두 번째 극값 (dP > 0 일 때의 Nadir, 부족 감쇠에서만 존재)
+        root = np.sqrt(1.0 - zeta**2)
+        phi_second = (np.arccos(np.clip(zeta, -1.0, 1.0)) + np.pi) / root
+        dw_second = np.where(zeta < 1.0, gain * np.exp(-zeta * phi_second), 0.0)
+
+        rising = P_step > 0
+        dw_min = np.where(rising, dw_second, dw_first)
+        t_peak = np.where(rising, phi_second, phi_first) / omega_n
+
+    nadir = config.F_base - dw_min / (2 * np.pi)
+    t_nadir = np.where(dw_min > 0, config.event_time + t_peak, np.nan)
+
+    # 이벤트 직후(t=0+) RoCoF: |d(omega)/dt| = Omega_0 * |dP| / (2H)
+    rocof = np.abs(Omega_0 * P_step / (2 * H)) / (2 * np.pi)
+
+    return {"nadir": nadir, "t_nadir": t_nadir, "rocof": rocof}
+
+
+def refine_near_threshold(
+    config, safety_threshold=59.2, band=0.05, H=None, D=None, X_line=None, P_step=None
+):
+    """
+    모든 (H, D, X_line, P_step) 조합을 대리 모델로 평가한 뒤,
+    Nadir가 임계값 ± band [Hz] 안에 있는 점만 비선형 배치 시뮬레이션으로 재계산합니다.
+    반환: {"nadir", "surrogate_nadir", "refined"(bool mask), "passed"(bool mask),
+           "error": {"n_refined", "max_abs", "mean_abs", "bias"}}
+    error는 재계산한 점에서의 (대리 모델 - 비선형 시뮬레이션) 오차 [Hz]
+    """
+    H = np.asarray(config.H if H is None else H, dtype=float)
+    D = np.asarray(config.D if D is None else D, dtype=float)
+    X_line = np.asarray(config.X_line if X_line is None else X_line, dtype=float)
+    P_step = np.asarray(config.P_solar_drop if P_step is None else P_step, dtype=float)
+    H, D, X_line, P_step = np.broadcast_arrays(H, D, X_line, P_step)
+
+    approx = surrogate_nadir(config, H, D, X_line, P_step)["nadir"]
+    nadir = approx.copy()
+
+    refined = np.abs(approx - safety_threshold) <= band
+    error = {"n_refined": int(refined.sum())}
+
+    if refined.any():
+        _, sol = simulate_hybrid_batch(
+            config,
+            H=H[refined],
+            D=D[refined],
+            X_line=X_line[refined],
+            P_solar_drop=P_step[refined],
+        )
+        exact = np.min(sol[:, :, 1], axis=1) / (2 * np.pi)
+        nadir[refined] = exact
+
+        diff = approx[refined] - exact
+        error["max_abs"] = float(np.nanmax(np.abs(diff)))
+        error["mean_abs"] = float(np.nanmean(np.abs(diff)))
+        error["bias"] = float(np.nanmean(diff))
+
+    return {
+        "nadir": nadir,
+        "surrogate_nadir": approx,
+        "refined": refined,
+        "passed": nadir >= safety_threshold,
+        "error": error,
+    }
+
+
+def bracket_inertia(config, safety_threshold=59.2, band=0.05, h_min=0.1, h_max=20.0):
+    """
+    대리 모델로 Nadir가 (임계값 - band) ~ (임계값 + band)를 지나는 H 구간을 찾아
+    이진 탐색의 초기 범위로 사용합니다.
+    Nadir는 H에 대해 단조가 아닙니다. 태양광 감소(P_step > 0)에서는 H <= D^2 / (8 * Omega_0 * K_s)
+    (zeta >= 1, 과감쇠)이면 언더슛이 없어 Nadir = 정격 주파수이고, zeta = 1을 넘으면서
+    Nadir가 최저점까지 내려간 뒤 다시 증가합니다.
+    따라서 대리 모델상 Nadir가 가장 낮은 H(최악점)부터의 단조 증가 구간에서만 범위를 찾습니다.
+    대리 모델상 범위 안에 해가 없으면 전체 범위 (h_min, h_max)를 반환합니다.
+    """
+    h_grid = np.geomspace(h_min, h_max, 2000)
+    nadir = surrogate_nadir(config, H=h_grid)["nadir"]
+
+    # 최악점 이전(과감쇠 및 Nadir가 H에 따라 감소하는 구간)은 제외
+    worst = int(np.argmin(nadir))
+    lower = worst + np.flatnonzero(nadir[worst:] >= safety_threshold - band)
+    if lower.size == 0:
+        return h_min, h_max
+    upper = worst + np.flatnonzero(nadir[worst:] >= safety_threshold + band)
+
+    h_lo = min(h_grid[max(lower[0] - 1, worst)], h_max - 0.1)
+    h_hi = h_grid[upper[0]] if upper.size else h_max
+    # 이진 탐색이 최소 한 번은 반복되도록 구간 폭 확보 (optimizer의 tolerance = 0.05)
+    return h_lo, min(max(h_hi, h_lo + 0.1), h_max)
+
+
+def find_optimal_inertia_prefiltered(
+    config, safety_threshold=59.2, band=0.05, early_exit=True, run_log=None
+):
+    """
+    대리 모델로 H 탐색 범위를 좁힌 뒤, 그 범위 안에서만 비선형 이진 탐색을 수행합니다.
+    좁힌 범위 안에서 답을 찾지 못하면 (대리 모델 오차가 band보다 큰 경우) 전체 범위로 재탐색합니다.
+    """
+    h_lo, h_hi = bracket_inertia(config, safety_threshold, band)
+    print(f"[Surrogate] Search bracket narrowed to H in [{h_lo:.3f}, {h_hi:.3f}]")
+
+    optimal_h = find_optimal_inertia(
+        config,
+        safety_threshold,
+        early_exit=early_exit,
+        run_log=run_log,
+        h_bounds=(h_lo, h_hi),
+    )
+    # 상한에서도 FAIL이거나, 모든 반복이 PASS여서 하한에 붙은 경우 범위 밖에 해가 있을 수 있음
+    if optimal_h is None or (h_lo > 0.1 and optimal_h - h_lo < 0.05):
+        print("[Surrogate] Bracket did not contain the optimum, falling back.")
+        optimal_h = find_optimal_inertia(
+            config, safety_threshold, early_exit=early_exit, run_log=run_log
+        )
+    return optimal_h
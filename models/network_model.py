@@ -0,0 +1,380 @@
+# models/network_model.py
+"""
+다기(多機) 계통 모델: 여러 VSG(계통 형성 배터리), GFL 태양광, 부하가 연결된 N-모선 네트워크
+
+- 모선 종류
+  * VSG 모선: 상태 [delta, omega, V] - avm_system의 Swing Equation + AVR(Q-V Droop, NVR)을
+    유닛별로 그대로 사용 (avm_system.swing_avr_rates)
+  * 수동 모선 (부하 / GFL / 연결점): 상태 [theta] - 주파수 의존 부하 모델
+        (D_load / Omega_0) * d(theta)/dt = P_gfl(t) - P_load(t) - P_flow
+    전압 크기는 고정 (v_fixed)
+  * 무한 모선 (slack): 상태 없음, 전압/위상 고정
+- 조류 계산: scipy.sparse 어드미턴스 행렬 Y = G + jB의 선로 항목에 대해 sin/cos를 벡터화
+    P_i = V_i^2 G_ii + sum_j V_i V_j (G_ij cos(th_i - th_j) + B_ij sin(th_i - th_j))
+    Q_i = -V_i^2 B_ii + sum_j V_i V_j (G_ij sin(th_i - th_j) - B_ij cos(th_i - th_j))
+  선로마다 sin/cos를 한 번만 계산하고 희소 접속 행렬로 양 끝 모선에 더하므로
+  RHS 비용은 선로 수에 비례합니다.
+- 외란: event_time에 부하 증가(P_step)와 태양광 감소(P_drop)를 적용
+  (scenario.run_segmented / dense_runner.run_dense로 구간 분할 적분 가능)
+
+사용 예)
+    net = Network(4, Config(H=4.0, D=10.0))
+    net.add_branch(0, 1, x=0.2); net.add_branch(1, 2, x=0.3); net.add_branch(2, 3, x=0.2)
+    net.set_slack(0)
+    net.add_vsg(1, P_ref=0.5)
+    net.add_load(2, P=0.8, P_step=0.1)
+    net.add_gfl(3, P=0.4, P_drop=0.2)
+    y0 = net.initial_state()
+    sol = run_segmented(network_dynamics, y0, t, net)
+    f_coi = net.coi_frequency(sol)
+
+    # 수백 대 규모: 희소 Jacobian 구조를 쓰는 BDF가 odeint(dense Jacobian)보다 훨씬 빠름
+    dense = run_dense(
+        network_dynamics, y0, net, method="BDF",
+        jac_sparsity=net.jacobian_sparsity(), rtol=1e-6, atol=1e-8,
+    )
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from models.avm_system import swing_avr_rates
+from models.initializer import PRE_EVENT
+from models.linearizer import find_equilibrium
+
+# VSG 유닛별 파라미터 (기본값은 Config에서 가져옴)
+VSG_FIELDS = (
+    "H",
+    "D",
+    "P_ref",
+    "V_ref_base",
+    "K_q",
+    "T_v",
+    "K_nvr",
+    "use_proposed_control",
+)
+
+
+class Network:
+    """
+    N-모선 네트워크 정의 + RHS에서 쓰는 배열 (finalize에서 한 번 구성)
+    config: 시뮬레이션 시간, Omega_0, event_time, VSG 파라미터 기본값 (config.Config)
+    """
+
+    def __init__(self, n_bus, config, load_damping=1.0, v_fixed=1.0):
+        self.n_bus = int(n_bus)
+        self.config = config
+        self.Omega_0 = config.Omega_0
+        self.event_time = config.event_time
+        self.t_start = config.t_start
+        self.t_end = config.t_end
+        self.steps = config.steps
+
+        self.load_damping = np.full(self.n_bus, float(load_damping))
+        self.v_fixed = np.full(self.n_bus, float(v_fixed))
+        self.branches = []  # (from, to, r, x)
+        self.slack = {}  # 모선 -> (V, 위상)
+        self.vsg = []  # (모선, 파라미터 딕셔너리)
+        self.P_load = np.zeros(self.n_bus)
+        self.P_step = np.zeros(self.n_bus)
+        self.P_gfl = np.zeros(self.n_bus)
+        self.P_drop = np.zeros(self.n_bus)
+        self._ready = False
+
+    # ------------------------------------------
+    # 구성
+    # ------------------------------------------
+    def _bus(self, bus):
+        """모선 번호 검증 (0 ~ n_bus - 1, 음수 인덱스 불가)"""
+        index = int(bus)
+        if index != bus or not 0 <= index < self.n_bus:
+            raise ValueError(
+                f"Invalid bus index {bus!r} (expected an integer 0 ~ {self.n_bus - 1})."
+            )
+        return index
+
+    def add_branch(self, i, j, x, r=0.0):
+        i, j = self._bus(i), self._bus(j)
+        if i == j:
+            raise ValueError("A branch must connect two different buses.")
+        self.branches.append((i, j, float(r), float(x)))
+        self._ready = False
+        return self
+
+    def set_slack(self, bus, V=1.0, angle=0.0):
+        """무한 모선 (전압 V, 위상 angle 고정)"""
+        self.slack[self._bus(bus)] = (float(V), float(angle))
+        self._ready = False
+        return self
+
+    def add_vsg(self, bus, **params):
+        """
+        VSG 유닛 (모선당 하나). params로 VSG_FIELDS 값을 지정하지 않으면 config 값 사용
+        """
+        unknown = set(params) - set(VSG_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown VSG parameter(s): {sorted(unknown)}")
+        values = {name: float(getattr(self.config, name)) for name in VSG_FIELDS}
+        values.update({name: float(v) for name, v in params.items()})
+        self.vsg.append((self._bus(bus), values))
+        self._ready = False
+        return self
+
+    def add_load(self, bus, P, P_step=0.0):
+        """유효전력 부하 P [p.u.] (event_time에 P_step만큼 증가)"""
+        bus = self._bus(bus)
+        self.P_load[bus] += P
+        self.P_step[bus] += P_step
+        return self
+
+    def add_gfl(self, bus, P, P_drop=0.0):
+        """GFL 태양광 출력 P [p.u.] (event_time에 P_drop만큼 감소)"""
+        bus = self._bus(bus)
+        self.P_gfl[bus] += P
+        self.P_drop[bus] += P_drop
+        return self
+
+    def finalize(self):
+        """어드미턴스 행렬, 접속 행렬, 상태 배치를 구성 (RHS 호출 전에 자동 실행)"""
+        if not self.branches:
+            raise ValueError("The network needs at least one branch (add_branch).")
+        vsg_bus = np.array([bus for bus, _ in self.vsg], dtype=int)
+        slack_bus = np.array(sorted(self.slack), dtype=int)
+        if len(set(vsg_bus)) != vsg_bus.size:
+            raise ValueError("Only one VSG unit per bus is supported.")
+        if np.intersect1d(vsg_bus, slack_bus).size:
+            raise ValueError("A bus cannot be both a VSG bus and the slack bus.")
+        kind = np.zeros(self.n_bus, dtype=int)  # 0: 수동, 1: VSG, 2: slack
+        kind[vsg_bus] = 1
+        kind[slack_bus] = 2
+        passive_bus = np.flatnonzero(kind == 0)
+
+        # 어드미턴스 행렬 (선로 직렬 어드미턴스 y = 1 / (r + jx))
+        frm, to, r, x = (np.array(v) for v in zip(*self.branches))
+        frm, to = frm.astype(int), to.astype(int)
+        y = 1.0 / (r + 1j * x)
+        rows = np.concatenate((frm, to, frm, to))
+        cols = np.concatenate((frm, to, to, frm))
+        data = np.concatenate((y, y, -y, -y))
+        self.Y = sp.csr_matrix((data, (rows, cols)), shape=(self.n_bus, self.n_bus))
+
+        # 조류 계산용 선로 목록 (병렬 선로는 합쳐진 상삼각 항목)
+        upper = sp.triu(self.Y, k=1).tocoo()
+        self.branch_i = upper.row
+        self.branch_j = upper.col
+        self.G = upper.data.real
+        self.B = upper.data.imag
+        diag = self.Y.diagonal()
+        self.G_diag = diag.real
+        self.B_diag = diag.imag
+        n_branch = self.branch_i.size
+        ones = np.ones(n_branch)
+        arange = np.arange(n_branch)
+        self.C_i = sp.csr_matrix(
+            (ones, (self.branch_i, arange)), shape=(self.n_bus, n_branch)
+        )
+        self.C_j = sp.csr_matrix(
+            (ones, (self.branch_j, arange)), shape=(self.n_bus, n_branch)
+        )
+
+        # 상태 배치: [delta (n_vsg), omega (n_vsg), V (n_vsg), theta (n_passive)]
+        n_vsg = vsg_bus.size
+        self.vsg_bus = vsg_bus
+        self.passive_bus = passive_bus
+        self.n_vsg = n_vsg
+        self.n_states = 3 * n_vsg + passive_bus.size
+        self.vsg_params = {
+            name: np.array([values[name] for _, values in self.vsg])
+            for name in VSG_FIELDS
+        }
+        self.vsg_params["Omega_0"] = self.Omega_0
+
+        # 고정 위상/전압 (slack 값, 수동 모선 전압)
+        self.angle_fixed = np.zeros(self.n_bus)
+        self.vmag_fixed = self.v_fixed.copy()
+        for bus, (V, angle) in self.slack.items():
+            self.vmag_fixed[bus] = V
+            self.angle_fixed[bus] = angle
+
+        self._ready = True
+        return self
+
+    # ------------------------------------------
+    # 조류 계산
+    # ------------------------------------------
+    def bus_values(self, y):
+        """상태 벡터 (..., n_states) -> 모선 위상, 전압 크기 (..., n_bus)"""
+        if not self._ready:
+            self.finalize()
+        n = self.n_vsg
+        shape = y.shape[:-1] + (self.n_bus,)
+        angle = np.broadcast_to(self.angle_fixed, shape).astype(y.dtype)
+        vmag = np.broadcast_to(self.vmag_fixed, shape).astype(y.dtype)
+        angle[..., self.vsg_bus] = y[..., :n]
+        vmag[..., self.vsg_bus] = y[..., 2 * n : 3 * n]
+        angle[..., self.passive_bus] = y[..., 3 * n :]
+        return angle, vmag
+
+    def injections(self, angle, vmag):
+        """
+        모선별 유입(계통으로 내보내는) 유효/무효 전력 P, Q (..., n_bus)
+        선로별 sin/cos 한 번 + 희소 접속 행렬 곱 (선로 수에 비례)
+        """
+        vi = vmag[..., self.branch_i]
+        vj = vmag[..., self.branch_j]
+        diff = angle[..., self.branch_i] - angle[..., self.branch_j]
+        c = np.cos(diff)
+        s = np.sin(diff)
+        vv = vi * vj
+        gc, bs = self.G * c, self.B * s
+        gs, bc = self.G * s, self.B * c
+
+        # i -> j 방향과 j -> i 방향 (sin의 부호만 반대)
+        p_i, p_j = vv * (gc + bs), vv * (gc - bs)
+        q_i, q_j = vv * (gs - bc), vv * (-gs - bc)
+
+        v2 = vmag**2
+        P = v2 * self.G_diag + (self.C_i @ p_i.T + self.C_j @ p_j.T).T
+        Q = -v2 * self.B_diag + (self.C_i @ q_i.T + self.C_j @ q_j.T).T
+        return P, Q
+
+    def power_outputs(self, sol):
+        """
+        궤적 (T, n_states)에서 모선별 P, Q, V (각 (T, n_bus))
+        """
+        angle, vmag = self.bus_values(np.asarray(sol))
+        P, Q = self.injections(angle, vmag)
+        return P, Q, vmag
+
+    def coi_frequency(self, sol):
+        """관성 중심(Center of Inertia) 주파수 [Hz] (T,) - VSG 관성 H로 가중 평균"""
+        if not self._ready:
+            self.finalize()
+        n = self.n_vsg
+        omega = np.asarray(sol)[..., n : 2 * n]
+        H = self.vsg_params["H"]
+        return omega @ H / H.sum() / (2 * np.pi)
+
+    # ------------------------------------------
+    # 초기값 / Jacobian 구조
+    # ------------------------------------------
+    def jacobian_sparsity(self):
+        """
+        RHS Jacobian의 0이 아닐 수 있는 위치 (n_states x n_states, scipy.sparse)
+        (linearizer / solve_ivp의 jac_sparsity에 사용)
+        """
+        if not self._ready:
+            self.finalize()
+        n = self.n_vsg
+        angle_state = np.full(self.n_bus, -1)
+        vmag_state = np.full(self.n_bus, -1)
+        angle_state[self.vsg_bus] = np.arange(n)
+        vmag_state[self.vsg_bus] = 2 * n + np.arange(n)
+        angle_state[self.passive_bus] = 3 * n + np.arange(self.passive_bus.size)
+
+        # 조류에 의존하는 식 (omega, V, theta)의 행 -> 해당 모선
+        flow_rows = np.concatenate(
+            (n + np.arange(n), 2 * n + np.arange(n), angle_state[self.passive_bus])
+        )
+        flow_bus = np.concatenate((self.vsg_bus, self.vsg_bus, self.passive_bus))
+
+        adjacency = (abs(self.Y) > 0).tocsr()
+        rows, cols = [], []
+        for row, bus in zip(flow_rows, flow_bus):
+            neighbors = adjacency.indices[
+                adjacency.indptr[bus] : adjacency.indptr[bus + 1]
+            ]
+            for states in (angle_state[neighbors], vmag_state[neighbors]):
+                states = states[states >= 0]
+                rows.extend([row] * states.size)
+                cols.extend(states)
+
+        # VSG 유닛 내부 결합 (delta <- omega, omega/V <- 자기 상태)
+        k = np.arange(n)
+        for row, col in ((k, n + k), (n + k, n + k), (2 * n + k, n + k)):
+            rows.extend(row)
+            cols.extend(col)
+        for row in (n + k, 2 * n + k):
+            rows.extend(row)
+            cols.extend(k)
+            rows.extend(row)
+            cols.extend(2 * n + k)
+
+        pattern = sp.coo_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)),
+            shape=(self.n_states, self.n_states),
+        )
+        return pattern.tocsr()
+
+    def initial_state(self):
+        """
+        외란 이전 평형점 (조류 계산 + VSG 정상 상태)
+        DC 조류 해에서 출발하여 linearizer.find_equilibrium으로 계산, 실패 시 ValueError
+        (위상 기준이 필요하므로 slack 모선이 하나 이상 있어야 함)
+        """
+        if not self._ready:
+            self.finalize()
+        if not self.slack:
+            raise ValueError("initial_state needs at least one slack (infinite) bus.")
+
+        # DC 조류: B' theta = P (slack 모선 위상 고정)
+        P_spec = self.P_gfl - self.P_load
+        P_spec[self.vsg_bus] += self.vsg_params["P_ref"]
+        b_matrix = -self.Y.imag.tocsr()
+        free = np.setdiff1d(np.arange(self.n_bus), np.array(sorted(self.slack)))
+        theta = self.angle_fixed.copy()
+        rhs = (
+            P_spec[free] - b_matrix[free][:, list(self.slack)] @ theta[list(self.slack)]
+        )
+        theta[free] = sp.linalg.spsolve(b_matrix[free][:, free].tocsc(), rhs)
+
+        n = self.n_vsg
+        guess = np.concatenate(
+            (
+                theta[self.vsg_bus],
+                np.full(n, self.Omega_0),
+                self.vsg_params["V_ref_base"],
+                theta[self.passive_bus],
+            )
+        )
+        y, converged = find_equilibrium(
+            network_dynamics,
+            guess,
+            self,
+            PRE_EVENT,
+            sparsity=self.jacobian_sparsity().toarray(),
+        )
+        if not converged:
+            raise ValueError(
+                "No steady state found for this network (check line loading / P_max)."
+            )
+        return y
+
+
+def network_dynamics(y, t, net):
+    """
+    N-모선 네트워크 RHS (odeint 형식)
+    y: [delta (n_vsg), omega (n_vsg), V (n_vsg), theta (n_passive)]
+    """
+    angle, vmag = net.bus_values(y)
+    P, Q = net.injections(angle, vmag)
+    n = net.n_vsg
+
+    dydt = np.empty_like(y)
+    dydt[:n], dydt[n : 2 * n], dydt[2 * n : 3 * n] = swing_avr_rates(
+        y[n : 2 * n],
+        y[2 * n : 3 * n],
+        P[net.vsg_bus],
+        Q[net.vsg_bus],
+        net.vsg_params,
+    )
+
+    # 수동 모선: 주파수 의존 부하 (외란 이후 부하 증가 / 태양광 감소)
+    bus = net.passive_bus
+    if t >= net.event_time:
+        P_spec = (net.P_gfl[bus] - net.P_drop[bus]) - (
+            net.P_load[bus] + net.P_step[bus]
+        )
+    else:
+        P_spec = net.P_gfl[bus] - net.P_load[bus]
+    dydt[3 * n :] = net.Omega_0 * (P_spec - P[bus]) / net.load_damping[bus]
+    return dydt
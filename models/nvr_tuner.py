@@ -0,0 +1,276 @@
+# models/nvr_tuner.py
+"""
+고유값 기반 NVR 게인 튜닝 (avm_system.voltage_dynamics)
+
+시간 영역 시행착오 대신, 3상태 [delta, omega, V] AVM 모델을 운전점에서 선형화하여
+(K_nvr, K_q, T_v) 조합 수천 개의 최소 감쇠비를 한 번의 배치 고유값 계산으로 구하고,
+최소 감쇠비가 가장 큰 조합을 고른 뒤 몇 개의 시간 영역 실행으로 결과를 확인합니다.
+
+- 평형점에서는 omega = Omega_0 이므로 NVR 신호가 0이고 리미터(clip +/-0.1)는 비활성
+  -> 소신호 모델에서 NVR 항은 K_nvr * (omega - Omega_0) 그대로
+- 평형점은 K_q에만 의존 (K_nvr, T_v는 평형 조건에서 사라짐)
+  -> K_q 값별로 한 번씩만 find_equilibrium, 나머지는 해석적 상태 행렬로 벡터화
+- 확인 실행: 리미터가 실제로 비활성이었는지(clip_active)도 함께 기록
+
+사용 예)
+    cfg = Config(X_line=0.5, V_grid_fault=0.9, use_proposed_control=True)
+    result = tune_nvr(cfg)
+    print_report(result)
+    tuned = cfg.replace(**result["best"])
+"""
+
+import time
+import numpy as np
+from models.avm_system import voltage_dynamics
+from models.eigen_analysis import eigvals_batch
+from models.initializer import initial_state
+from models.linearizer import POST_EVENT, find_equilibrium
+from models.metrics import compute_metrics
+from models.solver_stats import run_instrumented
+
+# 기본 탐색 격자 (41 x 21 x 21 = 18081 조합)
+DEFAULT_K_NVR = np.linspace(0.0, 5.0, 41)
+DEFAULT_K_Q = np.linspace(0.0, 1.0, 21)
+DEFAULT_T_V = np.geomspace(0.01, 1.0, 21)
+
+# NVR 리미터 한계 (avm_system.voltage_dynamics의 clip 값)
+NVR_LIMIT = 0.1
+
+
+def _grid_voltage(config, t):
+    return config.V_grid_fault if t >= config.event_time else config.V_grid_normal
+
+
+def avm_operating_points(config, K_q, t=POST_EVENT):
+    """
+    K_q 값별 AVM 평형점 (N, 3)과 수렴 여부 (N,) - 같은 K_q는 한 번만 계산
+    t: 선형화 시각 (POST_EVENT: 외란 이후 운전점, initializer.PRE_EVENT: 외란 이전)
+    """
+    K_q = np.atleast_1d(np.asarray(K_q, dtype=float))
+    unique, inverse = np.unique(K_q, return_inverse=True)
+    y_eq = np.full((unique.size, 3), np.nan)
+    converged = np.zeros(unique.size, dtype=bool)
+
+    guess = None
+    for i, k_q in enumerate(unique):
+        point = config.replace(K_q=float(k_q), use_proposed_control=True)
+        if guess is None:
+            # 외란 이전 평형점에서 출발 (K_q 순서대로 warm start)
+            guess = initial_state("avm", point)
+        y, ok = find_equilibrium(voltage_dynamics, guess, point, t)
+        if ok:
+            y_eq[i] = y
+            converged[i] = True
+            guess = y
+    return y_eq[inverse], converged[inverse]
+
+
+def avm_state_matrix_batch(config, y_eq, K_nvr, K_q, T_v, t=POST_EVENT):
+    """
+    NVR 제어(리미터 비활성)를 포함한 AVM 모델의 상태 행렬 (N, 3, 3) - 해석적 Jacobian
+    y_eq: (N, 3) 평형점, K_nvr / K_q / T_v: (N,) 배열
+      d(delta)/dt = omega - Omega_0
+      d(omega)/dt = Omega_0 / (2H) * (P_ref - P - D * (omega - Omega_0) / Omega_0)
+      dV/dt       = (V_ref - K_q * Q + K_nvr * (omega - Omega_0) - V) / T_v
+    평형점이 없는 점(NaN)의 행렬은 NaN
+    """
+    delta, V = y_eq[:, 0], y_eq[:, 2]
+    V_grid = _grid_voltage(config, t)
+    X = config.X_line
+    Omega_0 = config.Omega_0
+    H, D = config.H, config.D
+
+    dP_ddelta = V * V_grid / X * np.cos(delta)
+    dP_dV = V_grid / X * np.sin(delta)
+    dQ_ddelta = V * V_grid / X * np.sin(delta)
+    dQ_dV = 2 * V / X - V_grid / X * np.cos(delta)
+
+    A = np.zeros((delta.size, 3, 3))
+    A[:, 0, 1] = 1.0
+    A[:, 1, 0] = -Omega_0 / (2 * H) * dP_ddelta
+    A[:, 1, 1] = -D / (2 * H)
+    A[:, 1, 2] = -Omega_0 / (2 * H) * dP_dV
+    A[:, 2, 0] = -K_q * dQ_ddelta / T_v
+    A[:, 2, 1] = K_nvr / T_v
+    A[:, 2, 2] = -(K_q * dQ_dV + 1.0) / T_v
+    return A
+
+
+def damping_ratios(eigs):
+    """
+    고유값 (N, n) -> 최소 감쇠비 (N,), 그 모드의 주파수 [Hz] (N,),
+                     가장 느린 모드의 감쇠율 -max(Re(lambda)) [1/s] (N,)
+    감쇠비 zeta = -Re(lambda) / |lambda| (불안정 모드는 음수)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zeta = -eigs.real / np.abs(eigs)
+    zeta_min = np.full(eigs.shape[0], np.nan)
+    freq = np.full(eigs.shape[0], np.nan)
+    decay = -np.max(eigs.real, axis=1)
+    finite = np.isfinite(zeta).all(axis=1)
+    if finite.any():
+        k = np.argmin(zeta[finite], axis=1)
+        zeta_min[finite] = zeta[finite, k]
+        freq[finite] = np.abs(eigs[finite, k].imag) / (2 * np.pi)
+    return zeta_min, freq, decay
+
+
+def _ranking(zeta_min, decay):
+    """
+    최소 감쇠비 내림차순 인덱스 (평형점 없는 점 제외)
+    과감쇠(zeta = 1) 조합이 여럿이면 가장 느린 모드가 빨리 감쇠하는 조합을 우선
+    """
+    valid = np.flatnonzero(np.isfinite(zeta_min))
+    order = np.lexsort((-decay[valid], -np.round(zeta_min[valid], 6)))
+    return valid[order]
+
+
+def _confirmation_indices(order, zeta_min, baseline, n_confirm):
+    """
+    확인 실행 대상: 현재 설정(baseline), 최적점, 그리고 최소 감쇠비 순위 분위수별 점
+    (선형 결과의 순위가 시간 영역에서도 유지되는지 확인)
+    """
+    picks = [baseline, order[0]]
+    for q in np.linspace(0.0, 1.0, max(n_confirm - 1, 2))[1:]:
+        picks.append(order[int(round(q * (order.size - 1)))])
+    unique = []
+    for k in picks:
+        if k not in unique and np.isfinite(zeta_min[k]):
+            unique.append(k)
+    return unique[:n_confirm]
+
+
+def tune_nvr(
+    config,
+    K_nvr=None,
+    K_q=None,
+    T_v=None,
+    t=POST_EVENT,
+    n_confirm=5,
+    verbose=True,
+):
+    """
+    (K_nvr, K_q, T_v) 격자의 모든 조합에서 최소 감쇠비를 계산하고 최댓값 조합을 선택
+    K_nvr, K_q, T_v: 탐색 값 배열 (생략 시 DEFAULT_*, 스칼라를 주면 고정)
+    n_confirm: 시간 영역 확인 실행 수 (0이면 생략)
+    반환: {"K_nvr", "K_q", "T_v", "zeta_min", "freq", "decay": (N,) 격자 결과,
+           "best" {K_nvr, K_q, T_v}, "best_zeta", "baseline_zeta",
+           "confirm": [확인 실행 기록, ...], "n_points", "eig_time", "confirm_time"}
+    """
+    axes = [
+        np.atleast_1d(np.asarray(default if values is None else values, dtype=float))
+        for values, default in (
+            (K_nvr, DEFAULT_K_NVR),
+            (K_q, DEFAULT_K_Q),
+            (T_v, DEFAULT_T_V),
+        )
+    ]
+    # 현재 설정값도 격자에 포함하여 개선 정도를 같은 기준으로 비교
+    # (NVR 제어를 쓰지 않는 설정은 K_nvr = 0과 같음)
+    current_k_nvr = config.K_nvr if config.use_proposed_control else 0.0
+    current = (current_k_nvr, config.K_q, config.T_v)
+    axes = [np.union1d(axis, [value]) for axis, value in zip(axes, current)]
+    grid = [g.ravel() for g in np.meshgrid(*axes, indexing="ij")]
+    k_nvr, k_q, t_v = grid
+
+    # 1. 배치 선형화 + 고유값
+    start = time.perf_counter()
+    y_eq, _ = avm_operating_points(config, k_q, t)
+    A = avm_state_matrix_batch(config, y_eq, k_nvr, k_q, t_v, t)
+    zeta_min, freq, decay = damping_ratios(eigvals_batch(A))
+    eig_time = time.perf_counter() - start
+
+    if not np.isfinite(zeta_min).any():
+        raise ValueError("No operating point found for any K_q value in the grid.")
+    order = _ranking(zeta_min, decay)
+    best = int(order[0])
+    baseline = int(
+        np.flatnonzero(
+            (k_nvr == current[0]) & (k_q == current[1]) & (t_v == current[2])
+        )[0]
+    )
+
+    result = {
+        "K_nvr": k_nvr,
+        "K_q": k_q,
+        "T_v": t_v,
+        "zeta_min": zeta_min,
+        "freq": freq,
+        "decay": decay,
+        "best": {
+            "K_nvr": float(k_nvr[best]),
+            "K_q": float(k_q[best]),
+            "T_v": float(t_v[best]),
+        },
+        "best_zeta": float(zeta_min[best]),
+        "baseline_zeta": float(zeta_min[baseline]),
+        "n_points": k_nvr.size,
+        "eig_time": eig_time,
+        "confirm": [],
+    }
+    if verbose:
+        print(
+            f"--- NVR tuning: {k_nvr.size} gain sets linearized in "
+            f"{eig_time * 1e3:.1f} ms ---"
+        )
+
+    # 2. 시간 영역 확인 (리미터를 포함한 비선형 모델)
+    start = time.perf_counter()
+    t_grid = np.linspace(config.t_start, config.t_end, config.steps)
+    for k in _confirmation_indices(order, zeta_min, baseline, n_confirm):
+        point = config.replace(
+            K_nvr=float(k_nvr[k]),
+            K_q=float(k_q[k]),
+            T_v=float(t_v[k]),
+            use_proposed_control=True,
+        )
+        y0 = initial_state("avm", point)
+        sol, record = run_instrumented(voltage_dynamics, y0, t_grid, point)
+        metrics = compute_metrics(t_grid, sol, point, "avm")
+        nvr_signal = np.abs(point.K_nvr * (sol[:, 1] - point.Omega_0))
+        result["confirm"].append(
+            {
+                "K_nvr": point.K_nvr,
+                "K_q": point.K_q,
+                "T_v": point.T_v,
+                "zeta_min": float(zeta_min[k]),
+                "settling_time": float(metrics["settling_time"]),
+                "nadir": float(metrics["nadir"]),
+                "V_min": float(metrics["V_min"]),
+                "clip_active": bool(np.any(nvr_signal >= NVR_LIMIT)),
+                "nfev": record["nfev"],
+                "role": "best" if k == best else "baseline" if k == baseline else "",
+            }
+        )
+    result["confirm_time"] = time.perf_counter() - start
+    return result
+
+
+def print_report(result):
+    """tune_nvr 결과 요약 출력"""
+    best = result["best"]
+    print(
+        f"  Best: K_nvr={best['K_nvr']:.3f}, K_q={best['K_q']:.3f}, "
+        f"T_v={best['T_v']:.4f} -> min damping ratio {result['best_zeta']:.4f} "
+        f"(current settings: {result['baseline_zeta']:.4f})"
+    )
+    if not result["confirm"]:
+        return
+    print(
+        f"  Time-domain confirmation ({len(result['confirm'])} runs, "
+        f"{result['confirm_time']:.2f} s):"
+    )
+    print(
+        f"  {'K_nvr':>7} {'K_q':>6} {'T_v':>7} {'zeta':>7} "
+        f"{'settle[s]':>9} {'nadir':>9} {'V_min':>7} clip"
+    )
+    for run in result["confirm"]:
+        print(
+            f"  {run['K_nvr']:7.3f} {run['K_q']:6.3f} {run['T_v']:7.4f} "
+            f"{run['zeta_min']:7.4f} {run['settling_time']:9.3f} "
+            f"{run['nadir']:9.4f} {run['V_min']:7.4f} "
+            f"{'yes' if run['clip_active'] else 'no':>4} {run['role']}"
+        )
+    if any(run["clip_active"] for run in result["confirm"]):
+        print("  [NOTE] The NVR limiter was active in some runs; the linear ranking")
+        print("         only holds while |K_nvr * (omega - Omega_0)| < 0.1 p.u.")
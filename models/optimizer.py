@@ -1,19 +1,124 @@
 # models/optimizer.py
+import time
 import numpy as np
-from scipy.integrate import odeint
+from scipy.integrate import odeint, solve_ivp
 from models.hybrid_system import system_dynamics
+from models.initializer import initial_state
+from models.metrics import frequency_metrics
+from models.solver_stats import summarize_odeint
 
+# odeint 기본 허용 오차와 동일하게 맞춰 조기 종료 모드와 결과를 비교 가능하게 함
+_RTOL = 1.49012e-8
+_ATOL = 1.49012e-8
 
-def find_optimal_inertia(config, safety_threshold=59.2):
+
+def simulate_nadir_early_exit(config, y0, safety_threshold):
+    """
+    주파수 최저점(Nadir)이 확정되는 즉시 적분을 멈추는 시뮬레이션
+    - 주파수가 safety_threshold 아래로 내려가면 즉시 중단 (FAIL 확정)
+    - 이벤트 이후 d(omega)/dt 가 음 -> 양으로 바뀌면(주파수 회복 시작) 중단 (Nadir 통과)
+    반환: {"nadir", "status", "t_reached", "fraction", "nfev", "njev", "nsteps",
+           "step_min", "step_max", "wall_time"}
+    status: "threshold" | "nadir_passed" | "full"
+    """
+    start = time.perf_counter()
+    t_start, t_end = config.t_start, config.t_end
+    t_event = min(max(config.event_time, t_start), t_end)
+
+    def rhs(t, y):
+        return system_dynamics(y, t, config)
+
+    nfev = 0
+    njev = 0
+    steps = []
+    y = np.asarray(y0, dtype=float)
+    nadir = y[1] / (2 * np.pi)
+
+    # 1구간: 이벤트 이전 (평형 상태 유지) - 불연속점에서 스텝을 끊기 위해 분리
+    if t_event > t_start:
+        pre = solve_ivp(
+            rhs, (t_start, t_event), y, method="LSODA", rtol=_RTOL, atol=_ATOL
+        )
+        nfev += pre.nfev
+        njev += int(pre.njev)
+        steps.append(np.diff(pre.t))
+        y = pre.y[:, -1]
+        nadir = min(nadir, np.min(pre.y[1]) / (2 * np.pi))
+
+    status = "full"
+    t_reached = t_event
+
+    # 2구간: 이벤트 이후 - 종료 조건을 이벤트 함수로 감시
+    if t_event < t_end:
+
+        def below_threshold(t, y):
+            return y[1] / (2 * np.pi) - safety_threshold
+
+        below_threshold.terminal = True
+        below_threshold.direction = -1
+
+        def nadir_passed(t, y):
+            return rhs(t, y)[1]
+
+        nadir_passed.terminal = True
+        nadir_passed.direction = 1
+
+        post = solve_ivp(
+            rhs,
+            (t_event, t_end),
+            y,
+            method="LSODA",
+            events=(below_threshold, nadir_passed),
+            rtol=_RTOL,
+            atol=_ATOL,
+        )
+        nfev += post.nfev
+        njev += int(post.njev)
+        steps.append(np.diff(post.t))
+        t_reached = post.t[-1]
+        nadir = min(nadir, np.min(post.y[1]) / (2 * np.pi))
+
+        if post.status == 1:
+            if post.t_events[0].size:
+                status = "threshold"
+                nadir = min(nadir, post.y_events[0][0][1] / (2 * np.pi))
+            else:
+                status = "nadir_passed"
+                nadir = min(nadir, post.y_events[1][0][1] / (2 * np.pi))
+
+    steps = np.concatenate(steps) if steps else np.empty(0)
+    return {
+        "nadir": nadir,
+        "status": status,
+        "t_reached": t_reached,
+        "fraction": (t_reached - t_start) / (t_end - t_start),
+        "nfev": nfev,
+        "njev": njev,
+        "nsteps": int(steps.size),
+        "step_min": float(steps.min()) if steps.size else np.nan,
+        "step_max": float(steps.max()) if steps.size else np.nan,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def find_optimal_inertia(
+    config, safety_threshold=59.2, early_exit=False, run_log=None, h_bounds=None
+):
     """
     이진 탐색(Binary Search)을 사용하여
     주파수 최저점(Nadir)이 safety_threshold를 지키는
     '최소한의 관성 상수(H)'를 찾습니다.
+
+    early_exit=True 이면 Nadir가 확정되는 시점에서 각 시뮬레이션을 중단합니다.
+    run_log에 리스트를 넘기면 반복별 결과(H, nadir, 중단 시점, 솔버 통계 등)를 추가합니다.
+    h_bounds=(h_min, h_max)로 탐색 범위를 지정할 수 있습니다. (nadir_surrogate 참고)
     """
 
     # 탐색 범위 설정 (H값)
     h_min = 0.1  # 최소 범위
     h_max = 20.0  # 최대 범위
+    if h_bounds is not None:
+        h_min, h_max = h_bounds
     tolerance = 0.05  # 허용 오차 (이 정도 정밀도면 멈춤)
 
     optimal_h = None
@@ -27,40 +132,66 @@ def find_optimal_inertia(config, safety_threshold=59.2):
         # 1. 중간값 선택
         h_mid = (h_min + h_max) / 2
 
-        # 2. 시뮬레이션 수행 (임시 H값 적용)
-        original_h = config.H
-        config.H = h_mid
+        # 2. 시뮬레이션 수행 (H만 바꾼 설정 복사본 사용, 원본 config는 변경하지 않음)
+        trial = config.replace(H=h_mid)
 
-        # 초기 상태 계산 (H는 동역학에만 영향, 초기 평형점은 H와 무관하지만 코드 구조상 수행)
-        P_vsg_initial = config.P_load_total - config.P_solar_initial
-        P_max = config.V_vsg * config.V_grid / config.X_line
-        delta_0 = np.arcsin(P_vsg_initial / P_max)
-        y0 = [delta_0, config.Omega_0]
+        # 초기 상태 (평형점은 H와 무관하므로 첫 반복에서 한 번만 계산됨)
+        y0 = initial_state("hybrid", trial)
+
+        if early_exit:
+            run = simulate_nadir_early_exit(trial, y0, safety_threshold)
+        else:
+            t = np.linspace(trial.t_start, trial.t_end, trial.steps)
+            start = time.perf_counter()
+            sol, info = odeint(system_dynamics, y0, t, args=(trial,), full_output=True)
+            wall_time = time.perf_counter() - start
+            stats = summarize_odeint(info)
 
-        t = np.linspace(config.t_start, config.t_end, config.steps)
-        sol = odeint(system_dynamics, y0, t, args=(config,))
+            # 3. 결과 분석 (최저 주파수 확인)
+            run = {
+                "nadir": frequency_metrics(t, sol[:, 1], trial)["nadir"],
+                "status": "full",
+                "t_reached": config.t_end,
+                "fraction": 1.0,
+                "nfev": stats["nfev"],
+                "njev": stats["njev"],
+                "nsteps": stats["nsteps"],
+                "step_min": stats["step_min"],
+                "step_max": stats["step_max"],
+                "method_switches": stats["method_switches"],
+                "wall_time": wall_time,
+            }
 
-        # 설정 복구
-        config.H = original_h
+        nadir = run["nadir"]
+        run["iteration"] = iteration
+        run["H"] = h_mid
+        if run_log is not None:
+            run_log.append(run)
 
-        # 3. 결과 분석 (최저 주파수 확인)
-        freq_res = sol[:, 1] / (2 * np.pi)
-        nadir = np.min(freq_res)
+        progress = (
+            f"[stopped at t={run['t_reached']:.2f}s, "
+            f"{run['fraction'] * 100:.0f}% of window, nfev={run['nfev']}, "
+            f"njev={run['njev']}, {run['wall_time'] * 1e3:.1f} ms]"
+        )
 
         # 4. 판단 및 범위 좁히기
-        if nadir < safety_threshold:
+        # (조기 종료 모드에서 임계값 통과가 감지되면 그 자체로 FAIL)
+        if nadir < safety_threshold or run["status"] == "threshold":
             # 주파수가 너무 많이 떨어짐 -> 관성(H)이 더 필요함 -> 범위의 아랫부분을 버림
             print(
-                f"Iter {iteration}: H={h_mid:.2f} -> Nadir {nadir:.4f} Hz (FAIL - Too Low)"
+                f"Iter {iteration}: H={h_mid:.2f} -> Nadir {nadir:.4f} Hz (FAIL - Too Low) {progress}"
             )
             h_min = h_mid
         else:
             # 주파수가 안전함 -> 관성(H)을 줄여서 비용을 아낄 수 있는지 확인 -> 범위의 윗부분을 버림
             print(
-                f"Iter {iteration}: H={h_mid:.2f} -> Nadir {nadir:.4f} Hz (PASS - Safe)"
+                f"Iter {iteration}: H={h_mid:.2f} -> Nadir {nadir:.4f} Hz (PASS - Safe) {progress}"
             )
             optimal_h = h_mid  # 일단 저장
             h_max = h_mid
 
-    print(f"--- Optimization Finished. Optimal H = {optimal_h:.2f} ---")
+    if optimal_h is None:
+        print("--- Optimization Finished. No H in range meets the threshold ---")
+    else:
+        print(f"--- Optimization Finished. Optimal H = {optimal_h:.2f} ---")
     return optimal_h
@@ -1,40 +1,96 @@
 # models/pareto_analysis.py
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
-from models.hybrid_system import system_dynamics
+from models.batch_simulator import simulate_hybrid_batch
+from models.metrics import frequency_metrics
 
 
-def plot_pareto_front(config):
-    print("--- Generating Pareto Front Curve ---")
+def _pareto_chunk(config, h_values, d_values, settling_band):
+    """
+    프로세스 풀 작업 단위: (H, D) 조합 묶음을 배치 적분하여 지표만 반환
+    (궤적 전체는 프로세스 간에 주고받지 않음)
+    """
+    t, sol = simulate_hybrid_batch(config, H=h_values, D=d_values)
+    metrics = frequency_metrics(t, sol[:, :, 1], config, settling_band)
+    return metrics["nadir"], metrics["rocof"], metrics["settling_time"]
+
+
+def compute_pareto_front(
+    config, h_values, d_values=None, workers=None, settling_band=0.02
+):
+    """
+    관성(H) [및 감쇠(D)] 조합별 주파수 지표를 병렬로 계산합니다. (그래프 없음)
+    config는 변경하지 않습니다.
+    반환: {"H", "D", "nadir" [Hz], "rocof" [Hz/s], "settling_time" [s]}
+          d_values가 주어지면 각 배열의 shape은 (len(h_values), len(d_values))
+    """
+    h_values = np.asarray(h_values, dtype=float)
+    if d_values is None:
+        H = h_values
+        D = np.full(h_values.shape, float(config.D))
+    else:
+        H, D = np.meshgrid(h_values, np.asarray(d_values, dtype=float), indexing="ij")
+    shape = H.shape
+    H, D = H.ravel(), D.ravel()
 
-    # 테스트할 관성 상수(H) 범위: 1.0 ~ 10.0
-    h_values = np.linspace(1.0, 10.0, 20)
-    nadir_values = []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_chunks = min(H.size, max(1, workers * 4))
+    chunks = [
+        (h, d) for h, d in zip(np.array_split(H, n_chunks), np.array_split(D, n_chunks))
+    ]
 
-    # 시뮬레이션 반복 수행
-    for h in h_values:
-        original_h = config.H
-        config.H = h
+    if workers == 1:
+        results = [_pareto_chunk(config, h, d, settling_band) for h, d in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_pareto_chunk, config, h, d, settling_band)
+                for h, d in chunks
+            ]
+            results = [f.result() for f in futures]
 
-        # 초기 상태 및 솔버 실행
-        P_vsg_initial = config.P_load_total - config.P_solar_initial
-        P_max = config.V_vsg * config.V_grid / config.X_line
-        delta_0 = np.arcsin(P_vsg_initial / P_max)
-        y0 = [delta_0, config.Omega_0]
-        t = np.linspace(config.t_start, config.t_end, config.steps)
+    nadir, rocof, settling_time = (
+        np.concatenate(r).reshape(shape) for r in zip(*results)
+    )
+
+    return {
+        "H": H.reshape(shape),
+        "D": D.reshape(shape),
+        "nadir": nadir,
+        "rocof": rocof,
+        "settling_time": settling_time,
+    }
 
-        sol = odeint(system_dynamics, y0, t, args=(config,))
 
-        # 주파수 최저점(Nadir) 기록
-        freq = sol[:, 1] / (2 * np.pi)
-        nadir_values.append(np.min(freq))
+def plot_pareto_front(config, front=None, save_path=None, show=True):
+    """
+    compute_pareto_front 결과를 그립니다. front가 없으면 기본 H 범위로 계산합니다.
+    save_path를 주면 파일로 저장합니다. (show=False이면 저장 후 닫음)
+    """
+    print("--- Generating Pareto Front Curve ---")
 
-        config.H = original_h  # 복구
+    if front is None:
+        # 테스트할 관성 상수(H) 범위: 1.0 ~ 10.0
+        front = compute_pareto_front(config, np.linspace(1.0, 10.0, 20))
 
     # 그래프 그리기
-    plt.figure(figsize=(10, 6))
-    plt.plot(h_values, nadir_values, "bo-", linewidth=2, markersize=8)
+    fig = plt.figure(figsize=(10, 6))
+    if front["nadir"].ndim == 1:
+        plt.plot(front["H"], front["nadir"], "bo-", linewidth=2, markersize=8)
+    else:
+        # (H, D) 2차원 스윕: D별로 한 곡선씩
+        for j in range(front["nadir"].shape[1]):
+            plt.plot(
+                front["H"][:, j],
+                front["nadir"][:, j],
+                "o-",
+                linewidth=2,
+                markersize=4,
+                label=f"D={front['D'][0, j]:.1f}",
+            )
 
     # 안전 기준선 표시 (예: 59.2Hz)
     plt.axhline(y=59.2, color="r", linestyle="--", label="Safety Limit (59.2Hz)")
@@ -54,4 +110,10 @@ def plot_pareto_front(config):
     )
 
     print("--- Pareto Front Generated ---")
-    plt.show()
+    if save_path is not None:
+        fig.savefig(save_path)
+    if show:
+        plt.show()
+    elif save_path is not None:
+        plt.close(fig)
+    return fig
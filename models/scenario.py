@@ -0,0 +1,149 @@
+# models/scenario.py
+import copy
+import numpy as np
+from scipy.integrate import odeint
+
+
+def with_overrides(config, **overrides):
+    """config를 복사한 뒤 일부 값만 바꾼 새 객체를 반환 (원본은 변경하지 않음)"""
+    if hasattr(config, "replace"):
+        return config.replace(**overrides)
+
+    # replace가 없는 설정 객체 (DetailedConfig 등)
+    new_config = copy.copy(config)
+    for name, value in overrides.items():
+        setattr(new_config, name, value)
+    return new_config
+
+
+class DisturbanceSchedule:
+    """
+    외란 시나리오 스케줄 (Step / Ramp / 다중 이벤트)
+    각 이벤트는 config의 속성 값을 지정한 시각에 바꿉니다.
+
+    예) 1초에 태양광 0.2 감소, 3~4초 동안 전력망 임피던스 1.2 -> 0.6으로 복구
+        schedule = DisturbanceSchedule()
+        schedule.add_step(1.0, "P_solar_drop", 0.2)
+        schedule.add_ramp(3.0, 4.0, "X_line", 0.6)
+
+    Ramp는 구간을 ramp_steps개의 계단으로 나누어 근사합니다.
+    (각 계단 구간 안에서는 RHS가 매끄러워 적분기가 재시작만 하면 됨)
+    """
+
+    def __init__(self, ramp_steps=20):
+        self.ramp_steps = ramp_steps
+        self.events = []  # (시작 시각, 종료 시각, 속성 이름, 목표 값)
+
+    def add_step(self, time, name, value):
+        self.events.append((float(time), float(time), name, value))
+        return self
+
+    def add_ramp(self, start, end, name, value):
+        if end <= start:
+            raise ValueError("Ramp end time must be after its start time.")
+        self.events.append((float(start), float(end), name, value))
+        return self
+
+    def breakpoints(self, t_start, t_end):
+        """적분을 끊어야 하는 시각 목록 (t_start, t_end 포함, 오름차순)"""
+        points = {t_start, t_end}
+        for start, end, _, _ in self.events:
+            if start == end:
+                points.add(start)
+            else:
+                points.update(np.linspace(start, end, self.ramp_steps + 1))
+        return np.array(sorted(p for p in points if t_start <= p <= t_end))
+
+    def values_at(self, config, time):
+        """
+        시각 time에서 스케줄이 적용된 속성 값 딕셔너리
+        Ramp는 time이 속한 계단 구간의 중앙값으로 계산합니다.
+        """
+        values = {}
+        for start, end, name, target in sorted(self.events, key=lambda e: e[0]):
+            initial = values.get(name, getattr(config, name))
+            if time < start:
+                continue
+            if time >= end:
+                values[name] = target
+            else:
+                width = (end - start) / self.ramp_steps
+                k = np.floor((time - start) / width)
+                fraction = (k + 0.5) / self.ramp_steps
+                values[name] = initial + (target - initial) * fraction
+        return values
+
+
+def iter_segments(t_start, t_end, config, schedule=None, event_attr="event_time"):
+    """
+    [t_start, t_end]를 이벤트 시각(모델 이벤트 + schedule)으로 나눈 구간 목록
+    반환: (구간 시작, 구간 끝, 마지막 구간 여부, 구간용 config) 생성기
+    - 구간용 config는 schedule 값이 반영되고, 모델의 이벤트 분기가 구간 안에서 바뀌지 않도록
+      event_attr을 +/-inf로 고정한 복사본
+    """
+    schedule = schedule or DisturbanceSchedule()
+
+    points = set(schedule.breakpoints(t_start, t_end))
+    model_event = getattr(config, event_attr, None)
+    if model_event is not None and t_start < model_event < t_end:
+        points.add(float(model_event))
+    breakpoints = sorted(points)
+
+    for seg_start, seg_end in zip(breakpoints[:-1], breakpoints[1:]):
+        overrides = schedule.values_at(config, seg_start)
+        if model_event is not None:
+            overrides[event_attr] = -np.inf if seg_start >= model_event else np.inf
+        yield (
+            seg_start,
+            seg_end,
+            seg_end == breakpoints[-1],
+            with_overrides(config, **overrides),
+        )
+
+
+def run_segmented(
+    rhs,
+    y0,
+    t,
+    config,
+    schedule=None,
+    event_attr="event_time",
+    info=None,
+    **odeint_kwargs,
+):
+    """
+    이벤트 시각을 경계로 구간을 나누어 적분합니다.
+    - 모델 내부의 'if t >= config.event_time' 분기는 구간별로 상수가 되도록
+      event_time을 +/-inf로 고정한 config 복사본을 사용
+    - schedule(DisturbanceSchedule)의 추가 이벤트도 구간 경계에서 반영
+    각 구간의 끝 상태에서 다음 구간을 새로 시작하므로 적분기가 불연속점을 찾아
+    스텝을 줄여 나갈 필요가 없습니다.
+    info에 리스트를 넘기면 구간별 odeint full_output 정보를 추가합니다. (solver_stats 참고)
+    반환: t 격자에서의 해 (len(t), n_states)
+    """
+    t = np.asarray(t, dtype=float)
+    sol = np.empty((len(t), len(y0)))
+    y = np.asarray(y0, dtype=float)
+
+    for seg_start, seg_end, last, seg_config in iter_segments(
+        t[0], t[-1], config, schedule, event_attr
+    ):
+        mask = (t >= seg_start) & ((t <= seg_end) if last else (t < seg_end))
+        # 구간 경계와 반올림 오차만큼만 떨어진 격자점은 경계 값으로 대체
+        # (간격이 0에 가까운 출력 시각은 odeint가 "Illegal input"으로 거부함)
+        eps = 1e-12 * max(1.0, abs(seg_end))
+        inner = t[mask]
+        inner = inner[(inner - seg_start > eps) & (seg_end - inner > eps)]
+        seg_t = np.concatenate(([seg_start], inner, [seg_end]))
+
+        if info is None:
+            seg_sol = odeint(rhs, y, seg_t, args=(seg_config,), **odeint_kwargs)
+        else:
+            seg_sol, seg_info = odeint(
+                rhs, y, seg_t, args=(seg_config,), full_output=True, **odeint_kwargs
+            )
+            info.append(seg_info)
+        sol[mask] = seg_sol[np.searchsorted(seg_t, t[mask] - eps)]
+        y = seg_sol[-1]
+
+    return sol
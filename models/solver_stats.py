@@ -0,0 +1,263 @@
+# models/solver_stats.py
+"""
+솔버 통계 수집 (느린 시나리오의 원인 파악용)
+
+odeint의 full_output 정보를 실행 기록(딕셔너리) 하나로 정리합니다.
+- nfev / njev / nsteps: RHS 호출, Jacobian 계산, 적분 스텝 수 (구간 합계)
+- step_min / step_max / step_sizes: 출력 시각마다 마지막으로 사용된 스텝 크기 (hu)
+- method_switches / stiff_fraction: LSODA의 Adams(비stiff) <-> BDF(stiff) 전환 횟수와
+  BDF로 진행한 출력 구간의 비율
+- wall_time: 실행 시간 [s], rhs_calls / rhs_time: CountingRHS로 잰 RHS 호출 수와 누적 시간
+
+사용 예)
+    log = SolverLog()
+    sol, record = run_instrumented(voltage_dynamics, y0, t, cfg, label="case 1", log=log)
+    log.print_summary()          # 실행 시간 순 표
+    log.slowest(5)               # 가장 느린 기록 5개
+"""
+
+import csv
+import time
+import numpy as np
+from models.scenario import run_segmented
+from utils.result_cache import make_key
+
+# odeint의 mused 값: 1 = Adams (비stiff), 2 = BDF (stiff)
+_BDF = 2
+
+# 캐시에 해의 배열과 함께 저장하는 기록 항목 (스칼라)
+_CACHED_FIELDS = (
+    "nfev",
+    "njev",
+    "nsteps",
+    "step_min",
+    "step_max",
+    "method_switches",
+    "stiff_fraction",
+    "segments",
+    "success",
+    "message",
+    "wall_time",
+)
+# count_calls=True로 측정한 경우에만 있는 항목 (있으면 함께 저장)
+_OPTIONAL_FIELDS = ("rhs_calls", "rhs_time")
+
+
+class CountingRHS:
+    """
+    RHS 호출 수 (및 선택적으로 누적 실행 시간)를 세는 래퍼
+    원래 함수와 같은 인자로 호출하며, odeint / solve_ivp에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, func, timed=True):
+        self.func = func
+        self.timed = timed
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if not self.timed:
+            return self.func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.time += time.perf_counter() - start
+
+    def reset(self):
+        self.calls = 0
+        self.time = 0.0
+
+
+def summarize_odeint(infos):
+    """
+    odeint full_output 정보 (구간별 리스트)를 하나의 기록으로 합침
+    반환: {"nfev", "njev", "nsteps", "step_min", "step_max", "step_sizes",
+           "method_switches", "stiff_fraction", "segments", "success", "message"}
+    """
+    if isinstance(infos, dict):
+        infos = [infos]
+
+    hu = np.concatenate([info["hu"] for info in infos])
+    switches = 0
+    stiff = 0
+    for info in infos:
+        mused = info["mused"]
+        switches += int(np.count_nonzero(mused[1:] != mused[:-1]))
+        stiff += int(np.count_nonzero(mused == _BDF))
+    # 적분 실패 시 이후 출력 구간은 0으로 채워지므로 사용된 스텝만 집계
+    used = hu[hu > 0]
+    messages = [info["message"] for info in infos]
+
+    return {
+        "nfev": int(sum(info["nfe"][-1] for info in infos)),
+        "njev": int(sum(info["nje"][-1] for info in infos)),
+        "nsteps": int(sum(info["nst"][-1] for info in infos)),
+        "step_min": float(used.min()) if used.size else np.nan,
+        "step_max": float(used.max()) if used.size else np.nan,
+        "step_sizes": hu,
+        "method_switches": switches,
+        "stiff_fraction": stiff / max(hu.size, 1),
+        "segments": len(infos),
+        "success": all(
+            message.startswith("Integration successful") for message in messages
+        ),
+        "message": messages[-1],
+    }
+
+
+def run_instrumented(
+    rhs,
+    y0,
+    t,
+    config,
+    schedule=None,
+    label=None,
+    count_calls=False,
+    cache=None,
+    log=None,
+    **odeint_kwargs,
+):
+    """
+    scenario.run_segmented와 같은 적분을 수행하면서 솔버 통계를 기록합니다.
+    count_calls=True이면 CountingRHS로 RHS 호출 수와 누적 시간도 측정
+    cache: utils.result_cache.ResultCache (해와 통계를 함께 저장/재사용, 적중 시 "cached": True)
+           실패한 적분은 저장하지 않으며, 적중 시 기록은 새로 푼 기록과 같은 항목을 가짐
+    log: SolverLog (기록을 추가)
+    반환: (sol, record)
+    """
+    record = {"label": label}
+    key = None
+    if cache is not None and cache.enabled:
+        key = make_key(
+            run_instrumented, run_segmented, rhs, y0, t, config, schedule, odeint_kwargs
+        )
+        start = time.perf_counter()
+        cached = cache.get(key)
+        if cached is not None:
+            sol = cached["sol"]
+            record.update({name: cached[name].item() for name in _CACHED_FIELDS})
+            record.update(
+                {
+                    name: cached[name].item()
+                    for name in _OPTIONAL_FIELDS
+                    if name in cached
+                }
+            )
+            record["step_sizes"] = cached["step_sizes"]
+            record["cached"] = True
+            record["load_time"] = time.perf_counter() - start
+            if log is not None:
+                log.append(record)
+            return sol, record
+
+    counter = CountingRHS(rhs) if count_calls else None
+    infos = []
+    start = time.perf_counter()
+    sol = run_segmented(
+        counter or rhs, y0, t, config, schedule, info=infos, **odeint_kwargs
+    )
+    record["wall_time"] = time.perf_counter() - start
+    record.update(summarize_odeint(infos))
+    record["cached"] = False
+    if counter is not None:
+        record["rhs_calls"] = counter.calls
+        record["rhs_time"] = counter.time
+
+    # 실패한 적분은 저장하지 않음 (다음 실행에서 다시 시도)
+    if key is not None and record["success"]:
+        fields = _CACHED_FIELDS + tuple(n for n in _OPTIONAL_FIELDS if n in record)
+        cache.put(
+            key,
+            sol=sol,
+            step_sizes=np.asarray(record["step_sizes"]),
+            **{name: np.asarray(record[name]) for name in fields},
+        )
+    if log is not None:
+        log.append(record)
+    return sol, record
+
+
+def format_record(record):
+    """기록 한 줄 요약 문자열"""
+    if record.get("cached"):
+        return (
+            f"[cached] nfev={record['nfev']}, njev={record['njev']}, "
+            f"solved in {record['wall_time'] * 1e3:.1f} ms"
+        )
+    text = (
+        f"nfev={record['nfev']}, njev={record['njev']}, steps={record['nsteps']}, "
+        f"h=[{record['step_min']:.2e}, {record['step_max']:.2e}], "
+    )
+    # odeint 전용 항목 (dense_runner.run_dense 통계에는 없음)
+    if "method_switches" in record:
+        text += (
+            f"switches={record['method_switches']}, "
+            f"stiff={record['stiff_fraction'] * 100:.0f}%, "
+        )
+    text += f"{record['wall_time'] * 1e3:.1f} ms"
+    if "rhs_time" in record:
+        text += f" (RHS {record['rhs_time'] * 1e3:.1f} ms)"
+    if not record["success"]:
+        text += f" FAILED: {record['message']}"
+    return text
+
+
+class SolverLog:
+    """
+    여러 실행의 솔버 기록 모음 (대규모 스윕에서 느린 시나리오 찾기)
+    """
+
+    # CSV / 요약 표에 쓰는 열 (step_sizes 등 배열 항목 제외)
+    COLUMNS = (
+        "label",
+        "wall_time",
+        "nfev",
+        "njev",
+        "nsteps",
+        "step_min",
+        "step_max",
+        "method_switches",
+        "stiff_fraction",
+        "segments",
+        "success",
+        "cached",
+        "rhs_calls",
+        "rhs_time",
+    )
+
+    def __init__(self):
+        self.records = []
+
+    def append(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def slowest(self, n=10, key="wall_time"):
+        """key (예: "wall_time", "nfev") 기준 상위 n개 기록 (캐시 적중 기록 제외)"""
+        solved = [r for r in self.records if not r.get("cached")]
+        return sorted(solved, key=lambda r: r[key], reverse=True)[:n]
+
+    def print_summary(self, n=10, key="wall_time"):
+        solved = [r for r in self.records if not r.get("cached")]
+        total = sum(r["wall_time"] for r in solved)
+        print(
+            f"--- Solver log: {len(self.records)} runs "
+            f"({len(self.records) - len(solved)} cached), "
+            f"{total:.2f} s solving ---"
+        )
+        for record in self.slowest(n, key):
+            print(f"  {str(record['label']):>24}: {format_record(record)}")
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for record in self.records:
+                writer.writerow([record.get(name, "") for name in self.COLUMNS])
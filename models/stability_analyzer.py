@@ -1,12 +1,123 @@
 # models/stability_analyzer.py
+import os
 import numpy as np
 import matplotlib.pyplot as plt
+from models.eigen_analysis import get_synchronizing_coefficient
 
+# 지도에서 "충분히 감쇠됨"으로 표시하는 최소 감쇠비 기준
+DEFAULT_ZETA_LIMIT = 0.1
 
-def plot_stability_region(config):
+
+def _damping_chunk(X, P, H, D, v_vsg, v_grid, Omega_0):
+    """
+    스윙 방정식 선형화 모델의 최소 감쇠비와 지배 모드 주파수 (배열 입력, 서로 브로드캐스트)
+      x'' + (D/2H) x' + (Omega_0*K_s/2H) x = 0   (hybrid/avm 시간 영역 모델과 같은 스케일)
+    특성근 lambda = -b/2 +/- sqrt(b^2/4 - a),  a = Omega_0*K_s/(2H), b = D/(2H)
+    - 부족 감쇠 (b^2/4 < a): zeta = b / (2*sqrt(a)), 주파수 = sqrt(a - b^2/4) / 2pi
+    - 실근: 가장 오른쪽 근 r의 감쇠비 -r/|r| (= 1 또는 -1), 주파수 0
+    평형점이 없는 점(P > P_max)은 NaN
+    """
+    K_s = get_synchronizing_coefficient(P, X, v_vsg, v_grid)
+    a = Omega_0 * K_s / (2 * H)
+    b = D / (2 * H)
+    disc = b**2 / 4 - a
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        oscillatory = disc < 0
+        zeta = np.where(
+            oscillatory,
+            b / (2 * np.sqrt(a)),
+            np.sign(b / 2 - np.sqrt(np.abs(disc))),
+        )
+        freq = np.where(oscillatory, np.sqrt(np.abs(disc)), 0.0) / (2 * np.pi)
+
+    # 평형점이 없으면 a가 NaN이므로 zeta는 이미 NaN
+    freq = np.where(np.isnan(a), np.nan, freq)
+    return zeta, freq
+
+
+def compute_damping_map(
+    config,
+    x_values,
+    p_values,
+    h_values=None,
+    d_values=None,
+    chunk_size=1_000_000,
+    out_dir=None,
+):
+    """
+    (X_line, P_ref, H, D) 4차원 격자에서 소신호 최소 감쇠비와 지배 모드 주파수를 계산합니다.
+    h_values, d_values를 생략하면 config 값 하나만 사용합니다.
+    결과 배열의 shape은 (len(X), len(P), len(H), len(D)), dtype은 float32 입니다.
+
+    격자점은 약 chunk_size개씩 (X 축 블록 단위로) 나누어 계산하므로 수백만 점도 일정한 작업 메모리로 처리됩니다.
+    out_dir을 지정하면 결과를 out_dir/zeta.npy, out_dir/freq.npy 메모리 맵에 직접 기록하여
+    전체를 메모리에 올리지 않고 np.load(..., mmap_mode="r")로 잘라 볼 수 있습니다.
+    반환: {"X_line", "P_ref", "H", "D": 축 값, "zeta", "freq": 4차원 배열}
+    """
+    axes = [
+        np.atleast_1d(np.asarray(v, dtype=float))
+        for v in (
+            x_values,
+            p_values,
+            config.H if h_values is None else h_values,
+            config.D if d_values is None else d_values,
+        )
+    ]
+    shape = tuple(a.size for a in axes)
+
+    if out_dir is None:
+        zeta = np.empty(shape, dtype=np.float32)
+        freq = np.empty(shape, dtype=np.float32)
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+        open_memmap = np.lib.format.open_memmap
+        zeta = open_memmap(os.path.join(out_dir, "zeta.npy"), "w+", np.float32, shape)
+        freq = open_memmap(os.path.join(out_dir, "freq.npy"), "w+", np.float32, shape)
+
+    v_vsg = getattr(config, "V_vsg", 1.0)
+    v_grid = getattr(config, "V_grid", 1.0)
+    x, p, h, d = axes
+    p = p[None, :, None, None]
+    h = h[None, None, :, None]
+    d = d[None, None, None, :]
+
+    # X 축을 블록 단위로 나누어 (블록, P, H, D)를 브로드캐스트로 한 번에 계산
+    block = max(1, chunk_size // (shape[1] * shape[2] * shape[3]))
+    for start in range(0, shape[0], block):
+        rows = slice(start, min(start + block, shape[0]))
+        z, f = _damping_chunk(
+            x[rows, None, None, None], p, h, d, v_vsg, v_grid, config.Omega_0
+        )
+        zeta[rows] = z
+        freq[rows] = f
+
+    if out_dir is not None:
+        zeta.flush()
+        freq.flush()
+
+    return {
+        "X_line": axes[0],
+        "P_ref": axes[1],
+        "H": axes[2],
+        "D": axes[3],
+        "zeta": zeta,
+        "freq": freq,
+    }
+
+
+def plot_stability_region(
+    config,
+    damping_map=None,
+    zeta_limit=DEFAULT_ZETA_LIMIT,
+    save_path=None,
+    show=True,
+):
     """
     전력망 임피던스(X)와 전력(P) 사이의 안정도 영역(Stability Region)을 시각화합니다.
     이론적 최대 전력 전송 한계(Static Stability Limit)를 계산하여 그립니다.
+    damping_map(compute_damping_map 결과)의 config.H, config.D에 가장 가까운 단면을
+    최소 감쇠비 등고선으로 겹쳐 그립니다. (생략 시 현재 H, D로 단면을 계산)
     """
     print("--- Generating Stability Region Map ---")
 
@@ -21,7 +132,7 @@ def plot_stability_region(config):
     p_max_curve = (v_vsg * v_grid) / x_range
 
     # 3. 그래프 그리기
-    plt.figure(figsize=(10, 8))
+    fig = plt.figure(figsize=(10, 8))
 
     # (1) 경계선 그리기
     plt.plot(
@@ -42,7 +153,33 @@ def plot_stability_region(config):
         x_range, p_max_curve, 3.0, color="red", alpha=0.1, label="Unstable Region"
     )
 
-    # (3) 현재 시뮬레이션 설정 포인트 표시
+    # (3) 소신호 감쇠비 지도 (현재 H, D 단면)
+    if damping_map is None:
+        damping_map = compute_damping_map(config, x_range, np.linspace(0, 2.5, 200))
+    ih = np.argmin(np.abs(damping_map["H"] - config.H))
+    idx = np.argmin(np.abs(damping_map["D"] - config.D))
+    zeta_slice = damping_map["zeta"][:, :, ih, idx].T  # (P, X)
+
+    contours = plt.contourf(
+        damping_map["X_line"],
+        damping_map["P_ref"],
+        zeta_slice,
+        levels=20,
+        cmap="viridis",
+        alpha=0.35,
+    )
+    plt.colorbar(contours, label="Minimum Damping Ratio $\\zeta_{min}$")
+    boundary = plt.contour(
+        damping_map["X_line"],
+        damping_map["P_ref"],
+        zeta_slice,
+        levels=[zeta_limit],
+        colors="k",
+        linestyles="--",
+    )
+    boundary.clabel(fmt=f"zeta = {zeta_limit:g}")
+
+    # (4) 현재 시뮬레이션 설정 포인트 표시
     current_x = config.X_line
     current_p = config.P_ref
 
@@ -61,7 +198,7 @@ def plot_stability_region(config):
         label=f"Current Operation\n(X={current_x}, P={current_p})",
     )
 
-    # (4) 화살표 및 텍스트 주석 (그래프 설명)
+    # (5) 화살표 및 텍스트 주석 (그래프 설명)
     plt.annotate(
         f"Current Status: {status}",
         xy=(current_x, current_p),
@@ -81,5 +218,11 @@ def plot_stability_region(config):
     plt.legend(loc="upper right", fontsize=12)
 
     plt.tight_layout()
-    plt.show()
     print("--- Map Generated ---")
+    if save_path is not None:
+        fig.savefig(save_path)
+    if show:
+        plt.show()
+    elif save_path is not None:
+        plt.close(fig)
+    return fig
@@ -1,5 +1,47 @@
 # run_gallery.py
+"""
+VSG 논문 재현 그래프 갤러리
+
+- 대화형 메뉴: python run_gallery.py
+- 배치 모드 (CI / 야간 연구용, input() / plt.show() 없음):
+    python run_gallery.py --batch scenarios/example.toml --output results/batch --workers 4
+
+배치 시나리오 파일 (JSON 또는 TOML)
+    defaults: 모든 시나리오에 공통으로 적용할 설정 값 (선택)
+    scenarios: 시나리오 목록, 각 항목은
+      name      결과 파일 이름 (생략 시 "<번호>_<model>")
+      model     "hybrid" | "avm" | "detailed"
+      config    Config (detailed는 DetailedConfig) 속성 덮어쓰기
+                시간 격자는 t_start / t_end / steps 로 지정
+      analyses  ["simulate", "plot", "stability_region", "root_locus", "pareto"]
+                (생략 시 ["simulate"]; plot은 simulate 결과를 그림)
+
+    예) TOML
+        [defaults]
+        t_end = 10.0
+
+        [[scenarios]]
+        name = "weak_grid"
+        model = "hybrid"
+        analyses = ["simulate", "plot"]
+        config = { X_line = 0.8, P_solar_initial = 0.3, P_solar_drop = 0.2 }
+
+출력 디렉터리
+    <name>.npz          궤적 (t, sol)
+    <name>_pareto.csv   pareto 분석 지표 표
+    figures/            그래프 (render_figures로 병렬 저장)
+    summary.csv / summary.json   시나리오별 상태, 실행 시간, 솔버 통계, 지표
+    solver_log.csv      SolverLog 기록
+"""
+
+import argparse
+import csv
+import json
+import os
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 from config import Config
 
@@ -9,28 +51,63 @@ try:
     from models.vsg_model import swing_equation
     from models.hybrid_system import system_dynamics
     from models.avm_system import voltage_dynamics
-    from models.gfl_model import get_solar_power
-    from utils.visualizer import plot_hybrid_results, plot_voltage_control
+    from models.gfl_model import get_solar_power_array
+    from utils.visualizer import (
+        plot_hybrid_results,
+        plot_voltage_control,
+        render_figures,
+    )
     from models.stability_analyzer import plot_stability_region
     from models.eigen_analysis import plot_root_locus
-    from models.pareto_analysis import plot_pareto_front
-    from scipy.integrate import odeint
+    from models.pareto_analysis import compute_pareto_front, plot_pareto_front
+    from models.solver_stats import SolverLog, format_record, run_instrumented
+    from models.initializer import initial_state
+    from models.dense_runner import run_dense
+    from models.metrics import compute_metrics, write_csv
+    from models.scenario import with_overrides
+    from utils.result_cache import ResultCache
     import numpy as np
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Please ensure all previous steps (files) are created correctly.")
     sys.exit()
 
+# 같은 메뉴를 다시 선택하면 디스크에 저장된 결과를 재사용
+CACHE = ResultCache()
+
+# 시간 영역 실행별 솔버 통계 (종료 시 느린 순으로 출력)
+SOLVER_LOG = SolverLog()
+
+# 배치 모드에서 지원하는 모델과 분석
+BATCH_MODELS = ("hybrid", "avm", "detailed")
+BATCH_ANALYSES = ("simulate", "plot", "stability_region", "root_locus", "pareto")
+HYBRID_ANALYSES = ("stability_region", "root_locus", "pareto")
+# odeint: 고정 격자 (결과 캐시 사용), dense: 적응 스텝 + 연속 출력 (dense_runner.run_dense)
+BATCH_SOLVERS = ("odeint", "dense")
+
+# DetailedConfig에는 시간 격자 설정이 없으므로 step12와 같은 구간을 기본값으로 사용
+# (외란 직전 정상 상태에서 1.5초까지)
+DETAILED_T_END = 1.5
+DETAILED_STEPS = 1500
+
+# pareto 분석 기본 관성 범위 (plot_pareto_front와 동일)
+PARETO_H_VALUES = np.linspace(1.0, 10.0, 20)
+
+
+def solve(rhs, y0, t, cfg, label):
+    sol, record = run_instrumented(
+        rhs, y0, t, cfg, label=label, count_calls=True, cache=CACHE, log=SOLVER_LOG
+    )
+    print(f"  > Solver: {format_record(record)}")
+    return sol
+
 
 def run_time_domain(cfg):
     print("Running Time Domain Simulation (Hybrid)...")
-    P_vsg_initial = cfg.P_load_total - cfg.P_solar_initial
-    P_max = cfg.V_vsg * cfg.V_grid / cfg.X_line
-    delta_0 = np.arcsin(P_vsg_initial / P_max)
-    y0 = [delta_0, cfg.Omega_0]
+    y0 = initial_state("hybrid", cfg)
     t = np.linspace(cfg.t_start, cfg.t_end, cfg.steps)
-    sol = odeint(system_dynamics, y0, t, args=(cfg,))
-    solar = np.array([get_solar_power(time, cfg) for time in t])
+    sol = solve(system_dynamics, y0, t, cfg, "hybrid")
+    solar = get_solar_power_array(t, cfg)
     plot_hybrid_results(t, sol, solar, cfg)
 
 
@@ -38,10 +115,315 @@ def run_voltage_domain(cfg):
     print("Running Voltage Domain Simulation (AVR)...")
     y0 = [0.1, cfg.Omega_0, 1.0]  # delta, omega, V
     t = np.linspace(cfg.t_start, cfg.t_end, cfg.steps)
-    sol = odeint(voltage_dynamics, y0, t, args=(cfg,))
+    sol = solve(voltage_dynamics, y0, t, cfg, "avm")
     plot_voltage_control(t, sol, cfg)
 
 
+# ==========================================
+# 배치 모드
+# ==========================================
+def load_scenarios(path):
+    """
+    시나리오 파일(.json / .toml)을 읽어 검증된 시나리오 목록을 반환
+    각 항목: {"name", "model", "solver", "config", "analyses"} (defaults가 config에 병합됨)
+    잘못된 모델/분석/설정 이름, 중복 이름은 ValueError
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+
+    if isinstance(data, list):
+        data = {"scenarios": data}
+    defaults = data.get("defaults", {})
+    scenarios = []
+    names = set()
+    for index, entry in enumerate(data.get("scenarios", [])):
+        model = entry.get("model", "hybrid")
+        name = str(entry.get("name", f"{index:03d}_{model}"))
+        analyses = list(entry.get("analyses", ["simulate"]))
+        scenario = {
+            "name": name,
+            "model": model,
+            "solver": entry.get("solver", "odeint"),
+            "config": {**defaults, **entry.get("config", {})},
+            "analyses": analyses,
+        }
+
+        if name in names:
+            raise ValueError(f"Duplicate scenario name '{name}'.")
+        names.add(name)
+        if model not in BATCH_MODELS:
+            raise ValueError(
+                f"Scenario '{name}': unknown model '{model}' "
+                f"(expected one of {list(BATCH_MODELS)})"
+            )
+        if scenario["solver"] not in BATCH_SOLVERS:
+            raise ValueError(
+                f"Scenario '{name}': unknown solver '{scenario['solver']}' "
+                f"(expected one of {list(BATCH_SOLVERS)})"
+            )
+        unknown = set(analyses) - set(BATCH_ANALYSES)
+        if unknown:
+            raise ValueError(
+                f"Scenario '{name}': unknown analyses {sorted(unknown)} "
+                f"(expected any of {list(BATCH_ANALYSES)})"
+            )
+        if model == "detailed" and set(analyses) - {"simulate"}:
+            raise ValueError(
+                f"Scenario '{name}': the detailed model only supports 'simulate'."
+            )
+        # 안정 영역 / 근궤적 / Pareto 분석은 hybrid(2차 swing) 모델로만 계산됨
+        hybrid_only = sorted(set(analyses) & set(HYBRID_ANALYSES))
+        if model != "hybrid" and hybrid_only:
+            raise ValueError(
+                f"Scenario '{name}': analyses {hybrid_only} are only available "
+                "for the hybrid model."
+            )
+        try:
+            make_config(scenario)
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Scenario '{name}': {e}") from None
+        scenarios.append(scenario)
+
+    if not scenarios:
+        raise ValueError(f"No scenarios found in {path}.")
+    return scenarios
+
+
+def make_config(scenario):
+    """시나리오의 설정 객체 (hybrid / avm: Config, detailed: DetailedConfig)"""
+    if scenario["model"] != "detailed":
+        return Config(**scenario["config"])
+
+    from step12_detailed_vsg import DetailedConfig
+
+    cfg = DetailedConfig()
+    grid_fields = ("t_start", "t_end", "steps")
+    for name in scenario["config"]:
+        if name not in grid_fields and not hasattr(cfg, name):
+            raise AttributeError(f"Unknown DetailedConfig field: '{name}'")
+    return with_overrides(cfg, **scenario["config"])
+
+
+def _time_grid(model, cfg):
+    if model == "detailed":
+        t_start = getattr(cfg, "t_start", cfg.event_time - 0.05)
+        t_end = getattr(cfg, "t_end", DETAILED_T_END)
+        steps = getattr(cfg, "steps", DETAILED_STEPS)
+    else:
+        t_start, t_end, steps = cfg.t_start, cfg.t_end, cfg.steps
+    return np.linspace(t_start, t_end, int(steps))
+
+
+def _simulate(scenario, cfg, out_dir, cache):
+    """시간 영역 실행 + 궤적 저장 + 지표 계산, 반환: (t, sol, record, metrics)"""
+    model = scenario["model"]
+    t = _time_grid(model, cfg)
+    y0 = initial_state(model, cfg)
+    jac = None
+    if model == "hybrid":
+        rhs = system_dynamics
+    elif model == "avm":
+        rhs = voltage_dynamics
+    else:
+        from step12_detailed_vsg import detailed_dynamics, detailed_jacobian
+
+        rhs, jac = detailed_dynamics, detailed_jacobian
+
+    if scenario.get("solver") == "dense":
+        # 솔버가 고른 스텝으로 적분하고 저장/그래프용 점은 적응 격자에서 선택
+        # (지표의 nadir / peak / 정착 시간은 보간식에서 정확히 계산, 결과 캐시는 사용 안 함)
+        dense = run_dense(rhs, y0, cfg, (t[0], t[-1]), jac=jac)
+        record = dict(dense.stats, label=scenario["name"], cached=False)
+        t = dense.sample(coarse_points=t.size)
+        sol = dense(t)
+        values = dense.metrics(cfg, model, coarse_points=t.size)
+    else:
+        kwargs = {} if jac is None else {"Dfun": jac}
+        sol, record = run_instrumented(
+            rhs,
+            y0,
+            t,
+            cfg,
+            label=scenario["name"],
+            count_calls=True,
+            cache=cache,
+            **kwargs,
+        )
+        values = compute_metrics(t, sol, cfg, model)
+
+    np.savez(os.path.join(out_dir, f"{scenario['name']}.npz"), t=t, sol=sol)
+    metrics = {name: float(value) for name, value in values.items()}
+    return t, sol, record, metrics
+
+
+def run_scenario(scenario, out_dir, use_cache=True):
+    """
+    시나리오 하나를 실행 (배치 워커에서 호출, 예외는 결과의 status / error로 반환)
+    반환: {"name", "model", "status", "error", "wall_time", "solver", "metrics", "figures"}
+          figures: render_figures에 넘길 그래프 작업 목록
+    """
+    start = time.perf_counter()
+    result = {
+        "name": scenario["name"],
+        "model": scenario["model"],
+        "status": "ok",
+        "error": "",
+        "solver": None,
+        "metrics": {},
+        "figures": [],
+    }
+    analyses = scenario["analyses"]
+    name = scenario["name"]
+    try:
+        cfg = make_config(scenario)
+        if "simulate" in analyses or "plot" in analyses:
+            t, sol, record, metrics = _simulate(
+                scenario, cfg, out_dir, CACHE if use_cache else None
+            )
+            # step_sizes 배열은 요약에서 제외
+            result["solver"] = {k: v for k, v in record.items() if k != "step_sizes"}
+            result["metrics"] = metrics
+            if not record["success"]:
+                result["status"] = "failed"
+                result["error"] = record.get("message", "solver failure")
+
+            if "plot" in analyses and scenario["model"] == "hybrid":
+                solar = get_solar_power_array(t, cfg)
+                result["figures"].append(
+                    (name, plot_hybrid_results, (t, sol, solar, cfg))
+                )
+            elif "plot" in analyses:
+                result["figures"].append((name, plot_voltage_control, (t, sol, cfg)))
+
+        if "stability_region" in analyses:
+            result["figures"].append(
+                (f"{name}_stability_region", plot_stability_region, (cfg,))
+            )
+        if "root_locus" in analyses:
+            result["figures"].append((f"{name}_root_locus", plot_root_locus, (cfg,)))
+        if "pareto" in analyses:
+            # 워커 안에서 다시 프로세스 풀을 만들지 않도록 workers=1
+            front = compute_pareto_front(cfg, PARETO_H_VALUES, workers=1)
+            write_csv(
+                os.path.join(out_dir, f"{name}_pareto.csv"),
+                {k: front[k] for k in ("nadir", "rocof", "settling_time")},
+                H=front["H"],
+                D=front["D"],
+            )
+            result["figures"].append(
+                (f"{name}_pareto", plot_pareto_front, (cfg,), {"front": front})
+            )
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+
+    result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+def _write_summary(results, out_dir):
+    metric_names = sorted({name for r in results for name in r["metrics"]})
+    solver_names = [
+        name
+        for name in SolverLog.COLUMNS
+        if name != "label" and any(r["solver"] and name in r["solver"] for r in results)
+    ]
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["name", "model", "status", "wall_time"]
+            + [f"solver_{name}" for name in solver_names]
+            + metric_names
+            + ["error"]
+        )
+        for r in results:
+            solver = r["solver"] or {}
+            writer.writerow(
+                [r["name"], r["model"], r["status"], r["wall_time"]]
+                + [solver.get(name, "") for name in solver_names]
+                + [r["metrics"].get(name, "") for name in metric_names]
+                + [r["error"]]
+            )
+
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump(
+            [{k: v for k, v in r.items() if k != "figures"} for r in results],
+            f,
+            indent=2,
+            default=float,
+        )
+
+
+def run_batch(scenarios, out_dir, workers=None, plots=True, fmt="png", use_cache=True):
+    """
+    시나리오 목록을 프로세스 풀에서 실행하고 결과를 out_dir에 저장
+    반환: 시나리오별 결과 리스트 (입력 순서, run_scenario 참고)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(scenarios)))
+
+    print(f"--- Batch: {len(scenarios)} scenarios, {workers} worker(s) ---")
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_scenario(s, out_dir, use_cache) for s in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(run_scenario, s, out_dir, use_cache) for s in scenarios
+            ]
+            results = [f.result() for f in futures]
+    sim_time = time.perf_counter() - start
+
+    for r in results:
+        line = f"  {r['name']:>24} [{r['model']}] {r['status']}"
+        if r["solver"]:
+            line += f" - {format_record(r['solver'])}"
+        if r["error"]:
+            line += f" ({r['error']})"
+        print(line)
+        if r["solver"]:
+            SOLVER_LOG.append(dict(r["solver"], label=r["name"]))
+
+    render_time = 0.0
+    jobs = [job for r in results for job in r["figures"]] if plots else []
+    if jobs:
+        render_start = time.perf_counter()
+        render_figures(jobs, os.path.join(out_dir, "figures"), fmt, workers)
+        render_time = time.perf_counter() - render_start
+
+    _write_summary(results, out_dir)
+    SOLVER_LOG.to_csv(os.path.join(out_dir, "solver_log.csv"))
+
+    # 처리량 요약 (solver: 캐시 적중을 제외한 적분 시간 합계, 워커 수만큼 겹쳐 실행됨)
+    total = sim_time + render_time
+    records = [r["solver"] for r in results if r["solver"]]
+    solved = [record for record in records if not record["cached"]]
+    solve_time = sum(record["wall_time"] for record in solved)
+    n_bad = sum(r["status"] != "ok" for r in results)
+    print(
+        f"--- Batch finished: {len(results)} scenarios ({n_bad} failed) in "
+        f"{total:.2f} s, {len(results) / total:.2f} scenarios/s ---"
+    )
+    print(
+        f"  run {sim_time:.2f} s (solver {solve_time:.2f} s, {len(solved)} solved, "
+        f"{len(records) - len(solved)} cached), "
+        f"render {render_time:.2f} s ({len(jobs)} figures)"
+    )
+    print(f"  outputs: {os.path.abspath(out_dir)}")
+    return results
+
+
 def main_menu():
     cfg = Config()
 
@@ -70,11 +452,44 @@ def main_menu():
         elif choice == "5":
             plot_pareto_front(cfg)
         elif choice == "0":
+            print(f"Result cache: {CACHE.stats()}")
+            SOLVER_LOG.print_summary()
             print("Exiting...")
             break
         else:
             print("Invalid selection.")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VSG thesis reproduction gallery")
+    parser.add_argument(
+        "--batch", help="시나리오 파일 (.json / .toml) - 지정하면 메뉴 없이 실행"
+    )
+    parser.add_argument(
+        "--output", default=os.path.join("results", "batch"), help="출력 디렉터리"
+    )
+    parser.add_argument("--workers", type=int, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--format", default="png", help="그래프 파일 형식")
+    parser.add_argument("--no-plots", action="store_true", help="그래프 저장 생략")
+    parser.add_argument("--no-cache", action="store_true", help="결과 캐시 사용 안 함")
+    args = parser.parse_args(argv)
+
+    if args.batch is None:
+        main_menu()
+        return 0
+
+    scenarios = load_scenarios(args.batch)
+    results = run_batch(
+        scenarios,
+        args.output,
+        workers=args.workers,
+        plots=not args.no_plots,
+        fmt=args.format,
+        use_cache=not args.no_cache,
+    )
+    # 실패한 시나리오가 있으면 CI에서 알 수 있도록 종료 코드 1
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
 if __name__ == "__main__":
-    main_menu()
+    sys.exit(main())
@@ -3,6 +3,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 
+# 저장소의 결과 캐시가 있으면 사용 (단독 실행 시에는 매번 계산)
+try:
+    from utils.result_cache import ResultCache
+except ImportError:
+    ResultCache = None
+
 
 # ==========================================
 # 1. 설정 및 파라미터 (Configuration)
@@ -79,16 +85,22 @@ def main():
     cfg = Config()
     t = np.linspace(0, 10, 1000)
     y0 = [0.0, cfg.Omega_0, 1.0]
+    cache = ResultCache() if ResultCache is not None else None
+
+    def solve():
+        if cache is None:
+            return odeint(system_dynamics, y0, t, args=(cfg,))
+        return cache.call(odeint, system_dynamics, y0, t, args=(cfg,))
 
     # Case 1: 기존 제어 (NVR OFF)
     print("Running Case 1: Conventional (NVR OFF)...")
     cfg.use_proposed_control = False
-    sol1 = odeint(system_dynamics, y0, t, args=(cfg,))
+    sol1 = solve()
 
     # Case 2: 제안 제어 (NVR ON)
     print("Running Case 2: Proposed (NVR ON)...")
     cfg.use_proposed_control = True
-    sol2 = odeint(system_dynamics, y0, t, args=(cfg,))
+    sol2 = solve()
 
     # 그래프 그리기
     plt.figure(figsize=(12, 8))
@@ -1,7 +1,8 @@
 # step12_detailed_vsg.py
+import time
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+from scipy.integrate import odeint, solve_ivp
 
 
 # ==========================================
@@ -40,6 +41,8 @@ class DetailedConfig:
 
         self.V_grid_mag = 1.0  # 무한모선 전압 크기
 
+        self.event_time = 0.5  # 부하 투입 시각 [s]
+
 
 # ==========================================
 # 2. 미분 방정식 (12-Order State Space)
@@ -76,8 +79,8 @@ def detailed_dynamics(states, t, cfg):
     Q_calc = v_oq * i_gd - v_od * i_gq
 
     # --- B. 가장 바깥쪽 루프 (Swing Equation) ---
-    # P_ref 입력 (0.5초에 부하 투입)
-    P_m = cfg.P_ref if t > 0.5 else 0.0
+    # P_ref 입력 (event_time(0.5초)에 부하 투입)
+    P_m = cfg.P_ref if t > cfg.event_time else 0.0
 
     # d(delta)/dt = omega - w_base
     d_delta = omega - cfg.w_base
@@ -150,23 +153,266 @@ def detailed_dynamics(states, t, cfg):
     ]
 
 
+# ==========================================
+# 2-1. 해석적 Jacobian (Stiff Solver용)
+# ==========================================
+# 상태 인덱스: 0 delta, 1 omega, 2~5 PI 적분기(vd, vq, id, iq),
+#             6~7 i_L(d, q), 8~9 v_o(d, q), 10~11 i_g(d, q)
+# JACOBIAN_SPARSITY[i, j] = True 이면 d(f_i)/d(y_j)가 0이 아닐 수 있음
+JACOBIAN_SPARSITY = np.zeros((12, 12), dtype=bool)
+for _row, _cols in {
+    0: [1],
+    1: [1, 8, 9, 10, 11],
+    2: [8, 9, 10, 11],
+    3: [9],
+    4: [1, 2, 6, 8, 9, 10, 11],
+    5: [1, 3, 7, 8, 9],
+    6: [1, 2, 4, 6, 7, 8, 9, 10, 11],
+    7: [1, 3, 5, 6, 7, 8, 9],
+    8: [1, 6, 9, 10],
+    9: [1, 7, 8, 11],
+    10: [0, 1, 8, 10, 11],
+    11: [0, 1, 9, 10, 11],
+}.items():
+    JACOBIAN_SPARSITY[_row, _cols] = True
+
+
+def detailed_jacobian(states, t, cfg):
+    """
+    detailed_dynamics의 정확한 Jacobian d(f)/d(y) (12 x 12)
+    odeint(..., Dfun=detailed_jacobian) 형태로 사용합니다.
+    각 중간 변수의 기울기(행 벡터)를 detailed_dynamics와 같은 순서로 연쇄 법칙에 따라 계산
+    """
+    delta, omega = states[0], states[1]
+    i_Ld, i_Lq, v_od, v_oq = states[6], states[7], states[8], states[9]
+    i_gd, i_gq = states[10], states[11]
+
+    def unit(i):
+        e = np.zeros(12)
+        e[i] = 1.0
+        return e
+
+    # 출력 전력 P, Q의 기울기
+    dP = np.zeros(12)
+    dP[[8, 9, 10, 11]] = [i_gd, i_gq, v_od, v_oq]
+    dQ = np.zeros(12)
+    dQ[[8, 9, 10, 11]] = [-i_gq, i_gd, v_oq, -v_od]
+
+    # 전압 제어 루프
+    d_err_vd = -cfg.K_q * dQ - unit(8)
+    d_err_vq = -unit(9)
+    d_iLd_ref = cfg.Kpv * d_err_vd + unit(2)
+    d_iLd_ref[1] -= cfg.C_f * v_oq
+    d_iLd_ref[9] -= omega * cfg.C_f
+    d_iLq_ref = cfg.Kpv * d_err_vq + unit(3)
+    d_iLq_ref[1] += cfg.C_f * v_od
+    d_iLq_ref[8] += omega * cfg.C_f
+
+    # 전류 제어 루프
+    d_err_id = d_iLd_ref - unit(6)
+    d_err_iq = d_iLq_ref - unit(7)
+    d_vinv_d = cfg.Kpc * d_err_id + unit(4) + unit(8)
+    d_vinv_d[1] -= cfg.L_f * i_Lq
+    d_vinv_d[7] -= omega * cfg.L_f
+    d_vinv_q = cfg.Kpc * d_err_iq + unit(5) + unit(9)
+    d_vinv_q[1] += cfg.L_f * i_Ld
+    d_vinv_q[6] += omega * cfg.L_f
+
+    jac = np.zeros((12, 12))
+
+    # Swing Equation
+    jac[0, 1] = 1.0
+    jac[1] = -dP / cfg.J
+    jac[1, 1] -= cfg.D / cfg.J
+
+    # PI 적분기
+    jac[2] = cfg.Kiv * d_err_vd
+    jac[3] = cfg.Kiv * d_err_vq
+    jac[4] = cfg.Kic * d_err_id
+    jac[5] = cfg.Kic * d_err_iq
+
+    # 인버터 전류 (L_f)
+    jac[6] = d_vinv_d - unit(8) - cfg.R_f * unit(6)
+    jac[6, 1] += cfg.L_f * i_Lq
+    jac[6, 7] += omega * cfg.L_f
+    jac[6] /= cfg.L_f
+    jac[7] = d_vinv_q - unit(9) - cfg.R_f * unit(7)
+    jac[7, 1] -= cfg.L_f * i_Ld
+    jac[7, 6] -= omega * cfg.L_f
+    jac[7] /= cfg.L_f
+
+    # 커패시터 전압 (C_f)
+    jac[8, [1, 6, 9, 10]] = [v_oq, 1 / cfg.C_f, omega, -1 / cfg.C_f]
+    jac[9, [1, 7, 8, 11]] = [-v_od, 1 / cfg.C_f, -omega, -1 / cfg.C_f]
+
+    # 전력망 전류 (L_g): v_gd = Vg*cos(delta), v_gq = -Vg*sin(delta)
+    V_g = cfg.V_grid_mag
+    jac[10, [0, 1, 8, 10, 11]] = [
+        V_g * np.sin(delta) / cfg.L_g,
+        i_gq,
+        1 / cfg.L_g,
+        -cfg.R_g / cfg.L_g,
+        omega,
+    ]
+    jac[11, [0, 1, 9, 10, 11]] = [
+        V_g * np.cos(delta) / cfg.L_g,
+        -i_gd,
+        1 / cfg.L_g,
+        -omega,
+        -cfg.R_g / cfg.L_g,
+    ]
+    return jac
+
+
+def simulate_detailed(cfg, t, y0, method="LSODA", use_jacobian=True):
+    """
+    상세 모델 시뮬레이션 실행기
+    method: "LSODA" (odeint, 자동 stiff 전환) 또는 solve_ivp의 stiff 솔버 "BDF" / "Radau"
+    use_jacobian: 해석적 Jacobian 사용 여부
+                  (False이면 유한차분 - stiff 솔버에는 희소 구조만 전달)
+    반환: (sol, stats) - stats: {"nfev", "njev", "wall_time", "t_reached", "success"}
+    솔버가 중간에 실패하면 도달하지 못한 구간의 sol은 NaN입니다.
+    """
+    start = time.perf_counter()
+
+    if method == "LSODA":
+        sol, info = odeint(
+            detailed_dynamics,
+            y0,
+            t,
+            args=(cfg,),
+            Dfun=detailed_jacobian if use_jacobian else None,
+            full_output=True,
+        )
+        # 실패 시 info 배열은 실패 지점 이후가 채워지지 않으므로 유효 구간만 사용
+        reached = info["tcur"] >= t[1:]
+        n_valid = len(reached) if reached.all() else int(np.argmin(reached)) + 1
+        success = bool(reached.all())
+        if not success:
+            sol[n_valid:] = np.nan
+        stats = {
+            "nfev": int(info["nfe"][n_valid - 1]),
+            "njev": int(info["nje"][n_valid - 1]),
+            "t_reached": float(info["tcur"][n_valid - 1]),
+        }
+    else:
+        if use_jacobian:
+            jac_options = {"jac": lambda tt, y: detailed_jacobian(y, tt, cfg)}
+        else:
+            jac_options = {"jac_sparsity": JACOBIAN_SPARSITY}
+        res = solve_ivp(
+            lambda tt, y: detailed_dynamics(y, tt, cfg),
+            (t[0], t[-1]),
+            y0,
+            method=method,
+            t_eval=t,
+            **jac_options,
+        )
+        sol = np.full((len(t), len(y0)), np.nan)
+        sol[: res.y.shape[1]] = res.y.T
+        success = res.success
+        stats = {
+            "nfev": int(res.nfev),
+            "njev": int(res.njev),
+            "t_reached": float(res.t[-1]),
+        }
+
+    stats["success"] = success
+    stats["wall_time"] = time.perf_counter() - start
+    return sol, stats
+
+
+def benchmark_solvers():
+    """
+    솔버/Jacobian 조합별 RHS 호출 수와 실행 시간 비교 (유한차분 Jacobian의 RHS 호출은 nfev에 포함됨)
+    - 부하 투입: 외란 이전 평형점에서 1.5초까지 (수렴하는 기준 사례)
+    - Black Start: 0에서 1.5초까지 (기본 설정에서는 발산하므로 참고용)
+    반환: {사례 이름: {조합 이름: 통계}}
+    """
+    from models.initializer import initial_state
+
+    cfg = DetailedConfig()
+    y_black = np.zeros(12)
+    y_black[1] = cfg.w_base
+    cases = {
+        "Load step": (
+            initial_state("detailed", cfg),
+            np.linspace(cfg.event_time - 0.05, 1.5, 3000),
+        ),
+        "Black Start": (y_black, np.linspace(0, 1.5, 3000)),
+    }
+
+    report = {}
+    for case, (y0, t) in cases.items():
+        print(f"--- Detailed Model Solver Benchmark ({case}, to {t[-1]:.1f} s) ---")
+        report[case] = {}
+        for method, use_jacobian in [
+            ("LSODA", False),
+            ("LSODA", True),
+            ("BDF", False),
+            ("BDF", True),
+            ("Radau", False),
+            ("Radau", True),
+        ]:
+            jacobian = "analytic" if use_jacobian else "finite-diff"
+            label = f"{method} ({jacobian} Jacobian)"
+            _, stats = simulate_detailed(cfg, t, y0, method, use_jacobian)
+            report[case][label] = stats
+            print(
+                f"{label:>32}: nfev={stats['nfev']:7d}, njev={stats['njev']:5d}, "
+                f"wall={stats['wall_time'] * 1e3:8.1f} ms, "
+                f"reached t={stats['t_reached']:.3f} s"
+                + ("" if stats["success"] else " (FAILED)")
+            )
+    return report
+
+
 # ==========================================
 # 3. 메인 실행 및 시각화
 # ==========================================
-def main():
+def main(black_start=False):
+    """
+    black_start=True : 0에서 시작하여 전압 형성 과도 응답부터 관찰 (0 ~ 1.5초)
+    black_start=False: 외란 직전 정상 상태에서 시작 (event_time - 0.05 ~ 1.5초)
+    반환: (t, sol)
+    """
+    from models.initializer import initial_state
+    from models.dense_runner import run_dense
+
     print("=== Step 12: Detailed Model Simulation (Inner Loops) ===")
     cfg = DetailedConfig()
 
-    # 초기 조건 (0에서 시작 - Black Start)
-    # 시스템이 0에서 전압을 확 올리는 과도 응답을 관찰
-    y0 = np.zeros(12)
-    y0[1] = cfg.w_base  # 주파수는 60Hz에서 시작
-
-    t = np.linspace(0, 1.5, 3000)  # 1.5초간 시뮬레이션
+    if black_start:
+        # 초기 조건 (0에서 시작 - Black Start)
+        # 시스템이 0에서 전압을 확 올리는 과도 응답을 관찰
+        y0 = np.zeros(12)
+        y0[1] = cfg.w_base  # 주파수는 60Hz에서 시작
+        t_span = (0.0, 1.5)  # 1.5초간 시뮬레이션
+    else:
+        # 외란 이전 평형점에서 시작하므로 전압 형성 구간을 적분할 필요가 없음
+        y0 = initial_state("detailed", cfg)
+        t_span = (cfg.event_time - 0.05, 1.5)
 
     print("Solving 12-order differential equations...")
-    sol = odeint(detailed_dynamics, y0, t, args=(cfg,))
-    print("Simulation Finished.")
+    # 빠른 내부 루프(Kic=100)와 LC 필터 때문에 stiff하므로 해석적 Jacobian 사용
+    # (LSODA는 stiff 구간에서 BDF로 전환하며 이 Jacobian을 사용)
+    # 고정 격자 대신 솔버 스텝 + 연속 출력으로 적분하고, 그래프용 점은 나중에 선택
+    # (발산하는 경우 20000 스텝에서 중단하고 그때까지의 결과만 그림)
+    dense = run_dense(
+        detailed_dynamics, y0, cfg, t_span, jac=detailed_jacobian, max_steps=20_000
+    )
+    stats = dense.stats
+    print(
+        f"Simulation Finished. (nfev={stats['nfev']}, njev={stats['njev']}, "
+        f"steps={stats['nsteps']}, {stats['wall_time']:.2f} s, "
+        f"reached t={stats['t_reached']:.3f} s)"
+    )
+    if not stats["success"]:
+        print(f"[WARNING] {stats['message']}")
+
+    # 부하 투입 직후와 주파수 최저점 부근은 1 ms, 나머지는 듬성듬성
+    t = dense.sample(coarse_points=300, fine_dt=1e-3, fine_span=0.3)
+    sol = dense(t)
 
     # 결과 추출
     omega = sol[:, 1]
@@ -188,7 +434,11 @@ def main():
     plt.subplot(3, 1, 1)
     plt.plot(t, V_mag, "b", linewidth=2, label="Voltage Magnitude (v_d)")
     plt.plot(t, v_oq, "g--", alpha=0.5, label="v_q (Should be 0)")
-    plt.title("1. Voltage Build-up (Inner Loop Response)")
+    plt.title(
+        "1. Voltage Build-up (Inner Loop Response)"
+        if black_start
+        else "1. Output Voltage (Inner Loop Response)"
+    )
     plt.ylabel("Voltage [p.u.]")
     plt.grid(True)
     plt.legend()
@@ -196,7 +446,12 @@ def main():
     # 2. 유효 전력 응답
     plt.subplot(3, 1, 2)
     plt.plot(t, P_out, "r", linewidth=2, label="Active Power Output")
-    plt.axvline(x=0.5, color="k", linestyle="--", label="Load Step (0.5s)")
+    plt.axvline(
+        x=cfg.event_time,
+        color="k",
+        linestyle="--",
+        label=f"Load Step ({cfg.event_time}s)",
+    )
     plt.title("2. Active Power Response (Outer Loop Response)")
     plt.ylabel("Power [p.u.]")
     plt.grid(True)
@@ -213,6 +468,7 @@ def main():
 
     plt.tight_layout()
     plt.show()
+    return t, sol
 
 
 if __name__ == "__main__":
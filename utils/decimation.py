@@ -0,0 +1,98 @@
+# utils/decimation.py
+"""
+그래프용 궤적 축소(decimation)
+
+화면 해상도보다 훨씬 많은 샘플(예: 1 ms 간격 1시간 = 360만 점)을 그대로 그리면
+matplotlib 렌더링 시간이 시뮬레이션 시간보다 길어집니다. 화면에 보이는 모양을 유지하면서
+점 개수만 max_points 근처로 줄입니다.
+
+- "minmax": 구간별 최솟값/최댓값 샘플을 남김 (nadir, 피크가 정확히 보존됨, O(N) 벡터화)
+- "lttb": Largest-Triangle-Three-Buckets (완만한 곡선의 모양 보존에 유리)
+"""
+
+import numpy as np
+
+# 그래프 한 줄당 기본 최대 점 개수 (일반적인 그림 폭의 픽셀 수 수준)
+DEFAULT_MAX_POINTS = 4000
+
+
+def minmax_indices(y, max_points):
+    """
+    y를 max_points // 2개 구간으로 나누어 각 구간의 최솟값/최댓값 인덱스를 시간 순으로 반환
+    (첫 샘플과 마지막 샘플 포함)
+    """
+    y = np.asarray(y)
+    n = y.size
+    if n <= max_points:
+        return np.arange(n)
+
+    n_bins = max(1, (max_points - 2) // 2)
+    bin_size = -(-n // n_bins)
+    # 마지막 구간은 마지막 값으로 채워 (n_bins, bin_size) 모양으로 맞춤
+    padded = np.empty(n_bins * bin_size, dtype=y.dtype)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    blocks = padded.reshape(n_bins, bin_size)
+
+    offsets = np.arange(n_bins) * bin_size
+    lo = offsets + np.argmin(blocks, axis=1)
+    hi = offsets + np.argmax(blocks, axis=1)
+    pairs = np.sort(np.stack([lo, hi], axis=1), axis=1).ravel()
+    pairs = np.minimum(pairs, n - 1)
+    return np.unique(np.concatenate(([0], pairs, [n - 1])))
+
+
+def lttb_indices(t, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets: 구간마다 (이전 선택점, 다음 구간 평균)과 이루는
+    삼각형 넓이가 가장 큰 샘플 하나를 선택 (첫/마지막 샘플 포함)
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    # 첫/마지막 샘플을 제외한 나머지를 max_points - 2개 구간으로 분할
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    # 구간 평균 (다음 구간의 대표점), 누적합으로 한 번에 계산
+    ct = np.concatenate(([0.0], np.cumsum(t)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    count = np.diff(edges)
+    mean_t = (ct[edges[1:]] - ct[edges[:-1]]) / count
+    mean_y = (cy[edges[1:]] - cy[edges[:-1]]) / count
+    mean_t = np.append(mean_t[1:], t[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for k in range(max_points - 2):
+        start, stop = edges[k], edges[k + 1]
+        tb, yb = t[start:stop], y[start:stop]
+        area = np.abs(
+            (t[a] - mean_t[k]) * (yb - y[a]) - (t[a] - tb) * (mean_y[k] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[k + 1] = a
+    return selected
+
+
+def decimate(t, y, max_points=DEFAULT_MAX_POINTS, method="minmax"):
+    """
+    (t, y) 궤적을 max_points 근처 개수로 축소하여 (t, y) 반환
+    max_points=None이면 축소하지 않음
+    """
+    t = np.asarray(t)
+    y = np.asarray(y)
+    if max_points is None or y.size <= max_points:
+        return t, y
+    if method == "minmax":
+        index = minmax_indices(y, max_points)
+    elif method == "lttb":
+        index = lttb_indices(t, y, max_points)
+    else:
+        raise ValueError(
+            f"Unknown decimation method '{method}' (expected 'minmax' or 'lttb')"
+        )
+    return t[index], y[index]
@@ -0,0 +1,214 @@
+# utils/result_cache.py
+import contextlib
+import hashlib
+import inspect
+import os
+import tempfile
+import zipfile
+import numpy as np
+
+# 캐시 형식/모델 변경 시 올려서 기존 캐시를 모두 무효화
+# (키에는 호출한 함수들의 소스가 포함되지만, 그 함수가 내부에서 부르는
+#  다른 함수(예: get_solar_power)의 변경까지는 추적하지 않음)
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get("VSG_SIM_CACHE_DIR", ".sim_cache")
+
+
+def _function_fingerprint(func):
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', func)}"
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        source = repr(code.co_code) if code is not None else ""
+    return f"func:{name}:{hashlib.sha256(source.encode()).hexdigest()}"
+
+
+def _update(h, value):
+    """value의 내용을 해시 h에 누적 (타입 정보 포함)"""
+    if value is None or isinstance(value, (bool, int, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (float, np.floating)):
+        h.update(f"float:{float(value)!r};".encode())
+    elif isinstance(value, np.integer):
+        h.update(f"int:{int(value)!r};".encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}[{len(value)}];".encode())
+        for item in value:
+            _update(h, item)
+    elif isinstance(value, dict):
+        h.update(f"dict[{len(value)}];".encode())
+        for key in sorted(value, key=repr):
+            _update(h, key)
+            _update(h, value[key])
+    elif callable(value) and hasattr(value, "__code__"):
+        h.update(_function_fingerprint(value).encode())
+    else:
+        # 일반 객체 (Config 등): 클래스 이름 + 속성 값
+        cls = type(value)
+        h.update(f"object:{cls.__module__}.{cls.__qualname__};".encode())
+        _update(h, _object_state(value))
+
+
+def _object_state(obj):
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "__dict__"):
+        # 밑줄로 시작하는 속성은 공개 속성에서 유도된 내부 캐시로 보고 제외
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    state = {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+def make_key(*parts):
+    """호출 정보(함수, Config, 시간 격자, 초기값 등)로부터 내용 기반 키(SHA-256) 생성"""
+    h = hashlib.sha256(f"vsg-cache-v{CACHE_VERSION};".encode())
+    for part in parts:
+        _update(h, part)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    시뮬레이션 결과(배열)를 디스크에 저장하는 내용 기반 캐시
+    - 키: 함수 식별자/소스, Config 값, 시간 격자, 초기값 등의 해시
+    - 저장: <directory>/<키 앞 2자리>/<키>.npz
+    - 용량 제한: max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - hits / misses / evictions 카운터 제공
+    - enabled=False이면 call은 항상 함수를 실행 (벤치마크 등 캐시를 우회해야 할 때)
+
+    사용 예)
+        cache = ResultCache()
+        sol = cache.call(odeint, voltage_dynamics, y0, t, args=(cfg,))
+    """
+
+    def __init__(
+        self, directory=DEFAULT_CACHE_DIR, max_bytes=512 * 1024**2, enabled=True
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 디렉터리는 첫 put에서 만듦 (import / 캐시 미사용 시 빈 디렉터리를 남기지 않음)
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.npz")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".npz"):
+                    yield os.path.join(root, name)
+
+    def get(self, key):
+        """저장된 배열 딕셔너리를 반환 (없거나 손상되었으면 None)"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            # 최근 사용 시각 갱신 (LRU 기준) - 그 사이 다른 프로세스가 지웠을 수 있음
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # 손상된 파일: 미스로 처리하고 삭제해 다음 put이 다시 쓰도록 함
+            self._discard(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def _discard(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._size = max(self._size - size, 0)
+
+    def put(self, key, **arrays):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+        self._size += os.path.getsize(path) - old_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        # 다른 프로세스가 동시에 항목을 지울 수 있으므로 항목마다 stat은 한 번만,
+        # 이미 사라진 파일은 건너뜀
+        entries = []
+        for path in self._entries():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            self._size -= size
+            self.evictions += 1
+
+    def call(self, func, *args, **kwargs):
+        """
+        func(*args, **kwargs)의 결과를 캐시에서 찾고, 없으면 실행 후 저장
+        결과는 배열 하나 또는 배열들의 튜플이어야 합니다.
+        """
+        if not self.enabled:
+            return func(*args, **kwargs)
+
+        key = make_key(func, args, kwargs)
+        cached = self.get(key)
+        if cached is not None:
+            n = len(cached)
+            if "single" in cached:
+                return cached["arr_0"]
+            return tuple(cached[f"arr_{i}"] for i in range(n))
+
+        result = func(*args, **kwargs)
+        if isinstance(result, tuple):
+            arrays = {f"arr_{i}": np.asarray(r) for i, r in enumerate(result)}
+        else:
+            arrays = {"arr_0": np.asarray(result), "single": np.array(True)}
+
+        # 배열로 저장할 수 없는 결과(예: odeint full_output의 딕셔너리)는 저장하지 않음
+        if all(a.dtype != object for a in arrays.values()):
+            self.put(key, **arrays)
+        return result
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+        }
+
+    def clear(self):
+        for path in list(self._entries()):
+            os.remove(path)
+        self._size = 0
@@ -1,21 +1,54 @@
 # utils/visualizer.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+from models.metrics import frequency_metrics, power_outputs
+from utils.decimation import DEFAULT_MAX_POINTS, decimate
 
 
-def plot_hybrid_results(t, result, solar_profile, config):
-    delta_res = result[:, 0]
+def _trace(t, y, decimation, *fmt, **kwargs):
+    # decimation: (max_points, method) - 화면 해상도 수준으로 축소하여 그림
+    plt.plot(*decimate(t, y, *decimation), *fmt, **kwargs)
+
+
+def _finish(fig, save_path, show):
+    plt.tight_layout()
+    if save_path is not None:
+        # 확장자(.png, .svg 등)로 형식 결정
+        fig.savefig(save_path)
+    if show:
+        plt.show()
+    elif save_path is not None:
+        plt.close(fig)
+    return fig
+
+
+def plot_hybrid_results(
+    t,
+    result,
+    solar_profile,
+    config,
+    save_path=None,
+    show=True,
+    max_points=DEFAULT_MAX_POINTS,
+    method="minmax",
+):
     omega_res = result[:, 1]
     freq_res = omega_res / (2 * np.pi)
 
     # VSG 출력 전력 계산
-    vsg_power = (config.V_vsg * config.V_grid / config.X_line) * np.sin(delta_res)
+    vsg_power = power_outputs("hybrid", t, result, config)[0]
 
-    plt.figure(figsize=(12, 12))
+    decimation = (max_points, method)
+    fig = plt.figure(figsize=(12, 12))
 
     # 1. 태양광 발전량 (GFL)
     plt.subplot(3, 1, 1)
-    plt.plot(t, solar_profile, "orange", linewidth=2, label="Solar (GFL) Power")
+    _trace(
+        t, solar_profile, decimation, "orange", linewidth=2, label="Solar (GFL) Power"
+    )
     plt.ylabel("Power [p.u.]")
     plt.title("[Scenario] Solar Power Drop (Cloud Passing)", fontsize=14)
     plt.grid(True)
@@ -23,7 +56,14 @@ def plot_hybrid_results(t, result, solar_profile, config):
 
     # 2. 주파수 응답 (System Frequency)
     plt.subplot(3, 1, 2)
-    plt.plot(t, freq_res, "b", linewidth=2, label="Grid Frequency (VSG Controlled)")
+    _trace(
+        t,
+        freq_res,
+        decimation,
+        "b",
+        linewidth=2,
+        label="Grid Frequency (VSG Controlled)",
+    )
     plt.axvline(x=config.event_time, color="r", linestyle="--", alpha=0.5)
     plt.ylabel("Frequency [Hz]")
     plt.title("System Frequency Response", fontsize=14)
@@ -32,9 +72,13 @@ def plot_hybrid_results(t, result, solar_profile, config):
 
     # 3. VSG 출력 전력 (VSG Response)
     plt.subplot(3, 1, 3)
-    plt.plot(t, vsg_power, "g", linewidth=2, label="VSG Output Power")
-    plt.plot(
-        t, config.P_load_total - solar_profile, "k:", label="Required VSG Power (Ideal)"
+    _trace(t, vsg_power, decimation, "g", linewidth=2, label="VSG Output Power")
+    _trace(
+        t,
+        config.P_load_total - solar_profile,
+        decimation,
+        "k:",
+        label="Required VSG Power (Ideal)",
     )
     plt.ylabel("Power [p.u.]")
     plt.xlabel("Time [s]")
@@ -42,16 +86,30 @@ def plot_hybrid_results(t, result, solar_profile, config):
     plt.grid(True)
     plt.legend(loc="upper right")
 
-    plt.tight_layout()
-    plt.show()
+    return _finish(fig, save_path, show)
 
 
-def plot_parametric_sweep(t, results_dict, config):
+def plot_parametric_sweep(
+    t,
+    results_dict,
+    config,
+    save_path=None,
+    show=True,
+    max_points=DEFAULT_MAX_POINTS,
+    method="minmax",
+):
     """
     파라미터 변화에 따른 비교 그래프 그리기
     results_dict: { 'H=3.0': result_array, ... }
+
+    (세 그래프 함수 공통 인자)
+    save_path: 지정 시 그림을 파일로 저장 (확장자로 .png/.svg 형식 결정)
+    show: False면 창을 띄우지 않음 (save_path와 함께 쓰면 저장 후 그림을 닫음)
+    max_points, method: 선 하나당 최대 점 개수와 축소 방식 ("minmax" 또는 "lttb",
+                        utils.decimation 참고), max_points=None이면 모든 샘플을 그림
     """
-    plt.figure(figsize=(12, 10))
+    decimation = (max_points, method)
+    fig = plt.figure(figsize=(12, 10))
 
     # 1. 주파수 비교 (가장 중요)
     plt.subplot(2, 1, 1)
@@ -60,9 +118,15 @@ def plot_parametric_sweep(t, results_dict, config):
         freq_res = omega_res / (2 * np.pi)
 
         # 최저 주파수(Nadir) 표시
-        min_freq = np.min(freq_res)
+        min_freq = frequency_metrics(t, omega_res, config)["nadir"]
 
-        plt.plot(t, freq_res, linewidth=2, label=f"{label} (Min: {min_freq:.4f} Hz)")
+        _trace(
+            t,
+            freq_res,
+            decimation,
+            linewidth=2,
+            label=f"{label} (Min: {min_freq:.4f} Hz)",
+        )
 
     plt.axvline(
         x=config.event_time, color="r", linestyle="--", alpha=0.5, label="Solar Drop"
@@ -76,9 +140,8 @@ def plot_parametric_sweep(t, results_dict, config):
     # 2. VSG 출력 전력 비교
     plt.subplot(2, 1, 2)
     for label, result in results_dict.items():
-        delta_res = result[:, 0]
-        vsg_power = (config.V_vsg * config.V_grid / config.X_line) * np.sin(delta_res)
-        plt.plot(t, vsg_power, linewidth=2, label=label)
+        vsg_power = power_outputs("hybrid", t, result, config)[0]
+        _trace(t, vsg_power, decimation, linewidth=2, label=label)
 
     plt.title("VSG Active Power Response", fontsize=14)
     plt.xlabel("Time [s]", fontsize=12)
@@ -86,31 +149,35 @@ def plot_parametric_sweep(t, results_dict, config):
     plt.grid(True)
     plt.legend()
 
-    plt.tight_layout()
-    plt.show()
+    return _finish(fig, save_path, show)
 
 
-def plot_voltage_control(t, result, config):
-    delta = result[:, 0]
+def plot_voltage_control(
+    t,
+    result,
+    config,
+    save_path=None,
+    show=True,
+    max_points=DEFAULT_MAX_POINTS,
+    method="minmax",
+):
     omega = result[:, 1]
-    V_vsg = result[:, 2]  # 3번째 변수: VSG 전압
 
     # V_grid 재구성 (그래프용)
     V_grid_arr = np.where(
         t >= config.event_time, config.V_grid_fault, config.V_grid_normal
     )
 
-    # 무효 전력(Q) 역산
-    Q_out = (V_vsg**2 / config.X_line) - (V_vsg * V_grid_arr / config.X_line) * np.cos(
-        delta
-    )
+    # 무효 전력(Q) 역산, 3번째 상태 변수: VSG 전압
+    _, Q_out, V_vsg = power_outputs("avm", t, result, config)
 
-    plt.figure(figsize=(12, 10))
+    decimation = (max_points, method)
+    fig = plt.figure(figsize=(12, 10))
 
     # 1. 전압 반응 (가장 중요)
     plt.subplot(3, 1, 1)
-    plt.plot(t, V_vsg, "b", linewidth=2, label="VSG Voltage (Controlled)")
-    plt.plot(t, V_grid_arr, "r--", label="Grid Voltage (Disturbance)")
+    _trace(t, V_vsg, decimation, "b", linewidth=2, label="VSG Voltage (Controlled)")
+    _trace(t, V_grid_arr, decimation, "r--", label="Grid Voltage (Disturbance)")
     plt.title("Voltage Support Capability (AVR)", fontsize=14)
     plt.ylabel("Voltage [p.u.]")
     plt.legend(loc="right")
@@ -118,7 +185,7 @@ def plot_voltage_control(t, result, config):
 
     # 2. 무효 전력 공급 (Q)
     plt.subplot(3, 1, 2)
-    plt.plot(t, Q_out, "g", linewidth=2, label="Reactive Power Injection (Q)")
+    _trace(t, Q_out, decimation, "g", linewidth=2, label="Reactive Power Injection (Q)")
     plt.axvline(x=config.event_time, color="r", linestyle="--")
     plt.title("Reactive Power Response (Q-V Droop)", fontsize=14)
     plt.ylabel("Reactive Power [p.u.]")
@@ -127,11 +194,55 @@ def plot_voltage_control(t, result, config):
 
     # 3. 주파수 (부수적 영향)
     plt.subplot(3, 1, 3)
-    plt.plot(t, omega / (2 * np.pi), "k", label="Frequency")
+    _trace(t, omega / (2 * np.pi), decimation, "k", label="Frequency")
     plt.title("Frequency Stability", fontsize=14)
     plt.ylabel("Hz")
     plt.xlabel("Time [s]")
     plt.grid(True)
 
-    plt.tight_layout()
-    plt.show()
+    return _finish(fig, save_path, show)
+
+
+# ==========================================
+# 헤드리스 일괄 렌더링 (리포트용)
+# ==========================================
+def _init_render_worker(dpi):
+    # 화면 없이 파일로만 그리는 백엔드
+    matplotlib.use("Agg")
+    matplotlib.rcParams["savefig.dpi"] = dpi
+
+
+def _render_one(plot_func, args, kwargs, path):
+    plot_func(*args, save_path=path, show=False, **kwargs)
+    return path
+
+
+def render_figures(jobs, out_dir, fmt="png", workers=None, dpi=100):
+    """
+    여러 결과 그래프를 화면에 띄우지 않고 프로세스 풀에서 파일로 저장합니다.
+    jobs: [(파일 이름, 그래프 함수, args) 또는 (파일 이름, 그래프 함수, args, kwargs), ...]
+          예) ("case_01", plot_hybrid_results, (t, sol, solar, cfg))
+    fmt: "png" 또는 "svg" 등 matplotlib이 지원하는 형식
+    반환: 저장된 파일 경로 리스트 (jobs 순서)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = []
+    for job in jobs:
+        name, plot_func, args = job[:3]
+        kwargs = job[3] if len(job) > 3 else {}
+        tasks.append((plot_func, args, kwargs, os.path.join(out_dir, f"{name}.{fmt}")))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        # 현재 프로세스의 백엔드는 바꾸지 않고 저장 후 바로 닫음
+        with matplotlib.rc_context({"savefig.dpi": dpi}):
+            return [_render_one(*task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_render_worker, initargs=(dpi,)
+    ) as pool:
+        futures = [pool.submit(_render_one, *task) for task in tasks]
+        return [f.result() for f in futures]